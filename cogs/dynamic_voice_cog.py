@@ -43,6 +43,28 @@ class DynamicVoiceCog(commands.Cog):
     async def cog_unload(self) -> None:
         ...
 
+    @commands.Cog.listener()
+    async def on_voice_state_update(self, member: discord.Member, before: discord.VoiceState,
+                                    after: discord.VoiceState):
+        server = self.bot.servers.get(member.guild.id)
+        if server is None:
+            return
+        await server.channels.dynamic_voice.on_voice_state_update(member, before, after)
+
+    @commands.Cog.listener()
+    async def on_presence_update(self, before: discord.Member, after: discord.Member):
+        server = self.bot.servers.get(after.guild.id)
+        if server is None:
+            return
+        await server.on_presence_update(before, after)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member):
+        server = self.bot.servers.get(member.guild.id)
+        if server is None:
+            return
+        server.on_member_remove(member)
+
     @app_commands.command(name='groups', description='Manage all dynamic voice groups.')
     @app_commands.guild_only()
     @app_commands.checks.has_permissions(manage_channels=True)
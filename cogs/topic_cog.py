@@ -122,10 +122,7 @@ class TopicCog(commands.GroupCog, name='topic'):
         old_name = channel.channel.name
         if isinstance(channel, TopicChannel):
             await interaction.response.defer()
-            role = channel.get_role()
             await channel.channel.edit(name=name, topic=channel.get_description(name))
-            if role:
-                await role.edit(name=name)
             await interaction.followup.send(content=f'Changed topic name from {old_name} to {name}')
         else:
             await interaction.response.send_message('Channel is not a topic', ephemeral=True)
@@ -161,6 +158,20 @@ class TopicCog(commands.GroupCog, name='topic'):
         else:
             await interaction.response.send_message(f'Channel is not a topic', ephemeral=True)
 
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+        server = self.bot.servers.get(guild_id=after.guild.id)
+        if server is None:
+            return
+        await server.channels.on_channel_update(before, after)
+
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role: discord.Role):
+        server = self.bot.servers.get(guild_id=role.guild.id)
+        if server is None:
+            return
+        await server.channels.on_role_create(role)
+
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
         if message.author == self.bot.user or message.guild is None:
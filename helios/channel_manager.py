@@ -22,14 +22,17 @@
 
 import asyncio
 import logging
+from datetime import timedelta
 from typing import TYPE_CHECKING, Optional, Union
 
 import discord
+from discord.utils import utcnow
 
 from .channel import Channel_Dict, Channel, VoiceChannel
+from .channel_sorter import ChannelSorter
 from .database import ChannelModel, objects
 from .dynamic_voice import VoiceManager
-from .topics import TopicChannel
+from .topics import TopicChannel, TopicSubscriptions
 
 if TYPE_CHECKING:
     from .server import Server
@@ -40,23 +43,25 @@ if TYPE_CHECKING:
 logger = logging.getLogger('HeliosLogger')
 
 
-def need_sorting(all_channels):
-    discord_channels = all_channels[0].channel.category.text_channels
-    for i, channel in enumerate(all_channels):
-        if channel.channel != discord_channels[i]:
-            return True
-    return False
+def _topic_key(name: str) -> str:
+    return name.replace('🛑', '')
 
 
 class ChannelManager:
+    ROLE_SWEEP_INTERVAL = timedelta(hours=1)
+
     def __init__(self, server: 'Server'):
         self.bot: 'HeliosBot' = server.bot
         self.server = server
         self.channels: dict[int, 'HeliosChannel'] = {}
         self.topic_channels: dict[int, TopicChannel] = {}
         self.dynamic_voice = VoiceManager(self.server)
+        self.sorter = ChannelSorter(self.server)
+        self.subscriptions = TopicSubscriptions(self.server)
 
         self._task = None
+        self._topic_names: dict[str, TopicChannel] = {}
+        self._last_role_sweep = utcnow() - self.ROLE_SWEEP_INTERVAL
 
     def get(self, channel_id: int) -> Optional[Union[Channel, TopicChannel]]:
         channel = self.channels.get(channel_id)
@@ -65,12 +70,7 @@ class ChannelManager:
         return channel
 
     def get_topic_by_name(self, name: str) -> Optional[TopicChannel]:
-        for channel in self.topic_channels.values():
-            if channel.channel.name == name:
-                return channel
-            if channel.channel.name.replace('🛑', '') == name:
-                return channel
-        return
+        return self._topic_names.get(_topic_key(name))
 
     def get_type(self, t: str) -> list['HeliosChannel']:
         return list(filter(lambda x: x.channel_type == t, self.channels.values()))
@@ -80,9 +80,51 @@ class ChannelManager:
             raise NotImplemented
         if isinstance(channel, TopicChannel):
             self.topic_channels[channel.id] = channel
+            self._topic_names[_topic_key(channel.channel.name)] = channel
         else:
             self.channels[channel.id] = channel
 
+    def _remove_topic(self, topic: TopicChannel):
+        self.topic_channels.pop(topic.id, None)
+        key = _topic_key(topic.channel.name)
+        if self._topic_names.get(key) is topic:
+            del self._topic_names[key]
+
+    async def on_channel_update(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+        """Keep the topic name index and the topic role in line with a renamed topic channel."""
+        topic = self.topic_channels.get(after.id)
+        if topic is None or _topic_key(before.name) == _topic_key(after.name):
+            return
+        try:
+            # Keep the old name indexed until the role is renamed, or the old role looks orphaned meanwhile.
+            role = discord.utils.get(self.server.guild.roles, name=f'{_topic_key(before.name)}_sub')
+            if role and not topic.get_role():
+                await role.edit(name=topic.role_name)
+        finally:
+            if self._topic_names.get(_topic_key(before.name)) is topic:
+                del self._topic_names[_topic_key(before.name)]
+            self._topic_names[_topic_key(after.name)] = topic
+
+    def is_orphaned_role(self, role: discord.Role) -> bool:
+        return role.name.endswith('_sub') and self.get_topic_by_name(role.name[:-4]) is None
+
+    async def on_role_create(self, role: discord.Role):
+        if self.is_orphaned_role(role):
+            logger.debug(f'{self.server.name}: Channel Manager: Deleting orphaned role {role.name}')
+            await role.delete()
+
+    async def delete_orphaned_roles(self, name: str = None):
+        """Delete topic roles without a topic, optionally only the ones for the given topic name."""
+        for role in self.server.guild.roles:
+            if name is not None and role.name != f'{_topic_key(name)}_sub':
+                continue
+            if self.is_orphaned_role(role):
+                logger.debug(f'{self.server.name}: Channel Manager: Deleting orphaned role {role.name}')
+                try:
+                    await role.delete()
+                except discord.NotFound:
+                    ...
+
     def create_run_task(self):
         # if not self._task:
             # self._task = self.bot.loop.create_task(self.manage_channels(), name=f'{self.server.id}: Channel Manager')
@@ -129,14 +171,13 @@ class ChannelManager:
                     del self.channels[k]
                 except KeyError:
                     ...
-                try:
-                    del self.topic_channels[k]
-                except KeyError:
-                    ...
-        roles: list[discord.Role] = list(filter(lambda x: x.name.endswith('_sub'), self.server.guild.roles))
-        for role in roles:
-            if not self.get_topic_by_name(role.name[:-4]):
-                await role.delete()
+                topic = self.topic_channels.get(k)
+                if topic:
+                    self._remove_topic(topic)
+                    await self.delete_orphaned_roles(topic.channel.name)
+        if utcnow() - self._last_role_sweep >= self.ROLE_SWEEP_INTERVAL:
+            self._last_role_sweep = utcnow()
+            await self.delete_orphaned_roles()
 
     async def manage_topics(self):
         """Get channel points, sort by them and evaluate_state on the lower channels after the tenth channel."""
@@ -171,11 +212,10 @@ class ChannelManager:
             await asyncio.gather(*tasks)
 
         topic_channels = pinned + topic_channels
-        if need_sorting(topic_channels):
-            for i, c in enumerate(topic_channels):
-                if c.channel.position != i:
-                    logger.debug(f'{c.channel.name} is at {c.channel.position} should be at {i}')
-                    await c.channel.edit(position=i)
+        category = topic_channels[0].channel.category
+        if category:
+            await self.sorter.sort(category.text_channels, [c.channel for c in topic_channels],
+                                   reason='Topics: Sorting Channels')
 
     async def add_topic(self, channel: discord.TextChannel, owner: 'HeliosMember') -> tuple[bool, str]:
         if self.channels.get(channel.id):
@@ -190,10 +230,9 @@ class ChannelManager:
         return True, 'Added Successfully!'
 
     async def create_topic(self, name: str, owner: 'HeliosMember') -> tuple[bool, str]:
-        topics = self.topic_channels.values()
-        for t in topics:
-            if t.channel.name.lower() == name.lower().replace(' ', '-'):
-                return False, f'Channel already exists: {t.channel.mention}'
+        t = self.get_topic_by_name(name.lower().replace(' ', '-'))
+        if t:
+            return False, f'Channel already exists: {t.channel.mention}'
         if self.server.settings.topic_category.value is not None:
             category = self.bot.get_channel(self.server.settings.topic_category.value.id)
         else:
@@ -246,10 +285,11 @@ class ChannelManager:
             else:
                 deletes.append(c.delete(del_channel=False))
 
+        await self.subscriptions.load()
         topic_channels = await TopicChannel.get_all(self.server)
         for t in topic_channels:
             if t and t.alive:
-                self.topic_channels[t.id] = t
+                self._add_channel(t)
                 if t.active or t.pending:
                     role = t.get_role()
                     if not role:
@@ -0,0 +1,89 @@
+#  MIT License
+#
+#  Copyright (c) 2024 Riley Winkler
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+import asyncio
+import logging
+from datetime import timedelta
+from typing import TYPE_CHECKING, Optional
+
+import discord
+from discord.utils import utcnow
+
+if TYPE_CHECKING:
+    from .server import Server
+
+logger = logging.getLogger('HeliosLogger.ChannelSorter')
+
+
+def get_position_changes(current: list[discord.abc.GuildChannel],
+                         ordered: list[discord.abc.GuildChannel]) -> list[dict]:
+    """Get the smallest set of position changes that makes ``current`` start with ``ordered``.
+
+    :param current: The channels of a category in the order Discord currently shows them.
+    :param ordered: The channels that should lead the category, in the order they should appear.
+    :return: A bulk channel position payload containing only channels that have to move.
+    """
+    if not current:
+        return []
+    current_ids = {c.id for c in current}
+    ordered = [c for c in ordered if c.id in current_ids]
+    ordered_ids = {c.id for c in ordered}
+    target = ordered + [c for c in current if c.id not in ordered_ids]
+
+    # Reuse the positions the category already occupies so channels outside of it are never touched.
+    slots = sorted(c.position for c in current)
+    if len(set(slots)) != len(slots):
+        slots = list(range(slots[0], slots[0] + len(slots)))
+    return [{'id': c.id, 'position': p} for c, p in zip(target, slots) if c.position != p]
+
+
+class ChannelSorter:
+    DEBOUNCE = timedelta(seconds=10)
+
+    def __init__(self, server: 'Server'):
+        """Sorts channels with a single bulk position update once the wanted order has settled."""
+        self.server = server
+
+        self._pending: Optional[tuple[int, ...]] = None
+        self._pending_since = utcnow()
+
+    def clear(self):
+        self._pending = None
+
+    async def sort(self, current: list[discord.abc.GuildChannel], ordered: list[discord.abc.GuildChannel], *,
+                   reason: str = None) -> bool:
+        """Sort ``current`` so it starts with ``ordered``. Returns whether an update was sent."""
+        changes = get_position_changes(current, ordered)
+        if not changes:
+            self.clear()
+            return False
+
+        key = tuple(c.id for c in ordered)
+        if key != self._pending:
+            self._pending = key
+            self._pending_since = utcnow()
+        if utcnow() - self._pending_since < self.DEBOUNCE:
+            return False
+
+        logger.debug(f'{self.server.name}: Channel Sorter: Moving {len(changes)} channels')
+        await self.server.bot.http.bulk_channel_update(self.server.id, changes, reason=reason)
+        self.clear()
+        return True
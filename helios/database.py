@@ -22,6 +22,8 @@
 import asyncio
 import datetime
 import json
+import operator
+from functools import reduce
 from typing import TYPE_CHECKING, Optional, Any
 
 import discord.utils
@@ -46,8 +48,9 @@ def initialize_db():
         db.connect()
         db.create_tables([ServerModel, MemberModel, ChannelModel, TransactionModel,
                           EventModel, ViolationModel, DynamicVoiceModel, DynamicVoiceGroupModel, TopicModel,
-                          EffectModel, ThemeModel, BlackjackModel, DailyModel, GameModel, GameAliasModel, PugModel,
-                          InventoryModel, StoreModel, TopicSubscriptionModel, StatisticModel, StatisticHistoryModel])
+                          EffectModel, ThemeModel, BlackjackModel, BlackjackEventModel, DailyModel, GameModel, GameAliasModel, PugModel,
+                          InventoryModel, StoreModel, TopicSubscriptionModel, StatisticModel, StatisticHistoryModel,
+                          MediaInfoModel])
 
 
 def get_aware_utc_now():
@@ -457,6 +460,24 @@ class BlackjackModel(BaseModel):
         return await objects.create(cls, players=players)
 
 
+class BlackjackEventModel(BaseModel):
+    id = AutoField(primary_key=True, unique=True)
+    game = ForeignKeyField(BlackjackModel, backref='events', on_delete='CASCADE')
+    seq = IntegerField()
+    event = CharField(max_length=32)
+
+    class Meta:
+        table_name = 'blackjack_events'
+
+    @classmethod
+    async def append(cls, game: BlackjackModel, start: int, events: list[str]):
+        """Append a batch of events to a game's log in one insert, start is the sequence number of the first."""
+        if not events:
+            return
+        rows = [{'game': game, 'seq': start + i, 'event': event} for i, event in enumerate(events)]
+        await objects.execute(cls.insert_many(rows))
+
+
 class DailyModel(BaseModel):
     id = AutoField(primary_key=True, unique=True)
     member = ForeignKeyField(MemberModel, backref='dailies')
@@ -518,14 +539,30 @@ class GameModel(BaseModel):
         except DoesNotExist:
             return None
 
+    @classmethod
+    async def get_all(cls) -> list['GameModel']:
+        """Get every game with its aliases prefetched."""
+        q = cls.select()
+        return await objects.prefetch(q, GameAliasModel.select())
+
     @classmethod
     async def set_day_playtime(cls):
         """Set the last day playtime to the current playtime."""
-        q = cls.select().where(cls.play_time > cls.last_day_playtime)
-        games = await objects.execute(q)
-        async with objects.atomic():
-            for game in games:
-                await game.async_update(last_day_playtime=game.play_time)
+        q = cls.update(last_day_playtime=cls.play_time).where(cls.play_time > cls.last_day_playtime)
+        return await objects.execute(q)
+
+    @classmethod
+    def add_playtimes_query(cls, playtimes: dict[int, int]):
+        now = get_aware_utc_now()
+        return (cls.update(play_time=cls.play_time + Case(cls.id, list(playtimes.items()), 0), last_played=now)
+                .where(cls.id.in_(list(playtimes))))
+
+    @classmethod
+    async def add_playtimes(cls, playtimes: dict[int, int]):
+        """Add playtime to many games at once, keyed by game id."""
+        if not playtimes:
+            return 0
+        return await objects.execute(cls.add_playtimes_query(playtimes))
 
     async def add_playtime(self, time: int):
         """Add playtime to the game."""
@@ -533,6 +570,19 @@ class GameModel(BaseModel):
         self.last_played = get_aware_utc_now()
         return await self.async_save(only=('play_time', 'last_played'))
 
+    @classmethod
+    async def merge_game(cls, alias: 'GameModel', game: 'GameModel'):
+        """Fold alias into game, adding its playtime to the other row rather than writing totals."""
+        async with objects.atomic():
+            alias = await objects.get(cls, id=alias.id)
+            q = cls.update(play_time=cls.play_time + alias.play_time,
+                           last_day_playtime=cls.last_day_playtime + alias.last_day_playtime,
+                           last_played=fn.GREATEST(cls.last_played, cls.last_played.db_value(alias.last_played)))
+            await objects.execute(q.where(cls.id == game.id))
+            await objects.execute(GameAliasModel.update(game=game.id).where(GameAliasModel.game == alias.id))
+            await objects.create(GameAliasModel, game=game.id, alias=alias.name)
+            await objects.delete(alias)
+
     async def add_alias(self, alias: str):
         """Add an alias to the game."""
         return await objects.create(GameAliasModel, game=self, alias=alias)
@@ -676,6 +726,14 @@ class TopicSubscriptionModel(BaseModel):
         q = cls.select().where(cls.topic == topic)
         return await objects.prefetch(q, MemberModel.select())
 
+    @classmethod
+    async def get_all_by_server(cls, server: ServerModel) -> list[tuple[int, int]]:
+        """Get every (topic channel id, member id) subscription pair for a server."""
+        q = (cls.select(TopicModel.channel_id, MemberModel.member_id)
+             .join(TopicModel).switch(cls).join(MemberModel)
+             .where(TopicModel.server == server).tuples())
+        return list(await objects.execute(q))
+
 
 class StatisticModel(BaseModel):
     id = AutoField(primary_key=True, unique=True)
@@ -735,6 +793,25 @@ class StatisticModel(BaseModel):
         if changed == 0:
             await cls.create(server_id, member_id, name, amount)
 
+    @classmethod
+    async def increment_many(cls, server_id: int, amounts: dict[tuple[int, str], int]) -> None:
+        """Increment many member stats of one server with a single update, amounts is keyed by (member_id, name)."""
+        if not amounts:
+            return
+        member_ids = list({member_id for member_id, _ in amounts})
+        names = list({name for _, name in amounts})
+        q = cls.select(cls.member_id, cls.name).where(cls.server_id == server_id, cls.member_id << member_ids,
+                                                      cls.name << names)
+        existing = {(stat.member_id, stat.name) for stat in await objects.execute(q)}
+        for key in [key for key in amounts if key not in existing]:
+            await cls.create(server_id, key[0], key[1], amounts[key])
+        cases = [((cls.member_id == member_id) & (cls.name == name), amount)
+                 for (member_id, name), amount in amounts.items() if (member_id, name) in existing]
+        if cases:
+            q = (cls.update(value=cls.value + Case(None, cases, 0), updated=get_aware_utc_now())
+                 .where(cls.server_id == server_id, reduce(operator.or_, [case[0] for case in cases])))
+            await objects.execute(q)
+
     @classmethod
     async def set_value(cls, server_id: int, member_id: Optional[int], name: str, value: int) -> None:
         q = (cls.update(value=value, updated=get_aware_utc_now())
@@ -782,3 +859,29 @@ class StatisticHistoryModel(BaseModel):
         else:
             await cls.create(stat)
 
+
+class MediaInfoModel(BaseModel):
+    id = AutoField(primary_key=True, unique=True)
+    url = CharField(max_length=255, unique=True)
+    data = JSONField(default={})
+    updated = DatetimeTzField(default=get_aware_utc_now)
+
+    class Meta:
+        table_name = 'media_info'
+
+    @classmethod
+    async def get_fresh(cls, url: str, max_age: datetime.timedelta) -> Optional[dict]:
+        """Get the stored info for a url if it was updated within max_age."""
+        try:
+            model = await objects.get(cls, url=url)
+        except DoesNotExist:
+            return None
+        if get_aware_utc_now() - model.updated > max_age:
+            return None
+        return model.data
+
+    @classmethod
+    async def store(cls, url: str, data: dict):
+        now = get_aware_utc_now()
+        q = cls.insert(url=url, data=data, updated=now).on_conflict(update={cls.data: data, cls.updated: now})
+        await objects.execute(q)
@@ -29,6 +29,7 @@ from typing import TYPE_CHECKING, Optional, Union
 import discord
 from discord.utils import utcnow
 
+from .channel_sorter import ChannelSorter
 from .database import DynamicVoiceGroupModel, DynamicVoiceModel
 from .pug import PUGManager
 from .tools.settings import Settings, SettingItem, StringSettingItem
@@ -76,6 +77,9 @@ class DynamicVoiceChannel:
 
         self.prefix = ''
         self.majority_game = None
+        self._member_games: dict[int, Optional[str]] = {}
+        self._game_tally: dict[Optional[str], int] = {}
+        self._bots: set[int] = set()
 
         self.free = True
 
@@ -319,26 +323,56 @@ class DynamicVoiceChannel:
             deleted = await self.channel.purge(before=twelve_days_ago, after=two_weeks_ago, reason='Dynamic Voice Channel Trim')
             logger.debug(f'{self.server.name}: Dynamic Voice: Deleted {len(deleted)} messages in {self.channel.name}')
 
-    async def get_majority_game(self):
-        games = {None: 0}
-        for member in self.channel.members:
-            h_member = self.server.members.get(member.id)
-            if member.bot:
-                continue
-            activity = h_member.get_game_activity()
-            if activity is None:
-                games[None] += 1
-                continue
-            activity = await self.server.games.get_game(activity.name)
-            if activity.name not in games:
-                games[activity.name] = 0
-            games[activity.name] += 1
-        game = max(games, key=games.get)
-        if games[game] <= len(self.channel.members) / 2:
-            self.majority_game = None
+    async def _resolve_game(self, member: discord.Member) -> Optional[str]:
+        name = self.server.presences.get_game(member.id)
+        if name is None:
             return None
+        game = await self.server.games.get_game(name)
+        return game.name if game else None
+
+    def _update_majority_game(self):
+        game = max(self._game_tally, key=self._game_tally.get) if self._game_tally else None
+        if game is not None and self._game_tally[game] <= len(self.channel.members) / 2:
+            game = None
+        if game != self.majority_game:
+            logger.debug(f'{self.server.name}: Dynamic Voice: Majority game in {self.channel.name} is now {game}')
         self.majority_game = game
-        return game
+
+    async def track_member(self, member: discord.Member):
+        """Count a member that joined the channel or changed their presence towards the game tally."""
+        game = None if member.bot else await self._resolve_game(member)
+        self.untrack_member(member.id, update=False)
+        if member.bot:
+            self._bots.add(member.id)
+        else:
+            self._member_games[member.id] = game
+            self._game_tally[game] = self._game_tally.get(game, 0) + 1
+        self._update_majority_game()
+
+    def untrack_member(self, member_id: int, *, update=True):
+        """Remove a member from the game tally."""
+        self._bots.discard(member_id)
+        if member_id in self._member_games:
+            game = self._member_games.pop(member_id)
+            self._game_tally[game] -= 1
+            if self._game_tally[game] <= 0:
+                del self._game_tally[game]
+        if update:
+            self._update_majority_game()
+
+    async def rebuild_game_tally(self):
+        self._member_games.clear()
+        self._game_tally.clear()
+        self._bots.clear()
+        for member in self.channel.members:
+            await self.track_member(member)
+        self._update_majority_game()
+
+    async def get_majority_game(self):
+        if len(self._member_games) + len(self._bots) != len(self.channel.members):
+            # An event was missed, fall back to counting the channel again.
+            await self.rebuild_game_tally()
+        return self.majority_game
 
     def name_on_cooldown(self):
         return datetime.now().astimezone() - self._last_name_change < self.NAME_COOLDOWN
@@ -659,20 +693,13 @@ class DynamicVoiceGroup:
             await DynamicVoiceGroupModel.async_update(self.db_entry, **self.to_dict())
 
 
-def need_sorting(all_channels):
-    discord_channels = all_channels[0].channel.category.voice_channels
-    for i, channel in enumerate(all_channels):
-        if channel.channel != discord_channels[i]:
-            return True
-    return False
-
-
 class VoiceManager:
     def __init__(self, server: 'Server'):
         self.server = server
         self.channels: dict[int, DynamicVoiceChannel] = {}
         self.groups: dict[int, DynamicVoiceGroup] = {}
         self.pug_manager: 'PUGManager' = PUGManager(self.server)
+        self.sorter = ChannelSorter(self.server)
 
         self._setup = False
 
@@ -688,6 +715,7 @@ class VoiceManager:
         channels = await DynamicVoiceChannel.get_all(self)
         for channel in channels:
             self.channels[channel.channel.id] = channel
+            await channel.rebuild_game_tally()
         await self.pug_manager.load_pugs()
         await self.update_control_messages(True)
         self._setup = True
@@ -707,9 +735,12 @@ class VoiceManager:
                 logger.warning(f'{channel.channel.name} was not in the correct category. Moving it.')
                 await channel.channel.edit(category=category)
 
-        if need_sorting(all_channels):
-            for i, channel in enumerate(all_channels):
-                await channel.channel.edit(position=i)
+        category = self.server.settings.dynamic_voice_category.value
+        if category:
+            category = self.server.guild.get_channel(category.id)
+        if category:
+            await self.sorter.sort(category.voice_channels, [x.channel for x in all_channels],
+                                   reason='Dynamic Voice: Sorting Channels')
 
         for channels in grouped:
             nums = [x.number for x in channels]
@@ -718,6 +749,22 @@ class VoiceManager:
                     channel.number = i
                     await channel.save()
 
+    async def on_voice_state_update(self, member: discord.Member, before: discord.VoiceState,
+                                    after: discord.VoiceState):
+        if before.channel == after.channel:
+            return
+        if before.channel and before.channel.id in self.channels:
+            self.channels[before.channel.id].untrack_member(member.id)
+        if after.channel and after.channel.id in self.channels:
+            await self.channels[after.channel.id].track_member(member)
+
+    async def on_presence_update(self, before: discord.Member, after: discord.Member):
+        if after.voice is None or after.voice.channel is None:
+            return
+        channel = self.channels.get(after.voice.channel.id)
+        if channel is not None:
+            await channel.track_member(after)
+
     async def update_names(self):
         for channel in self.channels.values():
             try:
@@ -39,3 +39,9 @@ class TopicChannelStates(Enum):
     PendingArchive = 1
     Archived = 2
     Pinned = 3
+
+
+class ServerStates(Enum):
+    Loading = 0
+    Ready = 1
+    Failed = 2
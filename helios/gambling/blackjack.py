@@ -23,16 +23,21 @@ import asyncio
 import io
 import logging
 from datetime import datetime, timedelta
-from typing import TYPE_CHECKING, Optional, Callable, Awaitable
+from typing import TYPE_CHECKING, Optional, Callable, Awaitable, NamedTuple
 
 import discord
 
-from .cards import Hand, Deck
-from .image import get_member_icon, BlackjackHandImage, BlackjackImage, BlackjackHandSplitImage
+from .cards import Card, Hand, Shoe
+from .editor import MessageEditor
+from .rules import (hand_payout, is_soft_seventeen, dealer_should_hit, perfect_card_value, force_bust_hole_card,
+                    force_bust_draw)
+from .image import (get_member_icon, BlackjackHandImage, BlackjackImage, BlackjackHandSplitImage, FrameRenderer,
+                    FrameFormat, encode_frame)
 from ..colour import Colour
-from ..database import BlackjackModel
+from ..database import BlackjackModel, BlackjackEventModel, objects
 from ..items import Item, Items
 from ..member import HeliosMember
+from ..statistic import Stat
 from ..tools.modals import AmountModal
 from ..views import ItemSelectorView, YesNoView, StartBlackjackView
 
@@ -50,6 +55,17 @@ def turn_timer(seconds: int) -> Callable[[], Awaitable[None]]:
     return inner
 
 
+class FrameSnapshot(NamedTuple):
+    """Copies of everything a frame draws, taken on the event loop so the render thread never reads live state."""
+    dealer: tuple['BlackjackHandImage', list[Hand]]
+    hands: list[tuple['BlackjackHandImage', list[Hand]]]
+    current_player: int
+    current_hand: int
+    id: int
+    winnings: list[list[int]]
+    frame_format: FrameFormat
+
+
 # noinspection PyAsyncCall
 class Blackjack:
     def __init__(self, manager: 'GamblingManager', channel: discord.TextChannel):
@@ -59,7 +75,7 @@ class Blackjack:
 
         self.players: list[HeliosMember] = []
         self.icons: list['Image'] = []
-        self.deck: Deck = Deck()
+        self.deck: Shoe = manager.get_shoe(channel)
         self.hands: list[list[Hand]] = []
         self.hand_images: list['BlackjackHandImage'] = []
         self.bets: list[list[int]] = []
@@ -67,6 +83,7 @@ class Blackjack:
         self.credits: list[Optional['Item']] = []
 
         self.board_lock = asyncio.Lock()
+        self.renderer: FrameRenderer[bytes] = FrameRenderer()
 
         self.current_player: int = -1
         self.current_hand: int = 0
@@ -77,22 +94,26 @@ class Blackjack:
         self.dealer_icon: 'Image' = None
         self.dealer_hand: Hand = Hand()
         self.dealer_hand_image: Optional['BlackjackHandImage'] = None
+        self.table_image: Optional['BlackjackImage'] = None
         self.force_bust = False
         self.og_dealer_hand: Optional[Hand] = None
 
-        self.message: Optional['discord.Message'] = None
+        self.editor = MessageEditor(channel, resend_content='Don\'t delete this')
         self.view: Optional['discord.ui.View'] = None
         self.db_entry: Optional['BlackjackModel'] = None
+        self.events: list[str] = []
+        self._saved_events = 0
 
     def reset(self):
         self.players = []
         self.icons = []
-        self.deck = Deck()
+        self.deck = self.manager.get_shoe(self.channel)
         self.hands = [Hand()]
         self.bets = []
         self.powerups = []
         self.credits = []
         self.hand_images = []
+        self.table_image = None
         self.dealer_hand = Hand()
 
     def to_dict(self):
@@ -117,15 +138,40 @@ class Blackjack:
             'powerups': self.powerups,
         }
 
+    def log(self, seat: str, event: str):
+        """
+        Record an action in the game's event log, it is saved in batches by save_events.
+        seat is 'D' for the dealer or 'player.hand', event is a card like 'As' ('*' when dealt face down) or an action.
+        """
+        self.events.append(f'{seat}:{event}'[:32])
+
+    def log_card(self, seat: str, card: 'Card'):
+        self.log(seat, card.short() + ('*' if card.hidden else ''))
+
+    def current_seat(self) -> str:
+        return f'{self.current_player}.{self.current_hand}'
+
+    async def save_events(self):
+        events = self.events[self._saved_events:]
+        await BlackjackEventModel.append(self.db_entry, self._saved_events, events)
+        self._saved_events += len(events)
+
+    @property
+    def message(self) -> Optional['discord.Message']:
+        return self.editor.message
+
     async def update_message(self, state: str, timer: int = 0):
-        img = self.get_image_file(state, timer)
-        if self.message:
-            try:
-                await self.message.edit(attachments=[img], view=self.view)
-            except discord.NotFound:
-                self.message = await self.channel.send(content='Don\'t delete this', files=[img], view=self.view)
-        else:
-            self.message = await self.channel.send(files=[img], view=self.view)
+        """Queue a new frame, this does not wait for Discord. Await editor.flush() to wait for it to be sent."""
+        self.editor.update(lambda: self.build_frame(state, timer))
+
+    async def build_frame(self, state: str, timer: int) -> Optional[dict]:
+        snapshot = self.snapshot_frame()
+        data = await self.renderer.submit(lambda: self.render_frame(state, timer, snapshot))
+        if data is None:
+            # A newer frame replaced this one before it was rendered.
+            return None
+        img = discord.File(io.BytesIO(data), f'blackjack.{snapshot.frame_format.extension}')
+        return {'attachments': [img], 'view': self.view}
 
     async def add_player(self, player: HeliosMember, bet: int = 0, credit: 'Item' = None):
         self.players.append(player)
@@ -133,7 +179,8 @@ class Blackjack:
         self.bets.append([bet])
         self.powerups.append(None)
         self.credits.append(credit)
-        self.icons.append(await get_member_icon(player.bot.get_session(), player.member.display_avatar.url))
+        self.icons.append(await get_member_icon(player.bot.get_session(),
+                                                player.member.display_avatar.with_size(128).url))
         self.generate_hand_images()
 
     async def remove_player(self, player: HeliosMember):
@@ -151,7 +198,10 @@ class Blackjack:
         await self.generate_dealer_image()
         self.generate_hand_images()
         self.view = BlackjackJoinView(self)
-        self.deck.shuffle()
+        if self.deck.needs_shuffle:
+            self.deck.reset()
+            self.deck.shuffle()
+            self.log('D', 'shuffle')
         seconds = 30
         await self.update_message('Waiting For Players to Join', seconds)
         then = datetime.now() + timedelta(seconds=seconds)
@@ -168,8 +218,9 @@ class Blackjack:
             self.view.stop()
             await self.update_message('Not Enough Players')
             await asyncio.sleep(5)
+            self.view = StartBlackjackView(self.manager.server.bot)
             await self.update_message('Click to Start')
-            await self.message.edit(view=StartBlackjackView(self.manager.server.bot))
+            await self.editor.flush()
             return
         try:
             await self.run()
@@ -195,7 +246,9 @@ class Blackjack:
                 await self.remove_player(player)
         if len(self.players) < 1:
             await self.update_message('Not Enough Players')
-            await self.message.delete(delay=5)
+            await self.editor.flush()
+            if self.message:
+                await self.message.delete(delay=5)
             return
 
         # Create Database Entry and set ID
@@ -203,13 +256,15 @@ class Blackjack:
         self.id = self.db_entry.id
 
         # Take Bets
+        bets = []
         for player in self.players[:]:
             bet = self.bets[self.players.index(player)][0]
             credit = self.credits[self.players.index(player)]
             if credit:
                 await player.inventory.remove_item(credit)
             else:
-                await player.add_points(-bet, 'Helios: Blackjack', f'{self.id}: Bet')
+                bets.append((player, -bet, 'Helios: Blackjack', f'{self.id}: Bet'))
+        await HeliosMember.add_points_many(bets)
 
         # Make Board
         self.generate_hand_images()
@@ -219,26 +274,27 @@ class Blackjack:
 
         # Draw Initial Cards
         self.deck.draw_to_hand(self.dealer_hand)
+        self.log_card('D', self.dealer_hand.cards[-1])
         await self.update_message('Drawing Cards')
-        await self.db_entry.async_update(**self.to_dict())
         await asyncio.sleep(0.5)
 
-        for hand in self.hands:
+        for i, hand in enumerate(self.hands):
             self.deck.draw_to_hand(hand[0])
+            self.log_card(f'{i}.0', hand[0].cards[-1])
             await self.update_message('Drawing Cards')
-            await self.db_entry.async_update(**self.to_dict())
             await asyncio.sleep(0.5)
 
         self.deck.draw_to_hand(self.dealer_hand, hidden=True)
+        self.log_card('D', self.dealer_hand.cards[-1])
         await self.update_message('Drawing Cards')
-        await self.db_entry.async_update(**self.to_dict())
         await asyncio.sleep(0.5)
 
-        for hand in self.hands:
+        for i, hand in enumerate(self.hands):
             self.deck.draw_to_hand(hand[0])
+            self.log_card(f'{i}.0', hand[0].cards[-1])
             await self.update_message('Drawing Cards')
-            await self.db_entry.async_update(**self.to_dict())
             await asyncio.sleep(0.5)
+        await self.save_events()
 
         if self.dealer_hand.get_hand_bj_values(False) in [11, 10]:
             await self.update_message('Dealer Checking for Blackjack')
@@ -268,54 +324,65 @@ class Blackjack:
                     self.view.stop()
                     await self.stand()
                     continue
-            await self.db_entry.async_update(**self.to_dict())
+            await self.save_events()
             self.view = None
 
             await self.dealer_play()
 
             await self.update_message('Calculating Winnings')
-            await self.db_entry.async_update(**self.to_dict())
             await asyncio.sleep(1)
 
         self.calculate_winnings()
-        stats = []
+        await self.settle()
+        await self.update_message('Game Over')
+        await self.editor.flush()
+        asyncio.create_task(self.manager.run_blackjack(self.channel))
+
+    async def settle(self):
+        """Pay out, record stats and save the final snapshot of the game in a single transaction."""
+        payouts = []
+        stats: list[tuple[Stat, int]] = []
         for i, player in enumerate(self.players):
-            stats.append(player.statistics.bj_games.increment())
+            stats.append((player.statistics.bj_games, 1))
             for j, winning in enumerate(self.winnings[i]):
                 desc = f'{self.id}: Winnings'
                 if j > 0:
                     desc = f'{self.id}: Split Winnings'
-                await player.add_points(winning, 'Helios: Blackjack', desc)
+                payouts.append((player, winning, 'Helios: Blackjack', desc))
             total_bets = sum(self.bets[i])
             total_winnings = sum(self.winnings[i])
 
             # Stats
             if total_winnings > total_bets:
                 winning = total_winnings - total_bets
-                stats.append(player.statistics.bj_wins.increment())
-                stats.append(player.statistics.bj_amt_won.increment(winning))
+                stats.append((player.statistics.bj_wins, 1))
+                stats.append((player.statistics.bj_amt_won, winning))
             elif total_winnings < total_bets:
                 losing = total_bets - total_winnings
-                stats.append(player.statistics.bj_losses.increment())
-                stats.append(player.statistics.bj_amt_lost.increment(losing))
+                stats.append((player.statistics.bj_losses, 1))
+                stats.append((player.statistics.bj_amt_lost, losing))
             else:
-                stats.append(player.statistics.bj_ties.increment())
+                stats.append((player.statistics.bj_ties, 1))
 
             self.manager.add_loss(player, total_bets - total_winnings)
-        await self.update_message('Game Over')
-        await self.db_entry.async_update(winnings=self.winnings)
-        if stats:
-            [asyncio.create_task(x) for x in stats]
-        asyncio.create_task(self.manager.run_blackjack(self.channel))
+
+        async with objects.atomic():
+            await self.save_events()
+            await self.db_entry.async_update(**self.to_dict())
+            await Stat.increment_many(stats)
+            await HeliosMember.add_points_many(payouts)
 
     async def hit(self):
         hand = self.hands[self.current_player][self.current_hand]
-        if len(self.deck.cards) < 1:
-            self.deck = Deck()
+        if len(self.deck) < 1:
+            self.deck.reset()
             self.deck.shuffle()
+            self.log('D', 'shuffle')
         self.deck.draw_to_hand(hand)
+        self.log_card(self.current_seat(), hand.cards[-1])
 
     async def stand(self):
+        self.log(self.current_seat(), 'stand')
         if len(self.hands[self.current_player]) > self.current_hand + 1:
             self.current_hand += 1
         else:
@@ -324,6 +391,7 @@ class Blackjack:
 
     async def use_powerup(self, powerup: str):
         self.powerups[self.current_player] = powerup
+        self.log(self.current_seat(), powerup)
         if powerup == 'force_bust':
             self.force_bust = True
         elif powerup == 'surrender':
@@ -340,7 +408,7 @@ class Blackjack:
             self.generate_hand_images()
             await self.update_message('Showing Dealer Card')
         elif powerup == 'show_next':
-            card = self.deck.cards[-1]
+            card = self.deck.peek()
             card.hidden = False
             await self.update_message('Showing Next Card')
             await self.channel.send('The next card is...',
@@ -350,10 +418,10 @@ class Blackjack:
             hand = self.hands[self.current_player][self.current_hand]
             value = hand.get_hand_bj_values()
             if value < 21:
-                remaining = 21 - value
-                card = self.draw_specific(remaining if remaining < 11 else 1)
+                card = self.draw_specific(perfect_card_value(value))
                 if card:
                     hand.add_card(card)
+                    self.log_card(self.current_seat(), card)
                     await self.update_message('Drawing Perfect Card')
                 else:
                     await self.update_message('No Perfect Card Found')
@@ -361,45 +429,34 @@ class Blackjack:
         return self.powerups[self.current_player] is not None
 
     def is_soft_seventeen(self):
-        if (self.dealer_hand.get_hand_bj_values() == 17
-                and self.dealer_hand.get_hand_bj_values(suppress_eleven=True) < 17):
-            soft_seventeen = True
-        else:
-            soft_seventeen = False
-        return soft_seventeen
+        return is_soft_seventeen(self.dealer_hand)
 
     async def dealer_play(self):
         if self.force_bust:
             self.og_dealer_hand = self.dealer_hand.copy()
-            if self.dealer_hand.get_hand_bj_values(show_hidden=True) >= 17:
-                logger.debug('Dealer has 17 or higher, changing cards to allow forcing a bust.')
-                first_card_value = self.dealer_hand.cards[0].bj_value()
-                if first_card_value == 1:
-                    first_card_value = 11
-                card = self.deck.draw_filter(lambda c: (c.bj_value() if c.bj_value() != 1 else 11) + first_card_value < 17)
-                if card:
-                    self.dealer_hand.cards.pop()
-                    self.dealer_hand.add_card(card)
-                    logger.debug(f'Chose card {card} to allow forcing a bust.')
+            card = force_bust_hole_card(self.deck, self.dealer_hand)
+            if card:
+                self.dealer_hand.pop()
+                self.dealer_hand.add_card(card)
+                self.log('D', 'replace')
+                self.log_card('D', card)
+                logger.debug(f'Dealer had 17 or higher, chose card {card} to allow forcing a bust.')
 
         for card in self.dealer_hand.cards:
             card.hidden = False
+        self.log('D', 'reveal')
         self.generate_hand_images()
         await self.update_message('Dealer Playing')
         await asyncio.sleep(1)
 
-        while self.is_soft_seventeen() or self.dealer_hand.get_hand_bj_values() < 17:
-            if len(self.deck.cards) < 1:
-                self.deck = Deck()
+        while dealer_should_hit(self.dealer_hand):
+            if len(self.deck) < 1:
+                self.deck.reset()
                 self.deck.shuffle()
+                self.log('D', 'shuffle')
             if self.force_bust:
-                dealer_value = self.dealer_hand.get_hand_bj_values()
-                if dealer_value < 12:
-                    card = self.deck.draw_filter(lambda c: 1 < c.bj_value() and c.bj_value() + dealer_value < 17)
-                    logger.debug(f'Chose small card {card} to setup bust.')
-                else:
-                    card = self.deck.draw_filter(lambda c: c.bj_value() + dealer_value > 21)
-                    logger.debug(f'Chose large card {card} to bust.')
+                card = force_bust_draw(self.deck, self.dealer_hand)
+                logger.debug(f'Chose card {card} to force a bust.')
                 if card:
                     self.dealer_hand.add_card(card)
                 else:
@@ -407,6 +464,7 @@ class Blackjack:
                     self.deck.draw_to_hand(self.dealer_hand)
             else:
                 self.deck.draw_to_hand(self.dealer_hand)
+            self.log_card('D', self.dealer_hand.cards[-1])
             await self.update_message('Dealer Playing')
             await asyncio.sleep(1)
         if self.dealer_hand.get_hand_bj_values() > 21:
@@ -425,11 +483,9 @@ class Blackjack:
 
     def calculate_winnings(self):
         winnings = []
-        dealer_value = self.dealer_hand.get_hand_bj_values()
         for i, player in enumerate(self.players):
             amount_won = []
             for j, hand in enumerate(self.hands[i]):
-                player_value = hand.get_hand_bj_values()
                 credit = self.credits[i].data['credit'] if self.credits[i] else None
                 if self.powerups[i] == 'surrender':
                     amount_won.append(0)
@@ -439,25 +495,7 @@ class Blackjack:
                     bet = credit
                 else:
                     bet = self.bets[i][j]
-                won = 0
-                if len(self.dealer_hand.cards) == 2 and dealer_value == 21:
-                    if len(hand.cards) == 2 and player_value == 21:
-                        won = bet
-                    else:
-                        won = 0
-                elif len(hand.cards) == 2 and player_value == 21:
-                    won = int(bet * 2.5)
-                elif player_value > 21:
-                    won = 0
-                elif dealer_value > 21:
-                    won = bet * 2
-                elif player_value == dealer_value == 21:
-                    won = int(bet * 1.5)
-                elif player_value == dealer_value:
-                    won = bet
-                elif player_value > dealer_value:
-                    won = bet * 2
-                amount_won.append(won)
+                amount_won.append(hand_payout(hand, self.dealer_hand, bet))
             winnings.append(amount_won)
         self.winnings = winnings
         return winnings
@@ -466,7 +504,7 @@ class Blackjack:
         self.hand_images = []
         for hands, icon, bets, player in zip(self.hands, self.icons, self.bets, self.players):
             if len(hands) > 1:
-                self.hand_images.append(BlackjackHandSplitImage(hands, icon, player.member.display_name[:10], bets))
+                self.hand_images.append(BlackjackHandSplitImage(hands, icon, player.member.display_name[:10], list(bets)))
             else:
                 credit = self.credits[self.players.index(player)]
                 if self.powerups[self.players.index(player)] == 'surrender':
@@ -478,16 +516,50 @@ class Blackjack:
 
     async def generate_dealer_image(self):
         self.dealer_icon = await get_member_icon(self.server.bot.get_session(),
-                                                 self.server.bot.user.display_avatar.url)
+                                                 self.server.bot.user.display_avatar.with_size(128).url)
+
+    @property
+    def frame_format(self) -> FrameFormat:
+        return FrameFormat(self.server.bot.settings.frame_format)
+
+    def snapshot_frame(self) -> FrameSnapshot:
+        """
+        Hand images are only touched by the render thread once they are made, the event loop replaces them
+        through generate_hand_images instead of changing them.
+        """
+        return FrameSnapshot(
+            dealer=(self.dealer_hand_image, [self.dealer_hand.copy()]),
+            hands=[(image, [hand.copy() for hand in hands]) for image, hands in zip(self.hand_images, self.hands)],
+            current_player=self.current_player,
+            current_hand=self.current_hand,
+            id=self.id if self.id else 0,
+            winnings=[list(amounts) for amounts in self.winnings],
+            frame_format=self.frame_format
+        )
+
+    def render_frame(self, state: str, timer: int, snapshot: FrameSnapshot) -> bytes:
+        """Runs on the render thread, everything it reads comes from the snapshot."""
+        for image, hands in [snapshot.dealer, *snapshot.hands]:
+            image.hand = hands[0]
+            if isinstance(image, BlackjackHandSplitImage):
+                image.hands = hands
+        dealer_image = snapshot.dealer[0]
+        hand_images = [image for image, _ in snapshot.hands]
+        if self.table_image is None:
+            self.table_image = BlackjackImage(dealer_image, hand_images)
+        table = self.table_image
+        table.dealer_hand = dealer_image
+        table.hands = hand_images
+        table.current_hand = snapshot.current_player
+        table.current_split_hand = snapshot.current_hand
+        table.id = snapshot.id
+        table.winnings = snapshot.winnings
+        return encode_frame(table.get_image(state, timer), snapshot.frame_format)
 
     def get_image_file(self, state: str, timer: int) -> discord.File:
-        img = BlackjackImage(self.dealer_hand_image, self.hand_images, self.current_player, self.current_hand,
-                             self.id if self.id else 0, self.winnings).get_image(state, timer)
-        with io.BytesIO() as img_bytes:
-            img.save(img_bytes, format='PNG')
-            img_bytes.seek(0)
-            file = discord.File(img_bytes, 'blackjack.png')
-        return file
+        snapshot = self.snapshot_frame()
+        return discord.File(io.BytesIO(self.render_frame(state, timer, snapshot)),
+                            f'blackjack.{snapshot.frame_format.extension}')
 
     def get_hands(self, player: HeliosMember):
         index = self.players.index(player)
@@ -560,12 +632,9 @@ class BlackjackView(discord.ui.View):
         hand_num = self.blackjack.current_hand
         player_num = self.blackjack.current_player
         self.blackjack.bets[player_num][hand_num] *= 2
-        hand_image = self.blackjack.hand_images[player_num]
-        if isinstance(hand_image, BlackjackHandSplitImage):
-            hand_image.bets[hand_num] = self.blackjack.bets[player_num][hand_num]
-        else:
-            hand_image.bet = self.blackjack.bets[player_num][hand_num]
-        hand_image.get_image(redraw=True)
+        # The render thread may be drawing the current hand image, so replace it rather than redraw it here.
+        self.blackjack.generate_hand_images()
+        self.blackjack.log(self.blackjack.current_seat(), 'double')
         await self.blackjack.hit()
         await self.blackjack.stand()
         self.stop()
@@ -597,14 +666,16 @@ class BlackjackView(discord.ui.View):
                                     f'{self.blackjack.id}: Split Bet')
             self.blackjack.bets[self.blackjack.current_player].append(self.blackjack.bets[self.blackjack.current_player][0])
             new_hand = Hand()
-            new_hand.add_card(hand.cards.pop())
+            new_hand.add_card(hand.pop())
             self.blackjack.hands[self.blackjack.current_player].append(new_hand)
+            self.blackjack.log(self.blackjack.current_seat(), 'split')
             self.blackjack.generate_hand_images()
             self.blackjack.view = None
             await self.blackjack.update_message('Splitting')
             await asyncio.sleep(0.5)
-            for hand in self.blackjack.hands[self.blackjack.current_player]:
+            for i, hand in enumerate(self.blackjack.hands[self.blackjack.current_player]):
                 self.blackjack.deck.draw_to_hand(hand)
+                self.blackjack.log_card(f'{self.blackjack.current_player}.{i}', hand.cards[-1])
                 await self.blackjack.update_message('Drawing Cards')
                 await asyncio.sleep(0.5)
             self.stop()
@@ -718,7 +789,7 @@ class BlackjackJoinView(discord.ui.View):
             return
 
         if await self.blackjack.manager.needs_help(member):
-            dealer_cards = [self.blackjack.deck.cards[-1], self.blackjack.deck.cards[-len(self.blackjack.players) - 3]]
+            dealer_cards = [self.blackjack.deck.peek(), self.blackjack.deck.peek(len(self.blackjack.players) + 2)]
             dealer_hand = Hand()
             dealer_hand.add_cards(dealer_cards)
             if dealer_hand.get_hand_bj_values() == 21:
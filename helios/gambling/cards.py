@@ -21,6 +21,7 @@
 #  SOFTWARE.
 import random
 from enum import Enum
+from typing import Optional
 
 
 class Suits(Enum):
@@ -46,52 +47,96 @@ class Values(Enum):
     ace = 'A'
 
 
+_RANKS = '23456789TJQKA'
+_SUITS = 'cdhs'
+# Cards are a single int, rank * 4 + suit, the same encoding the poker evaluator uses.
+_VALUE_LIST = [Values(r) for r in _RANKS]
+_SUIT_LIST = [Suits(s) for s in _SUITS]
+_BJ_VALUES = (2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10, 1)
+ACE = 12
+
+
 class Card:
+    __slots__ = ('code', 'hidden')
+
     def __init__(self, suit: Suits, value: Values):
-        self.suit = suit
-        self.value = value
+        self.code = _RANKS.index(value.value) * 4 + _SUITS.index(suit.value)
         self.hidden = False
 
+    @classmethod
+    def from_int(cls, code: int) -> 'Card':
+        card = cls.__new__(cls)
+        card.code = code
+        card.hidden = False
+        return card
+
+    @classmethod
+    def from_str(cls, short: str) -> 'Card':
+        return cls.from_int(_RANKS.index(short[0]) * 4 + _SUITS.index(short[1]))
+
+    @property
+    def rank(self) -> int:
+        return self.code >> 2
+
+    @property
+    def suit(self) -> Suits:
+        return _SUIT_LIST[self.code & 3]
+
+    @property
+    def value(self) -> Values:
+        return _VALUE_LIST[self.code >> 2]
+
+    def __int__(self):
+        return self.code
+
     def __str__(self):
-        return f'{self.value.value}{self.suit.value}'
+        return f'{_RANKS[self.code >> 2]}{_SUITS[self.code & 3]}'
 
     def __repr__(self):
         return f'Card<{self.value.name} of {self.suit.name}>'
 
     def __eq__(self, o: object):
         if isinstance(o, Card):
-            return self.suit == o.suit and self.value == o.value
+            return self.code == o.code
         return NotImplemented
 
+    def __hash__(self):
+        return self.code
+
     def short(self):
-        return f'{self.value.value}{self.suit.value[0]}'
+        return str(self)
 
     def bj_value(self):
-        if self.value in [Values.jack, Values.queen, Values.king]:
-            return 10
-        if self.value == Values.ace:
-            return 1
-        if self.value == Values.ten:
-            return 10
-        return int(self.value.value)
+        return _BJ_VALUES[self.code >> 2]
 
 
 class Deck:
-    def __init__(self):
-        self.cards: list[Card] = []
+    def __init__(self, decks: int = 1, *, penetration: float = 1.0):
+        """
+        One or more decks, the top card is the end of cards. Positions are also kept in per rank buckets so
+        filtered draws only check each rank once. Cards taken from the middle leave a gap behind so the rest
+        of the deck keeps its order. needs_shuffle is True once the cut card comes out.
+        """
+        self.decks = decks
+        self.penetration = penetration
+        self._cards: list[Optional[Card]] = []
+        self._buckets: list[list[int]] = [[] for _ in _RANKS]
+        self._slots: list[int] = []
+        self._count = 0
+        self.cut = 0
         self.reset()
 
     def __str__(self):
-        return f'{len(self.cards)} cards'
+        return f'{self._count} cards'
 
     def __repr__(self):
-        return f'Deck<{len(self.cards)} cards>'
+        return f'Deck<{self._count} cards>'
 
     def __len__(self):
-        return len(self.cards)
+        return self._count
 
     def __iter__(self):
-        return iter(self.cards)
+        return (card for card in self._cards if card is not None)
 
     def __add__(self, o: object):
         if isinstance(o, Deck):
@@ -103,53 +148,123 @@ class Deck:
 
     def __iadd__(self, o: object):
         if isinstance(o, Deck):
-            self.cards += o.cards
+            self.cards = self.cards + o.cards
             return self
         return NotImplemented
 
+    @property
+    def cards(self) -> list[Card]:
+        return list(self)
+
+    @cards.setter
+    def cards(self, cards: list[Card]):
+        self._cards = list(cards)
+        self._index()
+
+    @property
+    def needs_shuffle(self) -> bool:
+        return self._count <= self.cut
+
     @classmethod
     def from_cards(cls, cards: list[Card]):
         deck = cls()
         deck.cards = cards
         return deck
 
+    @classmethod
+    def from_ints(cls, codes: list[int]):
+        return cls.from_cards([Card.from_int(code) for code in codes])
+
     @classmethod
     def new_many(cls, n: int):
-        deck = None
-        for _ in range(n):
-            if deck is None:
-                deck = cls()
-            else:
-                deck += cls()
-        return deck
+        return cls(n)
+
+    def to_ints(self) -> list[int]:
+        return [card.code for card in self]
+
+    def peek(self, depth: int = 0) -> Optional[Card]:
+        """The card depth places below the top, without drawing it."""
+        for pos in range(len(self._cards) - 1, -1, -1):
+            card = self._cards[pos]
+            if card is None:
+                continue
+            if depth == 0:
+                return card
+            depth -= 1
+        return None
+
+    def _index(self):
+        self._buckets = [[] for _ in _RANKS]
+        self._slots = [0] * len(self._cards)
+        for pos, card in enumerate(self._cards):
+            bucket = self._buckets[card.code >> 2]
+            self._slots[pos] = len(bucket)
+            bucket.append(pos)
+        self._count = len(self._cards)
+        self.cut = self._count - int(self._count * self.penetration)
+
+    def _take(self, pos: int) -> Card:
+        """Remove the card at pos, leaving a gap so the cards around it keep their order."""
+        cards, buckets, slots = self._cards, self._buckets, self._slots
+        card = cards[pos]
+        bucket = buckets[card.code >> 2]
+        moved = bucket[-1]
+        bucket[slots[pos]] = moved
+        slots[moved] = slots[pos]
+        bucket.pop()
+
+        cards[pos] = None
+        while cards and cards[-1] is None:
+            cards.pop()
+            slots.pop()
+        self._count -= 1
+        return card
 
     def draw(self, hidden=False):
-        card = self.cards.pop()
+        card = self._take(len(self._cards) - 1)
         card.hidden = hidden
         return card
 
     def draw_filter(self, filter_func, hidden=False):
-        reversed_cards = list(reversed(self.cards))
-        for card in reversed_cards:
-            if filter_func(card):
-                i = self.cards.index(card)
+        """Draw a random card matching filter_func, which is checked once per rank instead of once per card."""
+        matches = [bucket for bucket in self._buckets if bucket and filter_func(self._cards[bucket[0]])]
+        i = random.randrange(sum(len(bucket) for bucket in matches)) if matches else 0
+        for bucket in matches:
+            if i < len(bucket):
+                card = self._take(bucket[i])
                 card.hidden = hidden
-                return self.cards.pop(i)
+                return card
+            i -= len(bucket)
         return None
 
     def draw_to_hand(self, hand, hidden=False):
         hand.add_card(self.draw(hidden))
 
     def reset(self):
-        self.cards = [Card(s, v) for s in Suits for v in Values]
+        self.cards = [Card(s, v) for _ in range(self.decks) for s in Suits for v in Values]
 
     def shuffle(self):
-        random.shuffle(self.cards)
+        cards = self.cards
+        random.shuffle(cards)
+        self.cards = cards
+
+
+class Shoe(Deck):
+    def __init__(self, decks: int = 6, *, penetration: float = 0.75):
+        """A shoe always comes out of the box shuffled."""
+        super().__init__(decks, penetration=penetration)
+        self.shuffle()
+
+    def __repr__(self):
+        return f'Shoe<{self.decks} decks, {self._count} cards>'
 
 
 class Hand:
     def __init__(self):
+        """Change cards through add_card, add_cards and pop so the running totals stay correct."""
         self.cards: list[Card] = []
+        self._total = 0
+        self._aces = 0
 
     def to_dict(self):
         return [str(card) for card in self.cards]
@@ -157,29 +272,51 @@ class Hand:
     @classmethod
     def from_dict(cls, data):
         hand = cls()
-        hand.add_cards([Card(Suits(card[1]), Values(card[0])) for card in data])
+        hand.add_cards([Card.from_str(card) for card in data])
+        return hand
+
+    def to_ints(self) -> list[int]:
+        return [card.code for card in self.cards]
+
+    @classmethod
+    def from_ints(cls, codes: list[int]):
+        hand = cls()
+        hand.add_cards([Card.from_int(code) for code in codes])
         return hand
 
     def copy(self):
-        return Hand.from_dict(self.to_dict())
+        hand = Hand()
+        for card in self.cards:
+            copy = Card.from_int(card.code)
+            copy.hidden = card.hidden
+            hand.add_card(copy)
+        return hand
 
     def add_card(self, card: Card):
         self.cards.append(card)
+        self._total += _BJ_VALUES[card.code >> 2]
+        self._aces += card.code >> 2 == ACE
 
     def add_cards(self, cards: list[Card]):
-        self.cards += cards
+        for card in cards:
+            self.add_card(card)
 
-    def get_hand_bj_values(self, show_hidden=True, suppress_eleven=False) -> int:
-        value = 0
-        has_ace = False
-        for card in self.cards:
-            if card.hidden and not show_hidden:
-                continue
-            if card.bj_value() == 1:
-                has_ace = True
-            value += card.bj_value()
+    def pop(self, index: int = -1) -> Card:
+        card = self.cards.pop(index)
+        self._total -= _BJ_VALUES[card.code >> 2]
+        self._aces -= card.code >> 2 == ACE
+        return card
 
-        if has_ace and value <= 11 and not suppress_eleven:
+    def get_hand_bj_values(self, show_hidden=True, suppress_eleven=False) -> int:
+        value = self._total
+        aces = self._aces
+        if not show_hidden:
+            for card in self.cards:
+                if card.hidden:
+                    value -= _BJ_VALUES[card.code >> 2]
+                    aces -= card.code >> 2 == ACE
+
+        if aces and value <= 11 and not suppress_eleven:
             value += 10
         return value
 
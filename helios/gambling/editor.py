@@ -0,0 +1,106 @@
+#  MIT License
+#
+#  Copyright (c) 2024 Riley Winkler
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+import asyncio
+import logging
+from datetime import timedelta
+from typing import Optional, Callable, Awaitable, Any
+
+import discord
+
+logger = logging.getLogger('HeliosLogger.MessageEditor')
+
+EditBuilder = Callable[[], Awaitable[Optional[dict[str, Any]]]]
+
+
+class MessageEditor:
+    MIN_INTERVAL = timedelta(seconds=1)
+
+    def __init__(self, channel: discord.abc.Messageable, message: Optional[discord.Message] = None, *,
+                 min_interval: timedelta = MIN_INTERVAL, resend_content: Optional[str] = None):
+        """
+        Keeps one message up to date without running into edit rate limits.
+        Updates are queued without waiting on Discord, at most one edit is made per min_interval and only the newest
+        update is ever sent, older ones waiting their turn are skipped.
+        """
+        self.channel = channel
+        self.message = message
+        self.min_interval = min_interval
+        self.resend_content = resend_content
+        self.sent = 0
+        self.skipped = 0
+
+        self._pending: Optional[EditBuilder] = None
+        self._task: Optional[asyncio.Task] = None
+        self._last_edit: Optional[float] = None
+
+    def update(self, build: EditBuilder):
+        """
+        Queue the next state of the message.
+        build is only awaited when the edit is about to be sent, it returns the keyword arguments for the edit or
+        None to skip it.
+        """
+        if self._pending is not None:
+            self.skipped += 1
+        self._pending = build
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def flush(self):
+        """Wait until the newest queued state has been sent."""
+        while self._task is not None and not self._task.done():
+            await asyncio.shield(self._task)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while self._pending is not None:
+            if self._last_edit is not None:
+                wait = self._last_edit + self.min_interval.total_seconds() - loop.time()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            build = self._pending
+            self._pending = None
+            try:
+                await self._send(build)
+            except Exception as e:
+                logger.exception(e)
+            self._last_edit = loop.time()
+
+    async def _send(self, build: EditBuilder):
+        kwargs = await build()
+        if kwargs is None:
+            return
+        if self.message:
+            try:
+                await self.message.edit(**kwargs)
+                self.sent += 1
+                return
+            except discord.NotFound:
+                # Files are closed once a request is made, so build the message again.
+                kwargs = await build()
+                if kwargs is None:
+                    return
+                if self.resend_content is not None:
+                    kwargs['content'] = self.resend_content
+        if 'attachments' in kwargs:
+            kwargs['files'] = kwargs.pop('attachments')
+        self.message = await self.channel.send(**kwargs)
+        self.sent += 1
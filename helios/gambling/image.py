@@ -19,13 +19,21 @@
 #  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 #  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 #  SOFTWARE.
+import asyncio
 import io
 import math
-from datetime import timedelta
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta, datetime
+from enum import Enum
+from functools import partial
+from pathlib import Path
 
 import discord
 import requests
-from typing import Union, TYPE_CHECKING, Optional, Literal
+from discord.utils import utcnow
+from typing import Union, TYPE_CHECKING, Optional, Literal, Callable, Generic, TypeVar
 
 import numpy as np
 from PIL import Image, ImageDraw, ImageOps, ImageFont
@@ -59,6 +67,119 @@ if TYPE_CHECKING:
 #     return b
 
 
+T = TypeVar('T')
+
+CARDS_PATH = Path(__file__).parent.parent / 'resources' / 'cards'
+_render_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='HeliosRender')
+_card_sprites: dict[str, Image.Image] = {}
+_card_sprites_lock = threading.Lock()
+_fonts: dict[int, ImageFont.FreeTypeFont] = {}
+
+
+def load_card_sprites() -> dict[str, Image.Image]:
+    """
+    Decode every card sprite once for the whole process, keyed by the card's short name or 'back'.
+    Frames render on more than one thread, so the sprites are only published once they are all decoded.
+    """
+    global _card_sprites
+    if not _card_sprites:
+        with _card_sprites_lock:
+            if not _card_sprites:
+                sprites = {}
+                for path in CARDS_PATH.glob('*.png'):
+                    with Image.open(path) as img:
+                        sprites[path.stem] = img.convert('RGBA')
+                _card_sprites = sprites
+    return _card_sprites
+
+
+def get_card_sprite(name: str) -> Optional[Image.Image]:
+    return load_card_sprites().get(name)
+
+
+def get_font(size: int) -> ImageFont.FreeTypeFont:
+    """Load the default font at a size once, drawing with font_size reloads it on every call."""
+    font = _fonts.get(size)
+    if font is None:
+        font = _fonts[size] = ImageFont.load_default(size)
+    return font
+
+
+class FrameFormat(Enum):
+    png = 'png'
+    fast_png = 'fast_png'
+    palette_png = 'palette_png'
+    webp = 'webp'
+
+    @property
+    def extension(self) -> str:
+        return 'webp' if self == FrameFormat.webp else 'png'
+
+
+def encode_frame(img: Image.Image, frame_format: FrameFormat = FrameFormat.png) -> bytes:
+    """
+    Encode a frame for upload.
+    png: Default PNG compression.
+    fast_png: PNG with the lowest zlib compression, larger files but much less CPU.
+    palette_png: Quantized to a 256 colour palette, smallest PNG but lossy on gradients.
+    webp: Lossless WebP at a low effort, method 0 barely compresses at all.
+    """
+    with io.BytesIO() as img_bytes:
+        if frame_format == FrameFormat.fast_png:
+            img.save(img_bytes, format='PNG', compress_level=1)
+        elif frame_format == FrameFormat.palette_png:
+            img.quantize(colors=256, method=Image.Quantize.FASTOCTREE).save(img_bytes, format='PNG')
+        elif frame_format == FrameFormat.webp:
+            img.save(img_bytes, format='WEBP', lossless=True, quality=10, method=1)
+        else:
+            img.save(img_bytes, format='PNG')
+        return img_bytes.getvalue()
+
+
+def encode_png(img: Image.Image) -> bytes:
+    return encode_frame(img, FrameFormat.png)
+
+
+class FrameRenderer(Generic[T]):
+    def __init__(self):
+        """
+        Renders frames on a shared worker thread pool, one at a time per table.
+        Only the newest frame waiting to be rendered is kept, older waiting frames are dropped.
+        """
+        self.dropped = 0
+
+        self._pending: Optional[tuple[Callable[[], T], asyncio.Future]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def submit(self, func: Callable[[], T]) -> 'asyncio.Future[Optional[T]]':
+        """Queue a frame. The returned future resolves to None if a newer frame replaced it before rendering."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        if self._pending is not None:
+            _, old_future = self._pending
+            if not old_future.done():
+                old_future.set_result(None)
+            self.dropped += 1
+        self._pending = (func, future)
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run())
+        return future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while self._pending is not None:
+            func, future = self._pending
+            self._pending = None
+            try:
+                result = await loop.run_in_executor(_render_executor, func)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(result)
+
+
 def get_result_color(result: str) -> str:
     if result == 'win':
         return 'green'
@@ -104,17 +225,22 @@ class BlackjackHandImage:
             background.paste(self.icon, (self.padding, self.padding), mask=self.icon)
 
             start_x = self.padding + self.icon.width + 10
-            draw.text((start_x, self.padding), self.name, fill='white', font_size=32)
+            draw.text((start_x, self.padding), self.name, fill='white', font=get_font(32))
             if self.bet:
                 name = 'Credit' if self.is_credit else 'Bet'
-                draw.text((start_x, self.padding + 30), f'{name}: {self.bet:,}', fill='white', font_size=24)
+                draw.text((start_x, self.padding + 30), f'{name}: {self.bet:,}', fill='white', font=get_font(24))
             elif self.name != 'Dealer':
-                draw.text((start_x, self.padding + 30), 'Surrendered', fill='white', font_size=24)
+                draw.text((start_x, self.padding + 30), 'Surrendered', fill='white', font=get_font(24))
 
             self._background = background
             del draw
         return self._background
 
+    def layer_key(self, result: str = '', winnings: Optional[list[int]] = None) -> tuple:
+        """Everything that changes how this hand looks, equal keys render the same image."""
+        return (tuple((card.short(), card.hidden) for card in self.hand.cards), self.name, self.bet, self.is_credit,
+                result, tuple(winnings or ()))
+
     def get_diff(self):
         new_cards = self.hand.cards
         diff = []
@@ -156,7 +282,7 @@ class BlackjackHandImage:
         if winnings <= 0:
             win_str = 'Lost Bet'
 
-        draw.text((x, y), win_str, fill='white', font_size=24)
+        draw.text((x, y), win_str, fill='white', font=get_font(24))
         del draw
 
     def draw_cards(self, cards: list['Card']):
@@ -177,25 +303,18 @@ class BlackjackHandImage:
             else:
                 y = card_y
             x = card_x
-            if card.hidden:
-                try:
-                    img = Image.open('./helios/resources/cards/back.png')
-                    self._current_image.paste(img, (x, y), mask=img)
-                except FileNotFoundError:
-                    continue
-            else:
-                try:
-                    img = Image.open(f'./helios/resources/cards/{card.short()}.png')
-                    self._current_image.paste(img, (x, y), mask=img)
-                except FileNotFoundError:
-                    ...
+            img = get_card_sprite('back' if card.hidden else card.short())
+            if img is not None:
+                self._current_image.paste(img, (x, y), mask=img)
+            elif card.hidden:
+                continue
             card_x += self.card_width + self.card_gap
             card_num += 1
         if len(cards):
             self.draw_hand_value()
 
     def draw_hand_value(self):
-        font = ImageFont.load_default(62)
+        font = get_font(62)
         draw = ImageDraw.Draw(self._current_image)
         bbox = font.getbbox('32')
 
@@ -204,7 +323,7 @@ class BlackjackHandImage:
                        fill='black')
         hand_value = self.hand.get_hand_bj_values(False)
         draw.text((self._current_image.width - self.padding, self.padding), str(hand_value), fill='white',
-                  font_size=62, anchor='rt')
+                  font=font, anchor='rt')
         del draw
 
     def get_image(self, result: Literal['win', 'push', 'lose', 'turn'] = '', *, redraw=False,
@@ -241,14 +360,14 @@ class BlackjackHandSplitImage(BlackjackHandImage):
             background.paste(self.icon, (self.padding, self.padding), mask=self.icon)
 
             start_x = self.padding + self.icon.width + 10
-            draw.text((start_x, self.padding), self.name, fill='white', font_size=32)
+            draw.text((start_x, self.padding), self.name, fill='white', font=get_font(32))
             card_y = background.height - self.card_height - self.padding
             if self.bets:
                 y = card_y - 24 - self.padding - self.padding // 2
                 x = self.padding
-                draw.text((x, y), f'{self.bets[0]:,}', fill='white', font_size=24)
+                draw.text((x, y), f'{self.bets[0]:,}', fill='white', font=get_font(24))
                 x = background.width - self.padding // 2 - self.card_width
-                draw.text((x, y), f'{self.bets[1]:,}', fill='white', font_size=24)
+                draw.text((x, y), f'{self.bets[1]:,}', fill='white', font=get_font(24))
 
             self._background = background
             del draw
@@ -260,17 +379,13 @@ class BlackjackHandSplitImage(BlackjackHandImage):
 
         y = self._current_image.height - self.card_height - self.padding
         x = self.padding // 2
-        try:
-            img = Image.open(f'./helios/resources/cards/{cards[0].short()}.png')
+        img = get_card_sprite(cards[0].short())
+        if img is not None:
             self._current_image.paste(img, (x, y), mask=img)
-        except FileNotFoundError:
-            ...
         x = self._current_image.width - self.card_width - self.padding // 2
-        try:
-            img = Image.open(f'./helios/resources/cards/{cards[1].short()}.png')
+        img = get_card_sprite(cards[1].short())
+        if img is not None:
             self._current_image.paste(img, (x, y), mask=img)
-        except FileNotFoundError:
-            ...
         self.draw_hand_value()
 
     def get_card_centers(self):
@@ -282,7 +397,7 @@ class BlackjackHandSplitImage(BlackjackHandImage):
 
     def draw_hand_value(self):
         f_size = 62
-        font = ImageFont.load_default(f_size)
+        font = get_font(f_size)
         draw = ImageDraw.Draw(self._current_image)
         bbox = font.getbbox('32')
         centers = self.get_card_centers()
@@ -297,8 +412,8 @@ class BlackjackHandSplitImage(BlackjackHandImage):
         draw.rounded_rectangle(((bx2, by2), (bx2 + bbox[2], by2 + bbox[3])), fill='black', radius=10)
         hand_value_1 = self.hands[0].get_hand_bj_values(False)
         hand_value_2 = self.hands[1].get_hand_bj_values(False)
-        draw.text((x1, y1), str(hand_value_1), fill='white', font_size=f_size, anchor='mm')
-        draw.text((x2, y2), str(hand_value_2), fill='white', font_size=f_size, anchor='mm')
+        draw.text((x1, y1), str(hand_value_1), fill='white', font=font, anchor='mm')
+        draw.text((x2, y2), str(hand_value_2), fill='white', font=font, anchor='mm')
         del draw
 
     def draw_outline(self, results: list[Literal['win', 'push', 'lose', 'turn', '']] = None) -> Image:
@@ -330,13 +445,17 @@ class BlackjackHandSplitImage(BlackjackHandImage):
         win_str = f'W: {winnings[0]:,}'
         if winnings[0] <= 0:
             win_str = 'Lost Bet'
-        draw.text((x, y), win_str, fill='white', font_size=24)
+        draw.text((x, y), win_str, fill='white', font=get_font(24))
 
         x = self._current_image.width - self.padding // 2 - self.card_width
         win_str = f'W: {winnings[1]:,}'
         if winnings[1] <= 0:
             win_str = 'Lost Bet'
-        draw.text((x, y), win_str, fill='white', font_size=24)
+        draw.text((x, y), win_str, fill='white', font=get_font(24))
+
+    def layer_key(self, results: list[str] = None, winnings: Optional[list[int]] = None) -> tuple:
+        return (tuple(tuple(card.short() for card in hand.cards) for hand in self.hands), self.name,
+                tuple(self.bets), tuple(results or ()), tuple(winnings or ()))
 
     def get_diff(self):
         return [self.hands[0].cards[-1], self.hands[1].cards[-1]]
@@ -363,6 +482,13 @@ class BlackjackHandSplitImage(BlackjackHandImage):
 
 
 class BlackjackImage:
+    """
+    The full table, composed from cached layers: the static background, one layer per hand and the status and
+    timer overlay. Only the regions that changed since the last frame are recomposed and rescaled.
+    """
+    scale = 2
+    margin = 4
+
     def __init__(self, dealer_hand: 'BlackjackHandImage',
                  hands: list[Union['BlackjackHandImage', 'BlackjackHandSplitImage']], current_hand: int = 0,
                  current_split_hand: int = 0, id: int = 0, winnings: list = None):
@@ -378,8 +504,14 @@ class BlackjackImage:
         self.padding = 20
         self.wrap = 4
 
+        self._canvas: Optional[tuple] = None
         self._background: Optional[Image] = None
+        self._table: Optional[Image] = None
         self._current_image: Optional[Image] = None
+        self._frame: Optional[Image] = None
+        self._layers: dict[int, tuple] = {}
+        self._overlay: Optional[tuple] = None
+        self._overlay_boxes: list[tuple[int, int, int, int]] = []
 
     def get_width(self) -> int:
         return self.padding + sum(self.dealer_hand.get_width() + self.padding for _ in range(self.wrap))
@@ -405,29 +537,43 @@ class BlackjackImage:
         if not self._background:
             background = Image.new(mode='RGBA', size=(self.get_width(), self.get_height()), color=(255, 0, 0, 0))
             draw = ImageDraw.Draw(background)
-            draw.text((self.padding, self.padding), f'#{self.id}', fill='white', font_size=64)
+            draw.text((self.padding, self.padding), f'#{self.id}', fill='white', font=get_font(64))
             del draw
             self._background = background
         return self._background
 
-    def draw_dealer_hand(self):
-        hand = self.dealer_hand.get_image()
-        h_width, h_height = hand.size
-        b_width = self._current_image.width
-
-        hand_mid = h_width // 2
-        background_mid = b_width // 2
-
-        self._current_image.paste(hand, (background_mid - hand_mid, self.padding), mask=hand)
+    def get_hand_results(self, i: int, hand: Union['BlackjackHandImage', 'BlackjackHandSplitImage']) -> list[str]:
+        try:
+            winnings = self.winnings[i]
+        except IndexError:
+            winnings = []
+        if i == self.current_hand:
+            if self.current_split_hand == 0:
+                return ['turn', '']
+            return ['', 'turn']
+        elif len(self.winnings) > 0:
+            win_results = []
+            for win in winnings:
+                if win == 0:
+                    win_results.append('lose')
+                elif win == hand.bet:
+                    win_results.append('push')
+                else:
+                    win_results.append('win')
+            return win_results
+        return ['', '']
 
     # noinspection PyTypeChecker
-    def draw_hands(self):
+    def get_layers(self) -> list[tuple[tuple[int, int], tuple, Callable[[], Image]]]:
+        """The position, state key and render function of the dealer and every hand."""
+        dealer = self.dealer_hand
+        layers = [((self.get_width() // 2 - dealer.get_width() // 2, self.padding),
+                   (dealer, dealer.layer_key()), dealer.get_image)]
         if len(self.hands) == 0:
-            return
+            return layers
         h_width = self.hands[0].get_width()
         h_height = self.hands[0].get_height()
-        b_height = self._current_image.height
-        y = b_height - self.get_hands_height() - self.padding
+        y = self.get_height() - self.get_hands_height() - self.padding
         x = self.padding
         for i, hand in enumerate(self.hands):
             try:
@@ -438,34 +584,52 @@ class BlackjackImage:
                 y += h_height + self.padding
                 x = self.padding
 
-            if i == self.current_hand:
-                if self.current_split_hand == 0:
-                    results = ['turn', '']
-                else:
-                    results = ['', 'turn']
-            elif len(self.winnings) > 0:
-                win_results = []
-                for win in winnings:
-                    if win == 0:
-                        win_results.append('lose')
-                    elif win == hand.bet:
-                        win_results.append('push')
-                    else:
-                        win_results.append('win')
-                results = win_results
-            else:
-                results = ['', '']
+            results = self.get_hand_results(i, hand)
             if isinstance(hand, BlackjackHandSplitImage):
-                hand_image = hand.get_image(results, winnings=winnings)
+                key = hand.layer_key(results, winnings)
+                render = partial(hand.get_image, results, winnings=winnings)
             else:
-                hand_image = hand.get_image(results[0], winnings=winnings)
-            self._current_image.paste(hand_image, (x, y), mask=hand_image)
+                key = hand.layer_key(results[0], winnings)
+                render = partial(hand.get_image, results[0], winnings=winnings)
+            layers.append(((x, y), (hand, key), render))
             x += h_width + self.padding
-
-    def draw_status(self, status: str):
+        return layers
+
+    def draw_layers(self) -> list[tuple[int, int, int, int]]:
+        """Redraw the hands whose state changed onto the table and return the boxes that changed."""
+        dirty = []
+        layers = self.get_layers()
+        for i in [i for i in self._layers if i >= len(layers)]:
+            _, box = self._layers.pop(i)
+            self._table.paste(self._background.crop(box), box[:2])
+            dirty.append(box)
+        for i, (pos, key, render) in enumerate(layers):
+            previous = self._layers.get(i)
+            if previous and previous[0] == key:
+                continue
+            if previous:
+                box = previous[1]
+                self._table.paste(self._background.crop(box), box[:2])
+                dirty.append(box)
+            img = render()
+            box = (pos[0], pos[1], pos[0] + img.width, pos[1] + img.height)
+            self._table.paste(img, pos, mask=img)
+            self._layers[i] = (key, box)
+            dirty.append(box)
+        return dirty
+
+    def get_box(self, box: tuple[float, float, float, float]) -> tuple[int, int, int, int]:
+        """Round a text box outwards, with room for anti-aliasing, and clamp it to the table."""
+        width, height = self._table.size
+        return (max(math.floor(box[0]) - 2, 0), max(math.floor(box[1]) - 2, 0),
+                min(math.ceil(box[2]) + 2, width), min(math.ceil(box[3]) + 2, height))
+
+    def draw_status(self, status: str) -> Optional[tuple[int, int, int, int]]:
+        if not status:
+            return None
         draw = ImageDraw.Draw(self._current_image)
         f_size = 70
-        font = ImageFont.load_default(f_size)
+        font = get_font(f_size)
         bbox = font.getbbox(status)
 
         b_height = self._current_image.height
@@ -477,22 +641,64 @@ class BlackjackImage:
         bw_middle = self._current_image.width // 2
         boxh_middle = f_size // 2
         boxw_middle = bbox[2] // 2
-        draw.text((bw_middle - boxw_middle, bh_middle - boxh_middle), status, fill='white', font_size=70)
+        pos = (bw_middle - boxw_middle, bh_middle - boxh_middle)
+        draw.text(pos, status, fill='white', font=font)
+        box = draw.textbbox(pos, status, font=font)
         del draw
+        return self.get_box(box)
 
-    def draw_timer(self, timer: int):
+    def draw_timer(self, timer: int) -> Optional[tuple[int, int, int, int]]:
+        if not timer:
+            return None
         draw = ImageDraw.Draw(self._current_image)
-        f_size = 64
-        draw.text((self._current_image.width - self.padding, self.padding), f'{timer}', fill='white', font_size=f_size, anchor='rt')
+        pos = (self._current_image.width - self.padding, self.padding)
+        font = get_font(64)
+        draw.text(pos, f'{timer}', fill='white', font=font, anchor='rt')
+        box = draw.textbbox(pos, f'{timer}', font=font, anchor='rt')
+        del draw
+        return self.get_box(box)
+
+    def draw_overlay(self, status: str, timer: int):
+        self._overlay = (status, timer)
+        self._overlay_boxes = [box for box in (self.draw_status(status), self.draw_timer(timer)) if box]
+
+    def scale_region(self, box: tuple[int, int, int, int]):
+        """Rescale one region of the table into the frame, cropping with a margin so the filter sees its neighbours."""
+        left, top, right, bottom = box
+        width, height = self._current_image.size
+        s = self.scale
+        crop = (max(left - self.margin, 0), max(top - self.margin, 0),
+                min(right + self.margin, width), min(bottom + self.margin, height))
+        region = self._current_image.crop(crop)
+        region = region.resize((region.width * s, region.height * s))
+        region = region.crop(((left - crop[0]) * s, (top - crop[1]) * s, (right - crop[0]) * s,
+                              (bottom - crop[1]) * s))
+        self._frame.paste(region, (left * s, top * s))
 
     def get_image(self, status: str = '', timer: int = 0) -> Image:
-        self._current_image = self.get_background().copy()
-        self.draw_dealer_hand()
-        self.draw_hands()
-        self.draw_status(status)
-        if timer:
-            self.draw_timer(timer)
-        return self._current_image.resize((self._current_image.width * 2, self._current_image.height * 2))
+        canvas = (self.get_width(), self.get_height(), self.id)
+        if canvas != self._canvas:
+            self._canvas = canvas
+            self._background = None
+            self._table = self.get_background().copy()
+            self._current_image = None
+            self._layers = {}
+
+        dirty = self.draw_layers()
+        if self._current_image is None:
+            self._current_image = self._table.copy()
+            self.draw_overlay(status, timer)
+            self._frame = self._current_image.resize((self._current_image.width * self.scale,
+                                                      self._current_image.height * self.scale))
+        elif dirty or self._overlay != (status, timer):
+            # Text is drawn over whatever is below it, so clear the old overlay before drawing the new one.
+            dirty += self._overlay_boxes
+            for box in dirty:
+                self._current_image.paste(self._table.crop(box), box[:2])
+            self.draw_overlay(status, timer)
+            for box in dirty + self._overlay_boxes:
+                self.scale_region(box)
+        return self._frame.copy()
 
 
 class LotteryImage:
@@ -512,7 +718,7 @@ class LotteryImage:
         r = min(x, y)
         draw.circle((x, y), r, (255, 255, 255))
         f_size = r
-        font = ImageFont.load_default(f_size)
+        font = get_font(f_size)
         draw.text((x, y), str(number), (0, 0, 0), font, anchor='mm')
         del draw
         return background
@@ -527,33 +733,24 @@ class LotteryImage:
             background.paste(ball, (x, self.padding), mask=ball)
         return background
 
-    def get_countdown_file(self, remaining: str):
+    def get_countdown_image(self, remaining: str) -> Image:
         width = (self.ball_width + self.padding) * self.total + self.padding
         height = self.padding + self.ball_height + self.padding
         background = Image.new(mode='RGBA', size=(width, height), color=(255, 0, 0, 0))
         draw = ImageDraw.Draw(background)
-        draw.text((width//2, height//2), remaining, fill=(255, 255, 255), font_size=height//2, anchor='mm')
+        draw.text((width//2, height//2), remaining, fill=(255, 255, 255), font=get_font(height//2), anchor='mm')
         del draw
-        with io.BytesIO() as img_bytes:
-            background.save(img_bytes)
-            img_bytes.seek(0)
-            file = discord.File(img_bytes, 'countdown.png')
-        return file
+        return background
 
-    def get_image_file(self):
-        img = self.generate_image()
-        with io.BytesIO() as img_bytes:
-            img.save(img_bytes)
-            img_bytes.seek(0)
-            file = discord.File(img_bytes, 'lottery.png')
-        return file
+    def get_countdown_file(self, remaining: str):
+        return discord.File(io.BytesIO(encode_png(self.get_countdown_image(remaining))), 'countdown.png')
 
+    def get_image_file(self):
+        return discord.File(io.BytesIO(encode_png(self.generate_image())), 'lottery.png')
 
 
-def testing_icon():
-    url = 'https://cdn.discordapp.com/avatars/180067685986467840/39c1647625215203078dd28d0a3f4860.png?size=1024'
-    icon_data = io.BytesIO(requests.get(url, stream=True).content)
-    img = Image.open(icon_data)
+def mask_icon(data: bytes) -> Image:
+    img = Image.open(io.BytesIO(data))
     mask = Image.new('L', (64, 64), 0)
     draw = ImageDraw.Draw(mask)
     draw.ellipse((0, 0) + mask.size, fill=255)
@@ -563,17 +760,88 @@ def testing_icon():
     return final
 
 
+def testing_icon():
+    url = 'https://cdn.discordapp.com/avatars/180067685986467840/39c1647625215203078dd28d0a3f4860.png?size=1024'
+    return mask_icon(requests.get(url, stream=True).content)
+
+
+class IconCache:
+    TTL = timedelta(hours=6)
+    MAX_BYTES = 8 * 1024 * 1024
+
+    def __init__(self, max_bytes: int = MAX_BYTES, ttl: timedelta = TTL):
+        """
+        Least recently used cache of masked member icons keyed by avatar url.
+        Discord avatar urls change with the avatar, the ttl only bounds how long an unused icon lingers.
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+        self._icons: OrderedDict[str, tuple[datetime, Image.Image]] = OrderedDict()
+        self._pending: dict[str, asyncio.Future] = {}
+
+    def __len__(self):
+        return len(self._icons)
+
+    @staticmethod
+    def get_size(img: Image.Image) -> int:
+        return img.width * img.height * len(img.getbands())
+
+    def get_cached(self, url: str) -> Optional[Image.Image]:
+        entry = self._icons.get(url)
+        if entry is None:
+            return None
+        added, icon = entry
+        if utcnow() - added >= self.ttl:
+            self.remove(url)
+            return None
+        self._icons.move_to_end(url)
+        return icon
+
+    def add(self, url: str, icon: Image.Image):
+        self.remove(url)
+        self._icons[url] = (utcnow(), icon)
+        self.bytes += self.get_size(icon)
+        while self.bytes > self.max_bytes and len(self._icons) > 1:
+            self.remove(next(iter(self._icons)))
+
+    def remove(self, url: str):
+        entry = self._icons.pop(url, None)
+        if entry is not None:
+            self.bytes -= self.get_size(entry[1])
+
+    async def get(self, session: 'ClientSession', url: str) -> Image.Image:
+        """Get an icon, concurrent calls for the same url share one download."""
+        icon = self.get_cached(url)
+        if icon is not None:
+            self.hits += 1
+            return icon.copy()
+        pending = self._pending.get(url)
+        if pending is None:
+            self.misses += 1
+            pending = asyncio.ensure_future(self._fetch(session, url))
+            self._pending[url] = pending
+            pending.add_done_callback(lambda _: self._pending.pop(url, None))
+        icon = await asyncio.shield(pending)
+        return icon.copy()
+
+    async def _fetch(self, session: 'ClientSession', url: str) -> Image.Image:
+        async with session.get(url) as response:
+            response.raise_for_status()
+            data = await response.read()
+        icon = mask_icon(data)
+        self.add(url, icon)
+        return icon
+
+
+icon_cache = IconCache()
+
+
 async def get_member_icon(session: 'ClientSession', url: str) -> Image:
-    async with session.get(url) as response:
-        icon_data = io.BytesIO(await response.read())
-    img = Image.open(icon_data)
-    mask = Image.new('L', (64, 64), 0)
-    draw = ImageDraw.Draw(mask)
-    draw.ellipse((0, 0) + mask.size, fill=255)
-    del draw
-    final = ImageOps.fit(img, mask.size, centering=(0.5, 0.5))
-    final.putalpha(mask)
-    return final
+    return await icon_cache.get(session, url)
 
 # if __name__ == '__main__':
 #     url = 'https://cdn.discordapp.com/avatars/180067685986467840/39c1647625215203078dd28d0a3f4860.png?size=1024'
@@ -1,15 +1,21 @@
 import asyncio
+import io
 import math
 import random
 from enum import Enum
 from datetime import time, datetime, timedelta
-from typing import TYPE_CHECKING
+from fractions import Fraction
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Optional
 
 import discord
+import numpy as np
 
-from .image import LotteryImage
+from .editor import MessageEditor
+from .image import LotteryImage, FrameRenderer, FrameFormat, encode_frame
 
 if TYPE_CHECKING:
+    from PIL import Image
     from ..member import HeliosMember
     from .manager import GamblingManager
 
@@ -19,6 +25,27 @@ __all__ = ('Lottery',)
 Ticket = tuple['HeliosMember', list[int]]
 
 
+class PayoutTable:
+    def __init__(self, range_: int, numbers: int, pool: int):
+        """
+        Exact odds and prizes for every match count of a lottery.
+        Each tier pays pool / ways, so every tier is worth the same as the jackpot on average.
+        """
+        self.range = range_
+        self.numbers = numbers
+        self.pool = pool
+        self.total = math.comb(range_, numbers)
+        self.ways = tuple(math.comb(numbers, k) * math.comb(range_ - numbers, numbers - k)
+                          for k in range(numbers + 1))
+        self.chances = tuple(Fraction(ways, self.total) for ways in self.ways)
+        self.payouts = tuple(pool // ways if ways else 0 for ways in self.ways)
+
+
+@lru_cache(maxsize=64)
+def get_payout_table(range_: int, numbers: int, pool: int) -> PayoutTable:
+    return PayoutTable(range_, numbers, pool)
+
+
 class LotteryStatus(Enum):
     scheduled = 0
     running = 1
@@ -48,33 +75,51 @@ class Lottery:
 
     async def run(self):
         message = await self.channel.send('Starting Soon')
+        editor = MessageEditor(self.channel, message)
         image = LotteryImage([], self.numbers)
+        renderer: FrameRenderer[bytes] = FrameRenderer()
+        frame_format = FrameFormat(self.manager.server.bot.settings.frame_format)
+
+        async def build_frame(render: Callable[[], 'Image'], name: str) -> Optional[dict]:
+            data = await renderer.submit(lambda: encode_frame(render(), frame_format))
+            if data is None:
+                return None
+            return {'attachments': [discord.File(io.BytesIO(data), f'{name}.{frame_format.extension}')]}
 
         then = self.next_game
         while datetime.now() < then:
-            remaining = str(then - datetime.now())
-            await message.edit(attachments=[image.get_countdown_file(remaining)])
+            # The remaining time is read when the frame is built, so a delayed edit is never out of date.
+            editor.update(lambda: build_frame(lambda: image.get_countdown_image(str(then - datetime.now())),
+                                              'countdown'))
             await asyncio.sleep(1)
 
         chosen_numbers = self.random_ticket()
         for i in range(self.numbers):
             number = chosen_numbers[i]
             image.numbers.append(number)
-            file = image.get_image_file()
-            await message.edit(attachments=[file])
+            editor.update(lambda: build_frame(image.generate_image, 'lottery'))
             await asyncio.sleep(5)
+        await editor.flush()
 
     async def schedule_next(self):
         ...
 
+    def ticket_matrix(self) -> np.ndarray:
+        """Every ticket's numbers as one row of a (tickets, numbers) matrix."""
+        if not self.tickets:
+            return np.empty((0, self.numbers), dtype=np.int32)
+        return np.array([numbers for _, numbers in self.tickets], dtype=np.int32)
+
+    def match_counts(self, tickets: np.ndarray, winning_numbers: tuple[int, ...]) -> np.ndarray:
+        """How many winning numbers each row of tickets holds, by indexing a lookup of the winning numbers."""
+        winning = np.zeros(self.range + 1, dtype=np.int8)
+        winning[list(winning_numbers)] = 1
+        return winning[tickets].sum(axis=1)
+
     async def calculate_winners(self, winning_numbers: tuple[int]):
         matching = {}
-        for ticket in self.tickets:
-            member, numbers = ticket
-            count = 0
-            for n in numbers:
-                if n in winning_numbers:
-                    count += 1
+        counts = self.match_counts(self.ticket_matrix(), winning_numbers)
+        for ticket, count in zip(self.tickets, counts.tolist()):
             if count in matching:
                 matching[count].append(ticket)
             else:
@@ -122,55 +167,60 @@ class Lottery:
             )
             await self.channel.send(embed=embed)
 
-    def total_combinations(self):
-        return math.comb(self.range, self.numbers)
+    @property
+    def payout_table(self) -> PayoutTable:
+        """The cached table for this configuration, a new pool is a new key so it is rebuilt only then."""
+        return get_payout_table(self.range, self.numbers, self.pool)
+
+    def total_combinations(self) -> int:
+        return self.payout_table.total
 
-    def jackpot_chance(self):
-        return 1 / self.total_combinations()
+    def jackpot_chance(self) -> Fraction:
+        return Fraction(1, self.total_combinations())
 
-    def winnings(self, k: int):
-        base = self.pool * self.jackpot_chance()
-        base /= self.chance_to_get(k)
-        return int(base)
+    def winnings(self, k: int) -> int:
+        return self.payout_table.payouts[k]
 
-    def ways_to_get(self, k: int):
-        n = self.range
-        r = self.numbers
-        x = (math.factorial(r)
-             /
-             (math.factorial(k) * math.factorial(r-k)))
-        y = (math.factorial(n-r)
-             /
-             (math.factorial((n-r)-(r-k)) * math.factorial(r-k)))
-        return x * y
+    def ways_to_get(self, k: int) -> int:
+        return self.payout_table.ways[k]
 
-    def chance_to_get(self, k: int):
-        return self.ways_to_get(k) / self.total_combinations()
+    def chance_to_get(self, k: int) -> Fraction:
+        return self.payout_table.chances[k]
 
     def random_ticket(self):
-        return tuple(random.sample(range(self.range-1), self.numbers))
-
-    def test_odds(self):
-        drawn = self.random_ticket()
-        smaller_wins = {1: 0, 2: 0, 3: 0, 4: 0}
-        diff = 0
-        found = 0
-        i = 1
-        while found == 0:
-            ticket = self.random_ticket()
-            diff += 100
-            matching = 0
-            for n in ticket:
-                if n in drawn:
-                    matching += 1
-            if matching == len(drawn):
-                found = i
-                diff -= self.pool
-            elif matching in smaller_wins:
-                smaller_wins[matching] += 1
-                if matching > 1:
-                    diff -= self.winnings(matching) * self.offset_percentage
-            i += 1
-        print(found)
-        print(smaller_wins)
-        print(diff)
+        return tuple(random.sample(range(1, self.range + 1), self.numbers))
+
+    def random_draws(self, draws: int, rng: np.random.Generator) -> np.ndarray:
+        """draws rows of distinct numbers from 1 to range, picked by the smallest of a row of random keys."""
+        keys = rng.random((draws, self.range), dtype=np.float32)
+        return np.argpartition(keys, self.numbers - 1, axis=1)[:, :self.numbers] + 1
+
+    def simulate(self, draws: int, *, ticket_price: int = 100, seed: int = None, chunk: int = 100_000) -> dict:
+        """
+        Monte Carlo estimate of one ticket's payout over many draws.
+        Draws are made in chunks so memory stays flat, a fixed ticket is used since every ticket has the same odds.
+        Splitting a prize between several winners is ignored.
+        """
+        rng = np.random.default_rng(seed)
+        ticket = np.arange(1, self.numbers + 1)
+        tiers = np.array(self.payout_table.payouts, dtype=np.float64)
+        matches = np.zeros(self.numbers + 1, dtype=np.int64)
+        remaining = draws
+        while remaining > 0:
+            size = min(chunk, remaining)
+            counts = self.match_counts(self.random_draws(size, rng), tuple(ticket.tolist()))
+            matches += np.bincount(counts, minlength=self.numbers + 1)
+            remaining -= size
+        expected_payout = float(matches @ tiers) / draws
+        return {
+            'draws': draws,
+            'matches': {k: int(v) for k, v in enumerate(matches)},
+            'expected_payout': expected_payout,
+            'house_edge': (ticket_price - expected_payout) / ticket_price,
+        }
+
+    def test_odds(self, draws: int = 1_000_000):
+        result = self.simulate(draws)
+        print(result['matches'])
+        print(f'Expected payout: {result["expected_payout"]:,.2f}')
+        print(f'House edge: {result["house_edge"]:.2%}')
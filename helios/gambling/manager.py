@@ -4,6 +4,7 @@ from typing import TYPE_CHECKING, Union
 from discord import TextChannel
 
 from .blackjack import Blackjack
+from .cards import Shoe
 from .lottery import *
 
 if TYPE_CHECKING:
@@ -22,6 +23,7 @@ class GamblingManager:
         self.games: list[Games] = []
         self.lotteries: list[Lottery] = []
         self.loss_streak: dict['HeliosMember', int] = {}
+        self.shoes: dict[int, Shoe] = {}
 
     def add_loss(self, member: 'HeliosMember', loss: int):
         if loss < 0:
@@ -55,6 +57,12 @@ class GamblingManager:
         except ValueError:
             ...
 
+    def get_shoe(self, channel: TextChannel) -> Shoe:
+        """Each channel keeps its shoe between games, it is reshuffled when the cut card comes out."""
+        if channel.id not in self.shoes:
+            self.shoes[channel.id] = Shoe()
+        return self.shoes[channel.id]
+
     def can_run_blackjack(self, channel: TextChannel):
         if channel in [game.channel for game in self.games if isinstance(game, Blackjack)]:
             return False
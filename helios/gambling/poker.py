@@ -0,0 +1,213 @@
+#  MIT License
+#
+#  Copyright (c) 2024 Riley Winkler
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+import math
+import threading
+from itertools import combinations
+from typing import Iterable, Optional, Union, Sequence
+
+import numpy as np
+
+__all__ = ('RANKS', 'SUITS', 'CATEGORIES', 'card_to_int', 'cards_to_ints', 'load_tables', 'evaluate', 'evaluate_many',
+           'category', 'equity')
+
+RANKS = '23456789TJQKA'
+SUITS = 'cdhs'
+CATEGORIES = ('High Card', 'One Pair', 'Two Pair', 'Three of a Kind', 'Straight', 'Flush', 'Full House',
+              'Four of a Kind', 'Straight Flush')
+
+# Cards are ints, rank * 4 + suit. Hand values are category << 20 followed by up to five 4 bit ranks, higher wins.
+_MAX_CARDS = 7
+_comb = [[math.comb(n, k) for k in range(_MAX_CARDS + 1)] for n in range(13 + _MAX_CARDS)]
+_COMB = np.array(_comb, dtype=np.int64)
+_STRAIGHTS = [(high, sum(1 << r for r in range(high - 4, high + 1))) for high in range(12, 3, -1)] \
+    + [(3, 0b1000000001111)]
+_flush_table: Optional[np.ndarray] = None
+_rank_tables: dict[int, np.ndarray] = {}
+_tables_lock = threading.Lock()
+
+
+def card_to_int(card: Union[str, int, object]) -> int:
+    """Accept 'As', an int or anything with pokerkit style rank and suit attributes."""
+    if isinstance(card, int):
+        return card
+    if not isinstance(card, str):
+        card = f'{card.rank.value}{card.suit.value}'
+    return RANKS.index(card[0].upper()) * 4 + SUITS.index(card[1].lower())
+
+
+def cards_to_ints(cards: Iterable) -> list[int]:
+    return [card_to_int(card) for card in cards]
+
+
+def _value(cat: int, ranks: Sequence[int]) -> int:
+    value = cat << 20
+    for i, rank in enumerate(ranks[:5]):
+        value |= rank << (16 - 4 * i)
+    return value
+
+
+def _straight_high(mask: int) -> Optional[int]:
+    for high, straight in _STRAIGHTS:
+        if mask & straight == straight:
+            return high
+    return None
+
+
+def _evaluate_counts(counts: Sequence[int]) -> int:
+    """Best hand value ignoring suits, from how many cards of each rank there are."""
+    ranks = [r for r in range(12, -1, -1) for _ in range(counts[r])]
+    groups = sorted(((counts[r], r) for r in range(13) if counts[r]), reverse=True)
+    high = _straight_high(sum(1 << r for r in range(13) if counts[r]))
+    if groups[0][0] == 4:
+        quad = groups[0][1]
+        return _value(7, [quad, max(r for r in ranks if r != quad)])
+    if groups[0][0] == 3 and len(groups) > 1 and groups[1][0] >= 2:
+        return _value(6, [groups[0][1], groups[1][1]])
+    if high is not None:
+        return _value(4, [high])
+    if groups[0][0] == 3:
+        trips = groups[0][1]
+        return _value(3, [trips] + [r for r in ranks if r != trips][:2])
+    if groups[0][0] == 2 and len(groups) > 1 and groups[1][0] == 2:
+        pairs = [groups[0][1], groups[1][1]]
+        return _value(2, pairs + [max(r for r in ranks if r not in pairs)])
+    if groups[0][0] == 2:
+        pair = groups[0][1]
+        return _value(1, [pair] + [r for r in ranks if r != pair][:3])
+    return _value(0, ranks)
+
+
+def _flush_value(mask: int) -> int:
+    high = _straight_high(mask)
+    if high is not None:
+        return _value(8, [high])
+    return _value(5, [r for r in range(12, -1, -1) if mask >> r & 1])
+
+
+def _get_flush_table() -> np.ndarray:
+    global _flush_table
+    if _flush_table is None:
+        with _tables_lock:
+            if _flush_table is None:
+                table = np.zeros(1 << 13, dtype=np.int32)
+                for mask in range(1 << 13):
+                    if mask.bit_count() >= 5:
+                        table[mask] = _flush_value(mask)
+                _flush_table = table
+    return _flush_table
+
+
+def _get_rank_table(size: int) -> np.ndarray:
+    """
+    Non flush hand values for every multiset of size ranks.
+    A sorted multiset r0 <= r1 <= ... maps to the distinct r0 + 0 < r1 + 1 < ..., whose colex rank is a minimal
+    perfect hash, so a hand's entry is found with one sort and a sum of binomials.
+    """
+    table = _rank_tables.get(size)
+    if table is None:
+        with _tables_lock:
+            table = _rank_tables.get(size)
+            if table is None:
+                table = np.zeros(math.comb(12 + size, size), dtype=np.int32)
+                for combo in combinations(range(12 + size), size):
+                    ranks = [c - i for i, c in enumerate(combo)]
+                    counts = [0] * 13
+                    for r in ranks:
+                        counts[r] += 1
+                    if max(counts) > 4:
+                        continue
+                    table[sum(math.comb(c, i + 1) for i, c in enumerate(combo))] = _evaluate_counts(counts)
+                _rank_tables[size] = table
+    return table
+
+
+def load_tables():
+    """Build every lookup table up front, this takes around a second so run it off the event loop."""
+    _get_flush_table()
+    for size in range(5, _MAX_CARDS + 1):
+        _get_rank_table(size)
+
+
+def evaluate(cards: Iterable) -> int:
+    """Value of the best five card hand in five to seven cards, higher is better."""
+    cards = cards_to_ints(cards)
+    suit_masks = [0, 0, 0, 0]
+    for card in cards:
+        suit_masks[card & 3] |= 1 << (card >> 2)
+    for mask in suit_masks:
+        if mask.bit_count() >= 5:
+            # Five of one suit leaves too few cards for quads or a full house, so the flush is the best hand.
+            return int(_get_flush_table()[mask])
+    ranks = sorted(card >> 2 for card in cards)
+    return int(_get_rank_table(len(ranks))[sum(_comb[r + i][i + 1] for i, r in enumerate(ranks))])
+
+
+def evaluate_many(hands: np.ndarray) -> np.ndarray:
+    """Evaluate a (hands, cards) array of card ints in one pass, every row must hold the same number of cards."""
+    hands = np.asarray(hands, dtype=np.int64)
+    size = hands.shape[1]
+    ranks = hands >> 2
+    sorted_ranks = np.sort(ranks, axis=1) + np.arange(size)
+    values = _get_rank_table(size)[_COMB[sorted_ranks, np.arange(1, size + 1)].sum(axis=1)]
+
+    bits = np.left_shift(1, ranks)
+    suits = hands & 3
+    for suit in range(4):
+        in_suit = suits == suit
+        flush = in_suit.sum(axis=1) >= 5
+        if flush.any():
+            masks = np.where(in_suit[flush], bits[flush], 0).sum(axis=1)
+            values[flush] = _get_flush_table()[masks]
+    return values
+
+
+def category(value: int) -> str:
+    return CATEGORIES[value >> 20]
+
+
+def equity(hole_cards: Sequence[Sequence], board: Sequence = (), *, samples: int = 20_000,
+           seed: int = None) -> list[float]:
+    """
+    Each player's share of the pot given their hole cards and the board so far, ties split the share.
+    Every run out is counted when there are at most samples of them, otherwise samples random run outs are used.
+    """
+    holes = [cards_to_ints(cards) for cards in hole_cards]
+    board = cards_to_ints(board)
+    used = set(board).union(*holes)
+    deck = np.array([card for card in range(52) if card not in used], dtype=np.int64)
+    missing = 5 - len(board)
+
+    if missing == 0:
+        runs = np.empty((1, 0), dtype=np.int64)
+    elif math.comb(len(deck), missing) <= samples:
+        runs = np.array(list(combinations(deck.tolist(), missing)), dtype=np.int64)
+    else:
+        rng = np.random.default_rng(seed)
+        keys = rng.random((samples, len(deck)))
+        runs = deck[np.argpartition(keys, missing - 1, axis=1)[:, :missing]]
+
+    boards = np.hstack([np.tile(np.array(board, dtype=np.int64), (len(runs), 1)), runs])
+    values = np.stack([evaluate_many(np.hstack([np.tile(np.array(hole, dtype=np.int64), (len(runs), 1)), boards]))
+                       for hole in holes])
+    best = values == values.max(axis=0)
+    shares = best / best.sum(axis=0)
+    return (shares.sum(axis=1) / len(runs)).tolist()
@@ -0,0 +1,84 @@
+#  MIT License
+#
+#  Copyright (c) 2024 Riley Winkler
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+from typing import Optional
+
+from .cards import Card, Deck, Hand
+
+__all__ = ('hand_payout', 'is_soft_seventeen', 'dealer_should_hit', 'perfect_card_value', 'force_bust_hole_card',
+           'force_bust_draw')
+
+# The table rules shared by the live game and the simulator, nothing in here knows about Discord.
+
+
+def hand_payout(hand: Hand, dealer_hand: Hand, bet: int) -> int:
+    """The amount returned for a finished hand, including the bet."""
+    player_value = hand.get_hand_bj_values()
+    dealer_value = dealer_hand.get_hand_bj_values()
+    if len(dealer_hand.cards) == 2 and dealer_value == 21:
+        if len(hand.cards) == 2 and player_value == 21:
+            return bet
+        return 0
+    elif len(hand.cards) == 2 and player_value == 21:
+        return int(bet * 2.5)
+    elif player_value > 21:
+        return 0
+    elif dealer_value > 21:
+        return bet * 2
+    elif player_value == dealer_value == 21:
+        return int(bet * 1.5)
+    elif player_value == dealer_value:
+        return bet
+    elif player_value > dealer_value:
+        return bet * 2
+    return 0
+
+
+def is_soft_seventeen(hand: Hand) -> bool:
+    return hand.get_hand_bj_values() == 17 and hand.get_hand_bj_values(suppress_eleven=True) < 17
+
+
+def dealer_should_hit(hand: Hand, hit_soft_17: bool = True) -> bool:
+    return hand.get_hand_bj_values() < 17 or (hit_soft_17 and is_soft_seventeen(hand))
+
+
+def perfect_card_value(value: int) -> int:
+    """The blackjack value of the card that takes a hand of value to 21, an ace when that would take more than 10."""
+    remaining = 21 - value
+    return remaining if remaining < 11 else 1
+
+
+def force_bust_hole_card(deck: Deck, dealer_hand: Hand) -> Optional[Card]:
+    """Draw a replacement hole card that keeps the dealer under 17, or None if the dealer is already under."""
+    if dealer_hand.get_hand_bj_values(show_hidden=True) < 17:
+        return None
+    first_card_value = dealer_hand.cards[0].bj_value()
+    if first_card_value == 1:
+        first_card_value = 11
+    return deck.draw_filter(lambda c: (c.bj_value() if c.bj_value() != 1 else 11) + first_card_value < 17)
+
+
+def force_bust_draw(deck: Deck, dealer_hand: Hand) -> Optional[Card]:
+    """Draw a small card to set up a bust while the dealer is low, afterwards a card that busts them."""
+    dealer_value = dealer_hand.get_hand_bj_values()
+    if dealer_value < 12:
+        return deck.draw_filter(lambda c: 1 < c.bj_value() and c.bj_value() + dealer_value < 17)
+    return deck.draw_filter(lambda c: c.bj_value() + dealer_value > 21)
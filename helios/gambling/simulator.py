@@ -0,0 +1,266 @@
+#  MIT License
+#
+#  Copyright (c) 2024 Riley Winkler
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+import argparse
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from .cards import Deck, Hand
+from .rules import hand_payout, dealer_should_hit, perfect_card_value, force_bust_hole_card, force_bust_draw
+
+__all__ = ('RuleSet', 'RULE_SETS', 'POWERUPS', 'basic_action', 'play_round', 'simulate', 'report')
+
+POWERUPS = (None, 'surrender', 'show_dealer', 'show_next', 'perfect_card', 'force_bust')
+
+
+class RuleSet:
+    def __init__(self, decks: int = 6, penetration: float = 0.75, hit_soft_17: bool = True, double: bool = True,
+                 split: bool = True):
+        """The table rules that can be changed, payouts always come from the live game's hand_payout."""
+        self.decks = decks
+        self.penetration = penetration
+        self.hit_soft_17 = hit_soft_17
+        self.double = double
+        self.split = split
+
+    def __repr__(self):
+        return (f'RuleSet<{self.decks} decks, {self.penetration:.0%} pen, {"H17" if self.hit_soft_17 else "S17"}, '
+                f'double={self.double}, split={self.split}>')
+
+
+RULE_SETS = {
+    'table': RuleSet(),
+    'single_deck': RuleSet(decks=1),
+    'stand_soft_17': RuleSet(hit_soft_17=False),
+    'no_double_split': RuleSet(double=False, split=False),
+}
+
+
+def _up_value(card) -> int:
+    value = card.bj_value()
+    return 11 if value == 1 else value
+
+
+def basic_action(hand: Hand, up: int, can_double: bool, can_split: bool) -> str:
+    """Multi deck basic strategy, returns 'hit', 'stand', 'double' or 'split'. up is the dealer up card, ace is 11."""
+    if can_split and len(hand.cards) == 2 and hand.cards[0].bj_value() == hand.cards[1].bj_value():
+        pair = hand.cards[0].bj_value()
+        if (pair in (1, 8) or (pair == 9 and up not in (7, 10, 11)) or (pair == 7 and up <= 7)
+                or (pair == 6 and up <= 6) or (pair == 4 and up in (5, 6)) or (pair in (2, 3) and up <= 7)):
+            return 'split'
+    value = hand.get_hand_bj_values()
+    soft = value != hand.get_hand_bj_values(suppress_eleven=True)
+    if soft:
+        if value >= 20 or (value == 19 and not (can_double and up == 6)):
+            return 'stand'
+        if can_double and ((value == 19 and up == 6) or (value == 18 and up <= 6) or (value == 17 and 3 <= up <= 6)
+                           or (value in (15, 16) and 4 <= up <= 6) or (value in (13, 14) and up in (5, 6))):
+            return 'double'
+        if value == 18 and up <= 8:
+            return 'stand'
+        return 'hit'
+    if value >= 17 or (value >= 13 and up <= 6) or (value == 12 and 4 <= up <= 6):
+        return 'stand'
+    if can_double and (value == 11 or (value == 10 and up <= 9) or (value == 9 and 3 <= up <= 6)):
+        return 'double'
+    return 'hit'
+
+
+def _draw(shoe: Deck, hand: Hand, hidden=False):
+    if len(shoe) < 1:
+        shoe.reset()
+        shoe.shuffle()
+    shoe.draw_to_hand(hand, hidden)
+
+
+def _use_powerup(powerup: str, shoe: Deck, hand: Hand, up: int) -> Optional[str]:
+    """Mirror use_powerup for the first decision of a hand, returns an action when the powerup decides it."""
+    value = hand.get_hand_bj_values()
+    if powerup == 'surrender':
+        return 'surrender' if 12 <= value <= 16 and up >= 7 else None
+    if powerup == 'force_bust':
+        return 'stand'
+    if powerup == 'perfect_card':
+        card = shoe.draw_filter(lambda c: c.bj_value() == perfect_card_value(value))
+        if card:
+            hand.add_card(card)
+            return 'stand'
+    if powerup == 'show_next' and len(shoe):
+        peek = Hand.from_ints(hand.to_ints() + [shoe.peek().code]).get_hand_bj_values()
+        return 'hit' if value < peek <= 21 else 'stand'
+    return None
+
+
+def _show_dealer_action(hand: Hand, dealer_hand: Hand, up: int, rules: RuleSet, can_double: bool,
+                        can_split: bool) -> str:
+    """Beat a standing dealer outright, otherwise stand on a stiff dealer and fall back to basic strategy."""
+    dealer_value = dealer_hand.get_hand_bj_values()
+    if not dealer_should_hit(dealer_hand, rules.hit_soft_17):
+        return 'hit' if hand.get_hand_bj_values() < dealer_value else 'stand'
+    if 12 <= dealer_value <= 16 and hand.get_hand_bj_values(suppress_eleven=True) >= 12:
+        return 'stand'
+    return basic_action(hand, up, can_double, can_split)
+
+
+def play_round(shoe: Deck, rules: RuleSet, powerup: Optional[str] = None, bet: int = 100) -> tuple[int, int]:
+    """Play one seat against the dealer with basic strategy, returns the points wagered and the points returned."""
+    if shoe.needs_shuffle:
+        shoe.reset()
+        shoe.shuffle()
+    dealer_hand = Hand()
+    hand = Hand()
+    _draw(shoe, dealer_hand)
+    _draw(shoe, hand)
+    _draw(shoe, dealer_hand, hidden=True)
+    _draw(shoe, hand)
+    if dealer_hand.get_hand_bj_values() == 21:
+        return bet, hand_payout(hand, dealer_hand, bet)
+
+    up = _up_value(dealer_hand.cards[0])
+    hands = [hand]
+    bets = [bet]
+    unused = powerup
+    j = 0
+    while j < len(hands):
+        hand = hands[j]
+        while hand.get_hand_bj_values() < 21:
+            action = None
+            if unused:
+                action = _use_powerup(unused, shoe, hand, up)
+                if action or unused not in ('perfect_card', 'show_next'):
+                    unused = None
+                if action == 'surrender':
+                    return bet, bet
+            if action is None:
+                first = len(hand.cards) == 2 and len(hands) == 1
+                can_double, can_split = first and rules.double, first and rules.split
+                if powerup == 'show_dealer':
+                    action = _show_dealer_action(hand, dealer_hand, up, rules, can_double, can_split)
+                elif powerup == 'force_bust':
+                    action = 'stand'
+                else:
+                    action = basic_action(hand, up, can_double, can_split)
+            if action == 'stand':
+                break
+            if action == 'split':
+                hands.append(Hand())
+                hands[-1].add_card(hand.pop())
+                bets.append(bet)
+                for split_hand in hands:
+                    _draw(shoe, split_hand)
+                continue
+            _draw(shoe, hand)
+            if action == 'double':
+                bets[j] *= 2
+                break
+        j += 1
+
+    if powerup == 'force_bust':
+        card = force_bust_hole_card(shoe, dealer_hand)
+        if card:
+            dealer_hand.pop()
+            dealer_hand.add_card(card)
+    while dealer_should_hit(dealer_hand, rules.hit_soft_17):
+        card = force_bust_draw(shoe, dealer_hand) if powerup == 'force_bust' else None
+        if card:
+            dealer_hand.add_card(card)
+        else:
+            _draw(shoe, dealer_hand)
+    return sum(bets), sum(hand_payout(h, dealer_hand, b) for h, b in zip(hands, bets))
+
+
+def _run(rules: RuleSet, powerup: Optional[str], bet: int, hands: int, seed: int) -> tuple[int, int, int, int]:
+    random.seed(seed)
+    shoe = Deck(rules.decks, penetration=rules.penetration)
+    shoe.shuffle()
+    wagered = returned = wins = losses = 0
+    for _ in range(hands):
+        w, r = play_round(shoe, rules, powerup, bet)
+        wagered += w
+        returned += r
+        wins += r > w
+        losses += r < w
+    return wagered, returned, wins, losses
+
+
+def simulate(hands: int, *, rules: RuleSet = None, powerup: Optional[str] = None, bet: int = 100,
+             workers: int = None, seed: int = None) -> dict:
+    """
+    Play hands rounds split across worker processes.
+    house_edge is the share of wagered points kept, inflation is the points created per round (negative is a sink).
+    """
+    rules = rules or RuleSet()
+    workers = max(1, min(workers or os.cpu_count() or 1, hands))
+    rng = random.Random(seed)
+    sizes = [hands // workers + (i < hands % workers) for i in range(workers)]
+    args = [(rules, powerup, bet, size, rng.getrandbits(64)) for size in sizes]
+    if workers == 1:
+        results = [_run(*args[0])]
+    else:
+        with ProcessPoolExecutor(workers) as executor:
+            results = list(executor.map(_run, *zip(*args)))
+    wagered, returned, wins, losses = (sum(column) for column in zip(*results))
+    return {
+        'hands': hands,
+        'powerup': powerup,
+        'wagered': wagered,
+        'returned': returned,
+        'house_edge': (wagered - returned) / wagered,
+        'inflation': (returned - wagered) / hands,
+        'win_rate': wins / hands,
+        'loss_rate': losses / hands,
+    }
+
+
+def report(hands: int, rule_sets: dict[str, RuleSet] = None, powerups=POWERUPS, **kwargs) -> list[dict]:
+    """simulate every rule set with every powerup, powerup_value is the inflation over playing without one."""
+    rows = []
+    for name, rules in (rule_sets or RULE_SETS).items():
+        baseline = None
+        for powerup in powerups:
+            result = simulate(hands, rules=rules, powerup=powerup, **kwargs)
+            if powerup is None:
+                baseline = result['inflation']
+            result['rules'] = name
+            result['powerup_value'] = result['inflation'] - baseline if baseline is not None else None
+            rows.append(result)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the house edge of the blackjack rules and powerups.')
+    parser.add_argument('--hands', type=int, default=1_000_000)
+    parser.add_argument('--bet', type=int, default=100)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    print(f'{"rules":<16} {"powerup":<13} {"house edge":>10} {"inflation":>10} {"vs none":>9}')
+    for row in report(args.hands, bet=args.bet, workers=args.workers, seed=args.seed):
+        value = '' if row['powerup_value'] is None else f'{row["powerup_value"]:+.2f}'
+        print(f'{row["rules"]:<16} {str(row["powerup"]):<13} {row["house_edge"]:>10.2%} {row["inflation"]:>+10.2f} '
+              f'{value:>9}')
+
+
+if __name__ == '__main__':
+    main()
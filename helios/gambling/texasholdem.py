@@ -30,6 +30,7 @@ from pokerkit import NoLimitTexasHoldem, State, Hand, Card, ChipsPushing, Foldin
     CompletionBettingOrRaisingTo
 
 from .image import get_card_images
+from .poker import evaluate, equity, load_tables
 from ..colour import Colour
 from ..tools.modals import AmountModal
 
@@ -84,8 +85,9 @@ def get_winners(players: list[Player], hands: list[Hand]):
     for i in reversed(index_to_remove):
         del players[i]
         del hands[i]
-    top = max(hands)
-    winners = [x for x, y in zip(players, hands) if y == top]
+    values = [evaluate(hand.cards) for hand in hands]
+    top = max(values)
+    winners = [x for x, y in zip(players, values) if y == top]
     return winners
 
 
@@ -126,6 +128,7 @@ class TexasHoldEm:
             return bb
 
     async def create_table(self):
+        await asyncio.to_thread(load_tables)
         overwrites = {
             self.server.guild.default_role: discord.PermissionOverwrite(send_messages=False),
             self.server.me: discord.PermissionOverwrite(send_messages=True)
@@ -332,12 +335,24 @@ class TexasHoldEm:
             colour=Colour.poker_table(),
             description=str(self.state.get_hand(self._current_players.index(member), 0))
         )
+        board = list(self.state.get_board_cards(0))
+        index = self._current_players.index(member)
+        active = [i for i, status in enumerate(self.state.statuses) if status]
+        if len(board) < 5 and self.is_all_in(active) and index in active:
+            # All in before the river, show how likely this hand is to hold up against the others still in.
+            holes = [self.state.hole_cards[i] for i in active]
+            shares = await asyncio.to_thread(equity, holes, board)
+            embed.add_field(name='Equity', value=f'{shares[active.index(index)]:.1%}')
         img = discord.File(get_card_images(cards, 5), 'hand.png', description=str(cards))
         embed.set_image(url='attachment://hand.png')
         ret = await self._channel.send(embed=embed, file=img)
         img.close()
         return ret
 
+    def is_all_in(self, active: list[int]) -> bool:
+        """No more betting is possible, at most one of the players still in has chips behind."""
+        return len(active) > 1 and sum(1 for i in active if self.state.stacks[i] > 0) <= 1
+
     async def show_winners(self, push: ChipsPushing):
         amounts = list(push.amounts)
         winners: list[tuple[Player, int]] = list(zip(self._current_players, amounts))
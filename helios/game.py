@@ -19,81 +19,129 @@
 #  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 #  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 #  SOFTWARE.
+import asyncio
+import logging
 from datetime import datetime, time
 from typing import Optional, TYPE_CHECKING
 
 import discord
+import peewee
 from discord.ext import tasks
 
 from .database import GameModel, GameAliasModel
 
 if TYPE_CHECKING:
+    from .helios_bot import HeliosBot
     from .server import Server
 
+logger = logging.getLogger('HeliosLogger.Games')
 
-class GameManager:
-    def __init__(self, server: 'Server'):
-        self.server = server
-        self.games = {}
-        self.alias_to_game = {}
+
+class GameCatalog:
+    def __init__(self, bot: 'HeliosBot'):
+        """
+        Every game and alias, shared by all servers since the games table is global. Loaded once and written
+        through on changes, playtime is only ever added to the database rather than written as totals.
+        """
+        self.bot = bot
+        self.games: dict[str, 'Game'] = {}
+        self.alias_to_game: dict[str, 'Game'] = {}
+        self.not_games: set[str] = set()
+        self.loaded = False
+
+        self._load_lock = asyncio.Lock()
+        self._create_lock = asyncio.Lock()
+        self._write_lock = asyncio.Lock()
+        self._pending_playtime: dict['Game', int] = {}
 
     def start(self):
-        self.manage_games.start()
+        self.flush_loop.start()
         self.set_day_playtime.start()
 
     def stop(self):
-        self.manage_games.stop()
+        self.flush_loop.stop()
         self.set_day_playtime.stop()
 
+    async def load(self):
+        async with self._load_lock:
+            if self.loaded:
+                return
+            games = await GameModel.get_all()
+            self.games.clear()
+            self.alias_to_game.clear()
+            for game in games:
+                self.add_game(Game.from_db(game))
+            self.loaded = True
+        logger.debug(f'Loaded {len(self.games)} games and {len(self.alias_to_game)} aliases')
+
     @tasks.loop(time=time(hour=1, minute=0))
     async def set_day_playtime(self):
-        await self.server.bot.wait_until_ready()
-        self.games.clear()
-        self.alias_to_game.clear()
-        await GameModel.set_day_playtime()
+        await self.bot.wait_until_ready()
+        async with self._write_lock:
+            await self._flush_playtime()
+            for game in self.games.values():
+                game.last_day_playtime = game.play_time
+            await GameModel.set_day_playtime()
 
     @tasks.loop(minutes=1)
-    async def manage_games(self):
-        await self.server.bot.wait_until_ready()
-        to_update = {}
-        icons = {}
-        for member in self.server.members.members.values():
-            game = member.get_game_activity()
-            if game is None:
-                continue
-            game = await self.get_game(game.name)
-            if game is None:
-                continue
-            if game.name in to_update:
-                to_update[game.name] += 1
-            else:
-                to_update[game.name] = 1
-            # if game.large_image_url is not None:
-            #     icons[game.name] = game.large_image_url
-            # elif game.small_image_url is not None:
-            #     icons[game.name] = game.small_image_url
-        for game in to_update:
-            game = await self.get_game(game)
-            await game.add_time(to_update[game.name])
-            if game.name in icons:
-                await game.update_icon(icons[game.name])
-        now = discord.utils.utcnow()
-        for game in list(self.games.values()):
-            if (now - game.last_played).seconds >= 30 * 60:
-                self.remove_game(game)
+    async def flush_loop(self):
+        await self.bot.wait_until_ready()
+        await self.flush_playtime()
+
+    def add_playtime(self, game: 'Game', minutes: int, when: datetime):
+        game.play_time += minutes
+        game.last_played = when
+        self._pending_playtime[game] = self._pending_playtime.get(game, 0) + minutes
+
+    async def flush_playtime(self):
+        """Write the playtime gathered since the last flush in a single update."""
+        async with self._write_lock:
+            await self._flush_playtime()
+
+    async def _flush_playtime(self):
+        pending, self._pending_playtime = self._pending_playtime, {}
+        playtimes = {game.db_entry.id: time for game, time in pending.items() if game.db_entry is not None}
+        try:
+            await GameModel.add_playtimes(playtimes)
+        except Exception as e:
+            logger.warning(f'Failed to save playtime for {len(playtimes)} games: {type(e).__name__}: {e}')
+            for game, time in pending.items():
+                self._pending_playtime[game] = self._pending_playtime.get(game, 0) + time
 
     async def get_game(self, name: str, *, create_new=True) -> Optional['Game']:
-        if name in self.games:
-            return self.games[name]
-        if name in self.alias_to_game:
-            return self.alias_to_game[name]
-        game = await GameModel.find_game(name)
-        if game is None and create_new:
-            await GameModel.create_game(name, display_name=name, icon='')
-            game = await GameModel.find_game(name)
-        if game is None:
+        if not self.loaded:
+            await self.load()
+        game = self.get_from_cache(name)
+        if game is not None or not create_new or name in self.not_games:
+            return game
+        async with self._create_lock:
+            game = self.get_from_cache(name)
+            if game is None:
+                game = await self._find_or_create(name)
+        return game
+
+    async def _find_or_create(self, name: str) -> Optional['Game']:
+        try:
+            # The name may have become an alias outside of this catalog.
+            db_entry = await GameModel.find_game(name)
+            if db_entry is not None:
+                game = Game.from_db(db_entry)
+            else:
+                game = Game.from_db(await GameModel.create_game(name, display_name=name, icon=''), aliases=[])
+        except (peewee.IntegrityError, peewee.DataError) as e:
+            # The name itself can not be stored, so every later attempt would fail the same way.
+            logger.warning(f'Could not store game {name!r}: {type(e).__name__}: {e}')
+            self.not_games.add(name)
             return None
-        game = Game.from_db(game)
+        except peewee.DatabaseError as e:
+            logger.warning(f'Could not look up game {name!r}, will retry: {type(e).__name__}: {e}')
+            return None
+        existing = self.games.get(game.name)
+        if existing is not None:
+            if name != existing.name and name not in existing.alias:
+                existing.alias.append(name)
+            self.alias_to_game[name] = existing
+            return existing
         self.add_game(game)
         return game
 
@@ -105,8 +153,15 @@ class GameManager:
         return None
 
     async def add_game_alias_from_game(self, game: 'Game', alias: 'Game'):
-        await alias.convert_to_alias_of(game)
-        self.remove_game(alias)
+        async with self._write_lock:
+            await self._flush_playtime()
+            await alias.convert_to_alias_of(game)
+            self.remove_game(alias)
+            self.add_game(game)
+            # Minutes counted while merging belonged to a row that no longer exists.
+            moved = self._pending_playtime.pop(alias, 0)
+            if moved:
+                self._pending_playtime[game] = self._pending_playtime.get(game, 0) + moved
 
     def add_game(self, game: 'Game'):
         self.games[game.name] = game
@@ -114,9 +169,57 @@ class GameManager:
             self.alias_to_game[alias] = game
 
     def remove_game(self, game: 'Game'):
-        del self.games[game.name]
+        self.games.pop(game.name, None)
         for alias in game.alias:
-            del self.alias_to_game[alias]
+            self.alias_to_game.pop(alias, None)
+
+
+class GameManager:
+    def __init__(self, server: 'Server'):
+        """Counts this server's playtime into the bot wide game catalog."""
+        self.server = server
+
+    @property
+    def catalog(self) -> GameCatalog:
+        return self.server.bot.games
+
+    @property
+    def games(self) -> dict[str, 'Game']:
+        return self.catalog.games
+
+    @property
+    def alias_to_game(self) -> dict[str, 'Game']:
+        return self.catalog.alias_to_game
+
+    def start(self):
+        self.manage_games.start()
+
+    def stop(self):
+        self.manage_games.stop()
+
+    async def load(self):
+        await self.catalog.load()
+
+    @tasks.loop(minutes=1)
+    async def manage_games(self):
+        await self.server.bot.wait_until_ready()
+        now = discord.utils.utcnow()
+        for name, players in list(self.server.presences.players.items()):
+            game = await self.catalog.get_game(name)
+            if game is not None:
+                self.catalog.add_playtime(game, len(players), now)
+
+    async def flush_playtime(self):
+        await self.catalog.flush_playtime()
+
+    async def get_game(self, name: str, *, create_new=True) -> Optional['Game']:
+        return await self.catalog.get_game(name, create_new=create_new)
+
+    def get_from_cache(self, name: str) -> Optional['Game']:
+        return self.catalog.get_from_cache(name)
+
+    async def add_game_alias_from_game(self, game: 'Game', alias: 'Game'):
+        await self.catalog.add_game_alias_from_game(game, alias)
 
 
 class Game:
@@ -133,31 +236,20 @@ class Game:
         self.db_entry: Optional['GameModel'] = None
 
     async def save(self):
+        """Playtime is left out of updates, it is only ever added to the row."""
         if self.db_entry is None:
             self.db_entry = await GameModel.create(**self.to_dict())
+            for alias in self.alias:
+                await GameAliasModel.create(game=self.db_entry, alias=alias)
         else:
-            data = self.to_dict()
-            del data['alias']
-            await self.db_entry.async_update(**data)
-
-        for alias in self.alias:
-            await GameAliasModel.create(game=self.db_entry, alias=alias)
+            await self.db_entry.async_update(display_name=self.display_name, icon=self.icon)
 
     async def convert_to_alias_of(self, game: 'Game'):
-        await self.db_entry.delete_game()
-        await game.db_entry.add_alias(self.name)
+        await GameModel.merge_game(self.db_entry, game.db_entry)
+        game.alias += [self.name] + [alias for alias in self.alias if alias not in game.alias]
         game.play_time += self.play_time
         game.last_day_playtime += self.last_day_playtime
         game.last_played = max(game.last_played, self.last_played)
-        await game.save()
-
-    async def add_time(self, time: int):
-        self.play_time += time
-        await self.db_entry.add_playtime(time)
-
-    async def set_day_playtime(self):
-        self.last_day_playtime = self.play_time
-        await self.db_entry.async_update(last_day_playtime=self.play_time)
 
     async def update_icon(self, icon: str):
         if self.icon == icon:
@@ -172,9 +264,11 @@ class Game:
                    last_day_playtime=data.get('last_day_playtime', 0), last_played=data.get('last_played'))
 
     @classmethod
-    def from_db(cls, db_entry: GameModel):
+    def from_db(cls, db_entry: GameModel, *, aliases: list[str] = None):
+        if aliases is None:
+            aliases = [alias.alias for alias in db_entry.aliases]
         obj = cls(db_entry.name, display_name=db_entry.display_name, icon=db_entry.icon,
-                  alias=[alias.alias for alias in db_entry.aliases], play_time=db_entry.play_time,
+                  alias=aliases, play_time=db_entry.play_time,
                   last_day_playtime=db_entry.last_day_playtime, last_played=db_entry.last_played)
         obj.db_entry = db_entry
         return obj
@@ -32,7 +32,9 @@ from discord.ext import commands, tasks
 
 from .database import EventModel, objects
 from .effects import EffectsManager
+from .enums import ServerStates
 from .event_manager import EventManager
+from .game import GameCatalog
 from .http import HTTPClient
 from .server import Server
 from .server_manager import ServerManager
@@ -48,6 +50,7 @@ class HeliosBot(commands.Bot):
         self.servers = ServerManager(self)
         self.event_manager = EventManager(self, objects)
         self.effects = EffectsManager(self)
+        self.games = GameCatalog(self)
         self.settings = settings
         self.ready_once = True
         self.helios_http: Optional[HTTPClient] = None
@@ -86,6 +89,7 @@ class HeliosBot(commands.Bot):
 
     async def setup_hook(self) -> None:
         self.tree.on_error = self.on_slash_error
+        self.tree.interaction_check = self.server_ready_check
         self.helios_http = HTTPClient(
             self.settings.api_url,
             loop=self.loop,
@@ -122,8 +126,13 @@ class HeliosBot(commands.Bot):
             _ = self.loop.create_task(self.effects.manage_effects())
             await self.effects.fetch_all()
             self.check_activity.start()
+            self.games.start()
             logger.info('Finished setup')
             self.ready_once = False
+        else:
+            # Presence events missed while reconnecting are not replayed.
+            for server in self.servers.servers.values():
+                server.presences.rebuild()
 
     def register_views(self):
         logger.debug('Registering views')
@@ -153,6 +162,23 @@ class HeliosBot(commands.Bot):
                 await self.change_presence(activity=None)
                 self._last_activity = None
 
+    async def server_ready_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.guild_id is None:
+            return True
+        server = self.servers.get(interaction.guild_id)
+        if server is not None and server.ready:
+            return True
+        if interaction.type == discord.InteractionType.autocomplete:
+            return False
+        if server is None and not self.ready_once:
+            message = 'Helios is not set up in this server, an admin should check the logs.'
+        elif server is not None and server.state == ServerStates.Failed:
+            message = 'Helios failed to set up in this server, an admin should check the logs.'
+        else:
+            message = 'Helios is still starting up in this server, please try again in a moment.'
+        await interaction.response.send_message(message, ephemeral=True)
+        return False
+
     @staticmethod
     async def on_slash_error(
             interaction: discord.Interaction,
@@ -288,11 +288,8 @@ class HeliosMember(HasFlags):
                 return role.colour
         return colour
 
-    def get_game_activity(self):
-        for activity in self.member.activities:
-            if (not isinstance(activity, discord.CustomActivity) and activity.name != 'Hang Status'
-                    and activity.type == discord.ActivityType.playing):
-                return activity
+    def get_game_activity(self) -> Optional[discord.Activity]:
+        return self.server.presences.get_activity(self.member.id)
 
     # noinspection PyUnresolvedReferences
     def _deserialize(self, data: MemberModel):
@@ -475,6 +472,26 @@ class HeliosMember(HasFlags):
         if old_max < self.points:
             await self.statistics.max_points.set_value(self.points)
 
+    @staticmethod
+    async def add_points_many(payments: list[tuple['HeliosMember', int, str, str]]):
+        """Add points for many members at once, each payment is (member, price, payee, description)."""
+        payments = [payment for payment in payments if payment[1] != 0]
+        if not payments:
+            return
+        rows = []
+        for member, price, payee, description in payments:
+            if len(description) > 50:
+                description = description[:47] + '...'
+            rows.append({'member': member._db_entry, 'description': description, 'amount': price,
+                         'payee': payee[:25]})
+        await objects.execute(TransactionModel.insert_many(rows))
+        for member, price, _, _ in payments:
+            member.points += price
+        for member in {payment[0] for payment in payments}:
+            old_max = await member.statistics.max_points.value()
+            if old_max < member.points:
+                await member.statistics.max_points.set_value(member.points)
+
     async def transfer_points(self, target: 'HeliosMember', price: int, description: str,
                               receive_description: str = None):
         await target.add_points(price, self.member.name, receive_description if receive_description else description)
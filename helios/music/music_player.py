@@ -32,6 +32,8 @@ from discord.ext import tasks
 from discord.utils import format_dt
 
 from .playlist import Playlist, YoutubePlaylist
+from .prefetch import SongPrefetcher
+from .processor import media_cache
 from .song import Song
 from ..colour import Colour
 from ..exceptions import ConnectError
@@ -58,6 +60,8 @@ class MusicPlayer:
         self.currently_playing: Optional['Song'] = None
         self.background_playlist: Playlist = Playlist()
         self._playlist: Playlist = Playlist()
+        self.prefetcher = SongPrefetcher()
+        self._loading: dict['YoutubePlaylist', asyncio.Task] = {}
         self._vc: Optional[discord.VoiceClient] = self.server.guild.voice_client
         self._started: Optional[datetime] = None
         self._ended: Optional[datetime] = None
@@ -138,6 +142,7 @@ class MusicPlayer:
                 await view.wait()
                 shuffle = view.value if view.value is not None else False
                 if shuffle:
+                    await playlist.load_all()
                     playlist.shuffle()
                 if await self.add_playlist(playlist):
                     await message.edit(content=f'Added {len(playlist)} songs to the queue', view=None)
@@ -161,6 +166,9 @@ class MusicPlayer:
 
     def stop(self):
         self._stopping = True
+        self.prefetcher.clear()
+        for task in self._loading.values():
+            task.cancel()
         if self._control_message is not None:
             self._control_view.stop()
 
@@ -191,14 +199,22 @@ class MusicPlayer:
             return False
         self._skipping = False
         self.currently_playing = song
-        await self.update_message()
+        self.queue_changed()
 
         duration = song.duration
         start = 0
         finished = False
         while not finished:
             try:
-                await self.vc.play(await song.audio_source(start=start))
+                source = self.prefetcher.take(song) if start == 0 else None
+                if source is None:
+                    source = await song.audio_source(start=start)
+                playing = self.vc.play(source)
+                if start == 0:
+                    if duration:
+                        self.prefetcher.warm_later(duration - self.prefetcher.WARM_SECONDS)
+                    await self.update_message()
+                await playing
             except Exception as e:
                 logger.error(f'{self.server.name}: Music Player: Failed to play song: {e}')
                 pass
@@ -210,6 +226,8 @@ class MusicPlayer:
             time_left = duration - (played_for + start)
 
             if time_left / duration > 0.1 and not self._stopping:
+                # The cached stream url may be what failed, resume from a freshly extracted one.
+                media_cache.remove_stream(song.url)
                 start += played_for
                 await asyncio.sleep(1)
             else:
@@ -218,30 +236,32 @@ class MusicPlayer:
         if song.playlist:
             song.playlist.next()
         self.currently_playing = None
-        await self.update_message()
+        if self.playlist.get_current_song() is None or self._stopping:
+            await self.update_message()
         return True
 
     def is_connected(self) -> bool:
         return self.vc.voice_client and self.vc.voice_client.is_connected()
 
+    def queue_changed(self):
+        self.prefetcher.refresh(self.playlist.songs)
+
     def skip_song(self):
         self._skipping = True
         self.vc.voice_client.stop()
 
     def skip_playlist(self):
         if self.currently_playing and self.currently_playing.playlist:
-            songs = self.currently_playing.playlist.songs
-            for song in songs:
-                try:
-                    self.playlist.songs.remove(song)
-                except ValueError:
-                    ...
+            playlist = self.currently_playing.playlist
+            if playlist in self._loading:
+                self._loading.pop(playlist).cancel()
+            self.playlist.songs.remove_many(playlist.songs)
+            self.queue_changed()
         self.skip_song()
 
     def playlist_time_left(self) -> int:
         if self.currently_playing and self.currently_playing.playlist:
-            songs = self.currently_playing.playlist.unplayed
-            delta = sum([x.duration if x.duration else 0 for x in songs])
+            delta = self.currently_playing.playlist.unplayed.total_duration
             if self.currently_playing:
                 delta += self.time_left()
             return delta
@@ -260,6 +280,7 @@ class MusicPlayer:
         if not self.check_schedule(song.duration):
             return False
         self.playlist.add_song(song)
+        self.queue_changed()
         if self.loop_running:
             await self.update_message()
         return True
@@ -268,11 +289,33 @@ class MusicPlayer:
         """Add a playlist to the queue."""
         if not self.check_schedule(playlist.total_duration):
             return False
-        [self.playlist.add_song(x) for x in playlist.unplayed]
+        self.playlist.songs.extend(playlist.unplayed)
+        self.queue_changed()
+        if not playlist.exhausted:
+            self._loading[playlist] = asyncio.create_task(self.load_playlist(playlist))
         if self.loop_running:
             await self.update_message()
         return True
 
+    async def load_playlist(self, playlist: 'YoutubePlaylist'):
+        """Queue the rest of a playlist a page at a time after its first page was added."""
+        try:
+            while not playlist.exhausted and not self._stopping:
+                songs = await playlist.load_more()
+                if not songs:
+                    break
+                if not self.check_schedule(playlist.total_duration):
+                    logger.info(f'{self.server.name}: Music Player: Stopped loading {playlist.title}, out of time')
+                    break
+                self.playlist.songs.extend(songs)
+                self.queue_changed()
+                if self.loop_running:
+                    await self.update_message()
+        except Exception as e:
+            logger.error(f'{self.server.name}: Music Player: Failed to load playlist: <{type(e).__name__}> {e}')
+        finally:
+            self._loading.pop(playlist, None)
+
     async def update_message(self):
         if self._control_message is None:
             return
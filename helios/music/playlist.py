@@ -19,13 +19,17 @@
 #  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 #  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 #  SOFTWARE.
+import asyncio
+import logging
 import random
+from collections import deque
 from datetime import timedelta
-from typing import TYPE_CHECKING
+from itertools import islice
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional, Union
 
 import discord
 
-from .processor import get_info
+from .processor import get_metadata, extractor_pool
 from .song import Song
 from ..colour import Colour
 from ..views import PaginatorView
@@ -33,10 +37,123 @@ from ..views import PaginatorView
 if TYPE_CHECKING:
     from ..member import HeliosMember
 
+logger = logging.getLogger('HeliosLogger.Music')
+
+class SongQueue:
+    def __init__(self, songs: Iterable[Song] = ()):
+        """
+        A list of songs with O(1) length, indexing, front and back changes and position lookup.
+        Songs are kept in a list with a moving head, positions are stored as absolute indexes into it. A song can be
+        queued more than once so each keeps its indexes in ascending order.
+        """
+        self._items: list[Optional[Song]] = []
+        self._head = 0
+        self._positions: dict[int, deque[int]] = {}
+        self.total_duration = 0
+        self.extend(songs)
+
+    def __len__(self):
+        return len(self._items) - self._head
+
+    def __iter__(self) -> Iterator[Song]:
+        return islice(self._items, self._head, None)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Song, list[Song]]:
+        if isinstance(index, slice):
+            return [self._items[self._head + i] for i in range(len(self))[index]]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('song queue index out of range')
+        return self._items[self._head + index]
+
+    def _reset(self, songs: list[Song]):
+        self._items = songs
+        self._head = 0
+        self._positions = {}
+        for i, song in enumerate(songs):
+            self._positions.setdefault(id(song), deque()).append(i)
+
+    def position(self, song: Song) -> int:
+        """The index of the first time song is in the queue, raises ValueError if it is not queued."""
+        try:
+            return self._positions[id(song)][0] - self._head
+        except KeyError:
+            raise ValueError(f'{song!r} is not in the queue') from None
+
+    def append(self, song: Song):
+        self._positions.setdefault(id(song), deque()).append(len(self._items))
+        self._items.append(song)
+        self.total_duration += song.duration or 0
+
+    def extend(self, songs: Iterable[Song]):
+        for song in songs:
+            self.append(song)
+
+    def appendleft(self, song: Song):
+        if self._head == 0:
+            pad = len(self) + 1
+            self._items = [None] * pad + self._items
+            self._head = pad
+            self._positions = {key: deque(pos + pad for pos in positions)
+                               for key, positions in self._positions.items()}
+        self._head -= 1
+        self._items[self._head] = song
+        self._positions.setdefault(id(song), deque()).appendleft(self._head)
+        self.total_duration += song.duration or 0
+
+    def popleft(self) -> Song:
+        if not self:
+            raise IndexError('pop from an empty song queue')
+        song = self._items[self._head]
+        self._items[self._head] = None
+        self._head += 1
+        positions = self._positions[id(song)]
+        positions.popleft()
+        if not positions:
+            del self._positions[id(song)]
+        self.total_duration -= song.duration or 0
+        if self._head > 32 and self._head > 2 * len(self):
+            self._reset(self._items[self._head:])
+        return song
+
+    def remove_many(self, songs: Iterable[Song]):
+        """Remove every queued song in songs, including repeats, with one pass over the queue."""
+        ids = {id(song) for song in songs}
+        kept = [song for song in self if id(song) not in ids]
+        self._reset(kept)
+        self.total_duration = sum(song.duration or 0 for song in kept)
+
+    def remove(self, song: Song):
+        """Remove the first time song is in the queue."""
+        index = self.position(song)
+        songs = list(self)
+        del songs[index]
+        self._reset(songs)
+        self.total_duration -= song.duration or 0
+
+    def shuffle(self):
+        songs = list(self)
+        random.shuffle(songs)
+        self.clear()
+        self.extend(songs)
+
+    def clear(self):
+        self._items = []
+        self._head = 0
+        self._positions = {}
+        self.total_duration = 0
+
+    def copy(self) -> 'SongQueue':
+        return SongQueue(self)
+
 
 class Playlist:
     def __init__(self):
-        self.songs: list[Song] = []
+        self.songs: SongQueue = SongQueue()
 
     def __len__(self):
         return len(self.songs)
@@ -59,13 +176,13 @@ class Playlist:
         self.songs.append(song)
 
     def add_song_next(self, song: Song):
-        self.songs.insert(0, song)
+        self.songs.appendleft(song)
 
     def get_embed_songs(self, songs: list['Song']) -> list[discord.Embed]:
         song_string = ''
         for song in songs:
             dur = timedelta(seconds=song.duration) if song.duration is not None else 'Unknown Duration'
-            song_string += f'**{self.songs.index(song)+1}. {song.title}**By {song.author}\nDuration: {dur}\n\n'
+            song_string += f'**{self.songs.position(song)+1}. {song.title}**By {song.author}\nDuration: {dur}\n\n'
         if not song_string:
             song_string = 'Nothing in queue'
         embed = discord.Embed(
@@ -87,29 +204,33 @@ class Playlist:
 
     def next(self):
         try:
-            return self.songs.pop(0)
+            return self.songs.popleft()
         except IndexError:
             return None
 
     def total_duration(self):
-        seconds = 0
-        for song in self.songs:
-            seconds += song.duration
-        return seconds
+        return self.songs.total_duration
 
     def clear(self):
         self.songs.clear()
 
 
-def extract_playlist_from_info(data):
+def extract_playlist_from_info(data) -> Iterator[dict]:
     if data.get('_type') == 'playlist':
         if data.get('entries'):
-            return [x for x in data.get('entries')]
-    return []
+            return iter(data.get('entries'))
+    return iter(())
 
 
 class YoutubePlaylist(Playlist):
-    def __init__(self, data: dict, requester: 'HeliosMember'):
+    PAGE_SIZE = 50
+
+    def __init__(self, data: dict, requester: 'HeliosMember', *, worker: int = None):
+        """
+        Entries are turned into songs a page at a time with load_more, yt-dlp may fetch the next page from YouTube
+        while iterating the flat entries so pages are pulled on the extractor pool, on the worker whose YoutubeDL
+        extracted the playlist.
+        """
         super().__init__()
         self.requester = requester
         self.title = data.get('title')
@@ -119,27 +240,68 @@ class YoutubePlaylist(Playlist):
             self.thumbnail = thumbnails[-1].get('url')
         else:
             self.thumbnail = None
-        self.songs = [Song.from_info(x, requester=requester, playlist=self) for x in extract_playlist_from_info(data)]
-        self.unplayed = self.songs.copy()
+        self.count: Optional[int] = data.get('playlist_count')
+        self.exhausted = False
+        self.unplayed = SongQueue()
         self.played = []
-        self.total_duration = sum([x.duration if x.duration is not None else 0 for x in self.songs])
-        self.total_cost = sum([x.calculate_full_song_cost() for x in self.songs])
+        self.total_duration = 0
+        self.total_cost = 0
         self.vote_skip = set()
         self.tips = 0
 
+        self._entries = extract_playlist_from_info(data)
+        self._worker = worker
+
+    def __len__(self):
+        return max(self.count or 0, len(self.songs))
+
     @classmethod
     async def from_url(cls, url: str, requester: 'HeliosMember'):
-        data = await get_info(url, process=False, is_playlist=True)
-        return cls(data, requester) if data is not None else None
+        worker = extractor_pool.pick_worker()
+        data = await get_metadata(url, is_playlist=True, worker=worker)
+        if data is None:
+            return None
+        playlist = cls(data, requester, worker=worker)
+        if not await playlist.load_more():
+            return None
+        return playlist
+
+    def add_entries(self, entries: list[dict]) -> list[Song]:
+        songs = [Song.from_info(x, requester=self.requester, playlist=self) for x in entries]
+        self.songs.extend(songs)
+        self.unplayed.extend(songs)
+        self.total_duration += sum(x.duration for x in songs if x.duration is not None)
+        self.total_cost += sum(x.calculate_full_song_cost() for x in songs)
+        return songs
+
+    async def load_more(self, count: int = PAGE_SIZE) -> list[Song]:
+        """Turn the next count entries into songs, returns the new songs, empty once the playlist is exhausted."""
+        if self.exhausted:
+            return []
+        try:
+            entries = await extractor_pool.run(lambda: list(islice(self._entries, count)),
+                                               timeout=extractor_pool.PLAYLIST_TIMEOUT, worker=self._worker)
+        except asyncio.TimeoutError:
+            # The page may still be pulled on the worker and the entries can not be iterated twice at once.
+            logger.warning(f'Loading playlist {self.title} timed out after {len(self.songs)} songs')
+            self.exhausted = True
+            return []
+        if len(entries) < count:
+            self.exhausted = True
+        return self.add_entries(entries)
+
+    async def load_all(self):
+        while not self.exhausted:
+            await self.load_more()
 
     def shuffle(self):
         self.unplayed = self.songs.copy()
         self.played = []
-        random.shuffle(self.unplayed)
+        self.unplayed.shuffle()
 
     def next(self):
         try:
-            song = self.unplayed.pop(0)
+            song = self.unplayed.popleft()
             self.played.append(song)
             return song
         except IndexError:
@@ -0,0 +1,116 @@
+#  MIT License
+#
+#  Copyright (c) 2024 Riley Winkler
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Optional
+
+import discord
+
+from .processor import media_cache
+
+if TYPE_CHECKING:
+    from .song import Song
+
+__all__ = ('SongPrefetcher',)
+
+logger = logging.getLogger('HeliosLogger.Music')
+
+
+class SongPrefetcher:
+    LOOKAHEAD = 3
+    WARM_SECONDS = 15
+
+    def __init__(self, lookahead: int = LOOKAHEAD):
+        """
+        Resolves stream urls for the next lookahead songs in the background and starts FFmpeg for the next song
+        shortly before the current one ends, so it can start playing without waiting on yt-dlp or FFmpeg.
+        """
+        self.lookahead = lookahead
+        self.hits = 0
+        self.misses = 0
+
+        self._upcoming: list['Song'] = []
+        self._resolving: dict[str, asyncio.Task] = {}
+        self._warm: Optional[tuple['Song', discord.AudioSource]] = None
+        self._warm_task: Optional[asyncio.Task] = None
+
+    def refresh(self, queue: list['Song']):
+        """Call whenever the queue changes, work for songs that are no longer coming up is dropped."""
+        self._upcoming = queue[:self.lookahead]
+        urls = {song.url for song in self._upcoming}
+        for url in list(self._resolving):
+            if url not in urls:
+                self._resolving.pop(url).cancel()
+        for song in self._upcoming:
+            if song.url not in self._resolving:
+                task = asyncio.create_task(media_cache.get_stream(song.url), name=f'Prefetch: Resolve {song.url}')
+                task.add_done_callback(self._log_failure)
+                self._resolving[song.url] = task
+        if self._warm is not None and (not self._upcoming or self._warm[0] is not self._upcoming[0]):
+            self._drop_warm()
+
+    def warm_later(self, delay: float):
+        """Start FFmpeg for the next song after delay seconds, replacing any earlier request."""
+        if self._warm_task is not None:
+            self._warm_task.cancel()
+        self._warm_task = asyncio.create_task(self._warm_after(max(0.0, delay)), name='Prefetch: Warm next song')
+        self._warm_task.add_done_callback(self._log_failure)
+
+    @staticmethod
+    def _log_failure(task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            e = task.exception()
+            logger.warning(f'{task.get_name()} failed: {type(e).__name__}: {e}', exc_info=e)
+
+    async def _warm_after(self, delay: float):
+        await asyncio.sleep(delay)
+        if not self._upcoming or self._warm is not None:
+            return
+        song = self._upcoming[0]
+        source = await song.audio_source()
+        if source is None:
+            return
+        if self._warm is None and self._upcoming and self._upcoming[0] is song:
+            self._warm = (song, source)
+        else:
+            source.cleanup()
+
+    def take(self, song: 'Song') -> Optional[discord.AudioSource]:
+        """The warm source for song if there is one, the caller owns it afterwards."""
+        if self._warm is not None and self._warm[0] is song:
+            source = self._warm[1]
+            self._warm = None
+            self.hits += 1
+            return source
+        self.misses += 1
+        return None
+
+    def _drop_warm(self):
+        if self._warm is not None:
+            self._warm[1].cleanup()
+            self._warm = None
+
+    def clear(self):
+        self.refresh([])
+        if self._warm_task is not None:
+            self._warm_task.cancel()
+            self._warm_task = None
@@ -21,14 +21,27 @@
 #  SOFTWARE.
 
 import asyncio
-import functools
-from typing import Union
+import logging
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from typing import Union, Optional, Callable, Awaitable, TypeVar
+from urllib.parse import urlparse, parse_qs
 
 import yt_dlp
 
 import discord
+from discord.utils import utcnow
 
-__all__ = ('get_info', 'get_audio_source')
+from ..database import MediaInfoModel
+
+__all__ = ('get_info', 'get_metadata', 'get_audio_source', 'MediaCache', 'media_cache', 'ExtractorPool',
+           'extractor_pool')
+
+logger = logging.getLogger('HeliosLogger.Music')
+T = TypeVar('T')
 
 ytdlopts = {
     'format': 'bestaudio/best',
@@ -53,33 +66,244 @@ ffmpeg_options = {
     'options': '-vn -sn -dn -ignore_unknown -http_persistent 0'
 }
 
-ytdl = yt_dlp.YoutubeDL(ytdlopts)
+class ExtractorPool:
+    WORKERS = 2
+    TIMEOUT = 60
+    PLAYLIST_TIMEOUT = 180
+    QUEUE_WARNING = 10
 
+    def __init__(self, workers: int = WORKERS, timeout: float = TIMEOUT):
+        """
+        A thread pool only for yt-dlp so extraction can not starve the default executor, each thread has its own
+        YoutubeDL since they are not thread safe. Calls go to the least busy worker unless pinned to one, which keeps
+        lazy results like playlist entries on the YoutubeDL that made them. Calls that time out or are cancelled before
+        a worker picks them up are skipped, ones already running are left to finish and their result discarded.
+        """
+        self.workers = workers
+        self.timeout = timeout
+        self.queued = 0
+        self.running = 0
+        self.timeouts = 0
 
-def extract_info_wrapper(*args, **kwargs):
-    data = ytdl.extract_info(*args, **kwargs)
-    return data
+        self._executors: list[Optional[ThreadPoolExecutor]] = [None] * workers
+        self._load = [0] * workers
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @property
+    def queue_depth(self) -> int:
+        """Extractions waiting for a worker."""
+        return self.queued
+
+    def get_executor(self, worker: int) -> ThreadPoolExecutor:
+        executor = self._executors[worker]
+        if executor is None:
+            executor = self._executors[worker] = ThreadPoolExecutor(max_workers=1,
+                                                                    thread_name_prefix=f'HeliosExtractor-{worker}')
+        return executor
+
+    def pick_worker(self) -> int:
+        """The worker with the fewest calls queued or running."""
+        with self._lock:
+            return min(range(self.workers), key=self._load.__getitem__)
+
+    def get_ytdl(self) -> yt_dlp.YoutubeDL:
+        ytdl = getattr(self._local, 'ytdl', None)
+        if ytdl is None:
+            ytdl = self._local.ytdl = yt_dlp.YoutubeDL(ytdlopts)
+        return ytdl
+
+    def _call(self, cancelled: threading.Event, func: Callable[[], T]) -> Optional[T]:
+        with self._lock:
+            self.queued -= 1
+            if cancelled.is_set():
+                return None
+            self.running += 1
+        try:
+            return func()
+        finally:
+            with self._lock:
+                self.running -= 1
+
+    def _on_done(self, worker: int, future: Future):
+        with self._lock:
+            self._load[worker] -= 1
+            # Cancelled before a worker picked it up, at shutdown, so _call never ran to count it off.
+            if future.cancelled():
+                self.queued -= 1
+
+    async def run(self, func: Callable[[], T], *, timeout: float = None, worker: int = None) -> T:
+        """
+        Run func on a worker, or on the given worker, raises asyncio.TimeoutError once timeout seconds pass in total.
+        """
+        loop = asyncio.get_running_loop()
+        cancelled = threading.Event()
+        if worker is None:
+            worker = self.pick_worker()
+        with self._lock:
+            self.queued += 1
+            self._load[worker] += 1
+            depth = self.queued
+        if depth >= self.QUEUE_WARNING:
+            logger.warning(f'yt-dlp extraction queue is {depth} deep')
+        submitted = self.get_executor(worker).submit(self._call, cancelled, func)
+        submitted.add_done_callback(partial(self._on_done, worker))
+        future = asyncio.wrap_future(submitted, loop=loop)
+        try:
+            # Shielded so the pool always sees the call and keeps queued in step, cancelled makes it skip the work.
+            return await asyncio.wait_for(asyncio.shield(future), timeout or self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            cancelled.set()
+            raise
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
 
+    async def extract(self, url: str, *, process=True, timeout: float = None, worker: int = None) -> dict:
+        return await self.run(lambda: self.get_ytdl().extract_info(url, download=False, process=process),
+                              timeout=timeout, worker=worker)
 
-async def get_info(url: str, *, process=True, is_playlist=False):
-    loop = asyncio.get_event_loop()
-    partial = functools.partial(extract_info_wrapper, url=url, download=False, process=process)
+    def shutdown(self):
+        for i, executor in enumerate(self._executors):
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+                self._executors[i] = None
+
+
+extractor_pool = ExtractorPool()
+
+
+async def get_info(url: str, *, process=True, is_playlist=False, timeout: float = None, worker: int = None):
     try:
-        data = await loop.run_in_executor(None, partial)
+        data = await extractor_pool.extract(url, process=process, timeout=timeout, worker=worker)
         if data.get('extractor') == 'youtube:tab' and not is_playlist:
-            partial.keywords['url'] = data.get('url')
-            data = await loop.run_in_executor(None, partial)
+            data = await extractor_pool.extract(data.get('url'), process=process, timeout=timeout, worker=worker)
     except yt_dlp.DownloadError:
         return None
+    except asyncio.TimeoutError:
+        logger.warning(f'yt-dlp extraction of {url} timed out')
+        return None
     return data
 
 
-async def get_audio_source(url: str, *, start: Union[int, float] = 0):
-    try:
+class MediaCache:
+    METADATA_TTL = timedelta(days=30)
+    STREAM_TTL = timedelta(hours=1)
+    STREAM_MARGIN = timedelta(minutes=10)
+    METADATA_KEYS = ('_type', 'id', 'extractor', 'title', 'uploader', 'url', 'webpage_url', 'duration', 'thumbnail')
+
+    def __init__(self, metadata_ttl: timedelta = METADATA_TTL):
+        """
+        Two tier cache in front of yt-dlp. Song metadata is kept in the database for metadata_ttl, signed stream urls
+        are kept in memory until shortly before the expiry in the url. Concurrent lookups of a url share one extract.
+        """
+        self.metadata_ttl = metadata_ttl
+        self.hits = 0
+        self.misses = 0
+
+        self._streams: dict[str, tuple[datetime, str]] = {}
+        self._pending: dict[tuple[str, str], asyncio.Future] = {}
+
+    @classmethod
+    def trim(cls, info: dict) -> dict:
+        """Keep only what Song.from_info needs."""
+        data = {key: info[key] for key in cls.METADATA_KEYS if key in info}
+        if info.get('thumbnails'):
+            data['thumbnails'] = info['thumbnails'][-1:]
+        return data
+
+    @classmethod
+    def stream_expiry(cls, stream_url: str) -> datetime:
+        """The expiry signed into a stream url, as a query parameter or a path segment, or STREAM_TTL from now."""
+        parsed = urlparse(stream_url)
+        expire = parse_qs(parsed.query).get('expire', [None])[0]
+        if expire is None:
+            match = re.search(r'/expire/(\d+)', parsed.path)
+            expire = match.group(1) if match else None
+        if expire is None or not expire.isdigit():
+            return utcnow() + cls.STREAM_TTL
+        return datetime.fromtimestamp(int(expire), tz=timezone.utc)
+
+    def get_stream_cached(self, url: str) -> Optional[str]:
+        entry = self._streams.get(url)
+        if entry is None:
+            return None
+        expires, stream_url = entry
+        if expires - utcnow() <= self.STREAM_MARGIN:
+            del self._streams[url]
+            return None
+        return stream_url
+
+    def add_stream(self, url: str, stream_url: str):
+        now = utcnow()
+        self._streams = {k: v for k, v in self._streams.items() if v[0] - now > self.STREAM_MARGIN}
+        self._streams[url] = (self.stream_expiry(stream_url), stream_url)
+
+    def remove_stream(self, url: str):
+        self._streams.pop(url, None)
+
+    async def _shared(self, key: tuple[str, str], factory: Callable[[], Awaitable]):
+        pending = self._pending.get(key)
+        if pending is None:
+            self.misses += 1
+            pending = asyncio.ensure_future(factory())
+            self._pending[key] = pending
+            pending.add_done_callback(lambda _: self._pending.pop(key, None))
+        return await asyncio.shield(pending)
+
+    async def get_metadata(self, url: str, *, is_playlist=False, worker: int = None) -> Optional[dict]:
+        """
+        Unprocessed info for a url, single songs are served from the database when possible. Playlists are extracted
+        on worker, their entries must be paged through on that same worker.
+        """
+        if is_playlist:
+            # Not shared, the entries are a lazy iterator each playlist pages through on its own.
+            return await get_info(url, process=False, is_playlist=True, timeout=extractor_pool.PLAYLIST_TIMEOUT,
+                                  worker=worker)
+        if len(url) <= 255:
+            data = await MediaInfoModel.get_fresh(url, self.metadata_ttl)
+            if data is not None:
+                self.hits += 1
+                return data
+        return await self._shared(('metadata', url), lambda: self._fetch_metadata(url))
+
+    async def _fetch_metadata(self, url: str) -> Optional[dict]:
+        data = await get_info(url, process=False)
+        if data is None or data.get('_type') == 'playlist' or 'title' not in data:
+            return data
+        data = self.trim(data)
+        if len(url) <= 255:
+            await MediaInfoModel.store(url, data)
+        return data
+
+    async def get_stream(self, url: str) -> Optional[str]:
+        stream_url = self.get_stream_cached(url)
+        if stream_url is not None:
+            self.hits += 1
+            return stream_url
+        return await self._shared(('stream', url), lambda: self._fetch_stream(url))
+
+    async def _fetch_stream(self, url: str) -> Optional[str]:
         data = await get_info(url)
-        options = ffmpeg_options.copy()
-        if start:
-            options['before_options'] += f' -ss {start}'
-        return discord.FFmpegPCMAudio(source=data['url'], **options, executable='ffmpeg')
-    except yt_dlp.DownloadError:
+        if data is None or 'url' not in data:
+            return None
+        self.add_stream(url, data['url'])
+        return data['url']
+
+
+media_cache = MediaCache()
+
+
+async def get_metadata(url: str, *, is_playlist=False, worker: int = None) -> Optional[dict]:
+    return await media_cache.get_metadata(url, is_playlist=is_playlist, worker=worker)
+
+
+async def get_audio_source(url: str, *, start: Union[int, float] = 0):
+    stream_url = await media_cache.get_stream(url)
+    if stream_url is None:
         return None
+    options = ffmpeg_options.copy()
+    if start:
+        options['before_options'] += f' -ss {start}'
+    return discord.FFmpegPCMAudio(source=stream_url, **options, executable='ffmpeg')
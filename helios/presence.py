@@ -0,0 +1,87 @@
+#  MIT License
+#
+#  Copyright (c) 2024 Riley Winkler
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+import logging
+from typing import TYPE_CHECKING, Optional
+
+import discord
+
+if TYPE_CHECKING:
+    from .server import Server
+
+logger = logging.getLogger('HeliosLogger.Presence')
+
+
+def find_game_activity(member: discord.Member) -> Optional[discord.Activity]:
+    for activity in member.activities:
+        if (not isinstance(activity, discord.CustomActivity) and activity.name != 'Hang Status'
+                and activity.type == discord.ActivityType.playing):
+            return activity
+    return None
+
+
+class PresenceIndex:
+    def __init__(self, server: 'Server'):
+        """The game every member is playing and the members playing every game, kept up by presence events."""
+        self.server = server
+        self.activities: dict[int, discord.Activity] = {}
+        self.players: dict[str, set[int]] = {}
+
+    def get_activity(self, member_id: int) -> Optional[discord.Activity]:
+        return self.activities.get(member_id)
+
+    def get_game(self, member_id: int) -> Optional[str]:
+        activity = self.activities.get(member_id)
+        return activity.name if activity else None
+
+    def get_players(self, game: str) -> set[int]:
+        return self.players.get(game, set())
+
+    def update(self, member: discord.Member) -> bool:
+        """Update the index from a member's current presence, returns whether their game changed."""
+        before = self.get_game(member.id)
+        activity = find_game_activity(member)
+        self._discard(member.id)
+        if activity is not None:
+            self.activities[member.id] = activity
+            self.players.setdefault(activity.name, set()).add(member.id)
+        return before != self.get_game(member.id)
+
+    def remove(self, member_id: int):
+        self._discard(member_id)
+
+    def _discard(self, member_id: int):
+        activity = self.activities.pop(member_id, None)
+        if activity is None:
+            return
+        players = self.players.get(activity.name)
+        if players is not None:
+            players.discard(member_id)
+            if not players:
+                del self.players[activity.name]
+
+    def rebuild(self):
+        self.activities.clear()
+        self.players.clear()
+        for member in self.server.guild.members:
+            self.update(member)
+        logger.debug(f'{self.server.name}: Indexed {len(self.activities)} members playing {len(self.players)} games')
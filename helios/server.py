@@ -22,6 +22,7 @@
 
 import json
 import logging
+import time
 from typing import TYPE_CHECKING, Dict, Optional
 
 import discord
@@ -30,16 +31,19 @@ from .channel_manager import ChannelManager
 from .cooldowns import Cooldowns
 from .court import Court
 from .database import ServerModel, objects
+from .enums import ServerStates
 from .exceptions import IdMismatchError
 from .gambling.manager import GamblingManager
 from .game import GameManager
 from .helios_voice_controller import HeliosVoiceController
 from .member import HeliosMember
 from .member_manager import MemberManager
+from .presence import PresenceIndex
 from .shop import Shop
 from .store import Store
 from .theme import ThemeManager
 from .tools.settings import Settings, SettingItem
+from .utils import run_phases
 from .views import VoiceControllerView
 
 if TYPE_CHECKING:
@@ -128,6 +132,7 @@ class ServerSettings(Settings):
 class Server:
     def __init__(self, manager: 'ServerManager', guild: discord.Guild):
         self.loaded = False
+        self.state = ServerStates.Loading
         self.bot = manager.bot
         self.guild = guild
         self.manager = manager
@@ -143,6 +148,7 @@ class Server:
         self.theme = ThemeManager(self)
         self.gambling = GamblingManager(self)
         self.games = GameManager(self)
+        self.presences = PresenceIndex(self)
         self.cooldowns = Cooldowns()
         self.flags = []
 
@@ -155,6 +161,10 @@ class Server:
     def name(self):
         return self.guild.name
 
+    @property
+    def ready(self) -> bool:
+        return self.state == ServerStates.Ready
+
     @property
     def id(self):
         return self.guild.id
@@ -200,20 +210,42 @@ class Server:
         s.loaded = True
         return s
 
-    async def setup(self, data: Optional['ServerModel']):
-        if self._new or data is None:
-            logger.debug(f'Setting up new server {self.name}')
-            await self.members.setup()
-            await self.channels.setup()
-            await self.save()
-        else:
-            logger.debug(f'Setting up server {self.name}')
-            self.deserialize(data)
-            await self.members.setup(data.members)
-            await self.channels.setup(data.channels)
-        await self.theme.load()
+    async def setup(self, data: Optional['ServerModel'] = None):
+        start_time = time.perf_counter()
+        self.state = ServerStates.Loading
+        self.presences.rebuild()
+        try:
+            if self._new or data is None:
+                logger.debug(f'Setting up new server {self.name}')
+                await self.save()
+                member_data, channel_data = None, None
+            else:
+                logger.debug(f'Setting up server {self.name}')
+                self.deserialize(data)
+                member_data, channel_data = data.members, data.channels
+
+            timings = await run_phases({
+                'members': (lambda: self.members.setup(member_data), ()),
+                'channels': (lambda: self.channels.setup(channel_data), ('members',)),
+                'theme': (self.theme.load, ()),
+                'store': (self.load_store, ()),
+                'games': (self.games.load, ()),
+                'voice_cleanup': (self.cleanup_voice_controlled, ('members',)),
+            })
+        except Exception as e:
+            self.state = ServerStates.Failed
+            logger.error(f'Server {self.name} failed to set up: {type(e).__name__}: {e}', exc_info=True)
+            return
+
+        self.start()
+        self.state = ServerStates.Ready
+        phases = ', '.join(f'{name}: {seconds:.2f}s' for name, seconds in timings.items())
+        logger.info(f'Server {self.name} ready in {time.perf_counter() - start_time:.2f}s ({phases})')
+
+    async def load_store(self):
         self.store = await Store.from_server(self)
 
+    async def cleanup_voice_controlled(self):
         role = self.voice_controller_role
         if role is None:
             return
@@ -222,11 +254,16 @@ class Server:
             await h_member.voice_unmute_undeafen(reason='VoiceControlled Cleanup')
             await member.remove_roles(role)
 
-        self.start()
-        logger.debug(f'Server {self.name} setup complete')
+    async def on_presence_update(self, before: discord.Member, after: discord.Member):
+        if self.presences.update(after):
+            await self.channels.dynamic_voice.on_presence_update(before, after)
+
+    def on_member_remove(self, member: discord.Member):
+        self.presences.remove(member.id)
 
     async def shutdown(self):
         self.stop()
+        await self.games.flush_playtime()
         await self.save()
 
     def start(self):
@@ -280,7 +317,7 @@ class Server:
     async def save(self):
         try:
             if self._new:
-                self.db_entry = objects.create(ServerModel, **self.serialize())
+                self.db_entry = await objects.create(ServerModel, **self.serialize())
                 self._new = False
             else:
                 self.db_entry.update_model_instance(self.db_entry, self.serialize())
@@ -28,6 +28,7 @@ from typing import TYPE_CHECKING, Optional
 import discord
 
 from .database import ServerModel, MemberModel, ChannelModel, objects
+from .enums import ServerStates
 from .server import Server
 
 if TYPE_CHECKING:
@@ -45,21 +46,17 @@ class ServerManager:
         return self.servers.get(guild_id)
 
     async def add_server(self, guild: discord.Guild):
-        tasks = []
         server = Server.new(self, guild)
-        await server.save()
-        tasks.append(server.channels.setup())
-        tasks.append(server.members.setup())
-        await asyncio.gather(*tasks)
-        #  await server.stadium.setup()
         self.servers[guild.id] = server
-        server.start()
+        await server.setup()
         return server
 
     async def manage_servers(self):
         cont = True
         while cont:
-            for server in self.servers.values():
+            for server in list(self.servers.values()):
+                if not server.ready:
+                    continue
                 tasks = [
                     server.members.manage_members(),
                     server.channels.manage_channels()
@@ -92,7 +89,10 @@ class ServerManager:
 
         logger.info(f'{len(self.bot.guilds)} Servers loaded in {time.time() - start_time} seconds')
         start_time = time.time()
-        await asyncio.gather(*tasks)
-        logger.info(f'Channels and Members loaded in {time.time() - start_time} seconds')
         # noinspection PyAsyncCall
         self.bot.loop.create_task(self.manage_servers())
+        await asyncio.gather(*tasks)
+        failed = [server.name for server in self.servers.values() if server.state == ServerStates.Failed]
+        if failed:
+            logger.warning(f'Servers failed to set up: {", ".join(failed)}')
+        logger.info(f'Channels and Members loaded in {time.time() - start_time} seconds')
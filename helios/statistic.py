@@ -53,6 +53,17 @@ class Stat:
     async def set_value(self, value: int):
         await StatisticModel.set_value(self._guild, self._member, self.name, value)
 
+    @staticmethod
+    async def increment_many(increments: list[tuple['Stat', int]]):
+        """Increment many member stats with one update per server."""
+        by_guild: dict[int, dict[tuple[int, str], int]] = {}
+        for stat, amount in increments:
+            amounts = by_guild.setdefault(stat._guild, {})
+            key = (stat._member, stat.name)
+            amounts[key] = amounts.get(key, 0) + amount
+        for guild_id, amounts in by_guild.items():
+            await StatisticModel.increment_many(guild_id, amounts)
+
     async def record_history(self):
         await StatisticHistoryModel.record(await self.model())
 
@@ -21,8 +21,14 @@
 #  SOFTWARE.
 
 import json
+import logging
 from os.path import exists
 
+logger = logging.getLogger('HeliosLogger.Config')
+
+# The values of helios.gambling.image.FrameFormat, kept here so loading the config stays free of image imports.
+FRAME_FORMATS = ('png', 'fast_png', 'palette_png', 'webp')
+
 
 class Config:
     def __init__(self) -> None:
@@ -40,6 +46,7 @@ class Config:
         self.db_password = '123'
         self.sentry_dsn = ''
         self.log_level = 'INFO'
+        self.frame_format = 'png'
 
     # Class Methods
     @classmethod
@@ -79,7 +86,8 @@ class Config:
             'db_username': self.db_username,
             'db_password': self.db_password,
             'sentry_dsn': self.sentry_dsn,
-            'log_level': self.log_level
+            'log_level': self.log_level,
+            'frame_format': self.frame_format
         }
         self._serialize(data)
 
@@ -90,6 +98,13 @@ class Config:
             return
         for key, value in data.items():
             self.__setattr__(key, value)
+        self._validate()
+
+    def _validate(self):
+        if self.frame_format not in FRAME_FORMATS:
+            logger.warning(f'Unknown frame_format {self.frame_format!r}, expected one of {", ".join(FRAME_FORMATS)}. '
+                           f'Falling back to png.')
+            self.frame_format = 'png'
 
     @property
     def file(self) -> str:
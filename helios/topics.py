@@ -19,9 +19,10 @@
 #  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 #  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 #  SOFTWARE.
+import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Awaitable, Callable, Optional
 
 import discord
 
@@ -40,6 +41,73 @@ def _get_archive_time():
     return datetime.now().astimezone() + timedelta(hours=24)
 
 
+async def bulk_add_role(role: discord.Role, members: list[discord.Member], *, reason: str = None, limit: int = 5,
+                        progress: Callable[[int, int], Awaitable] = None) -> int:
+    """
+    Add a role to many members with at most ``limit`` requests in flight.
+    :param role: The role to add
+    :param members: The members to give the role to
+    :param reason: The audit log reason
+    :param limit: The maximum number of concurrent requests
+    :param progress: Awaited with (done, total) every ten members and once finished
+    :return: The number of members that received the role
+    """
+    semaphore = asyncio.Semaphore(limit)
+    total = len(members)
+    done = 0
+    added = 0
+
+    async def add(member: discord.Member):
+        nonlocal done, added
+        async with semaphore:
+            try:
+                await member.add_roles(role, reason=reason)
+                added += 1
+            except (discord.Forbidden, discord.HTTPException, discord.NotFound):
+                logger.warning(f'Failed to add role {role.name} to {member}')
+            done += 1
+            if progress and (done % 10 == 0 or done == total):
+                await progress(done, total)
+
+    await asyncio.gather(*(add(member) for member in members))
+    return added
+
+
+class TopicSubscriptions:
+    def __init__(self, server: 'Server'):
+        """An in memory index of topic subscriptions, keyed by topic channel id and member id."""
+        self.server = server
+        self.topics: dict[int, set[int]] = {}
+        self.members: dict[int, set[int]] = {}
+
+    async def load(self):
+        self.topics.clear()
+        self.members.clear()
+        for topic_id, member_id in await TopicSubscriptionModel.get_all_by_server(self.server.db_entry):
+            self.add(topic_id, member_id)
+
+    def add(self, topic_id: int, member_id: int):
+        self.topics.setdefault(topic_id, set()).add(member_id)
+        self.members.setdefault(member_id, set()).add(topic_id)
+
+    def remove(self, topic_id: int, member_id: int):
+        self.topics.get(topic_id, set()).discard(member_id)
+        self.members.get(member_id, set()).discard(topic_id)
+
+    def remove_topic(self, topic_id: int):
+        for member_id in self.topics.pop(topic_id, set()):
+            self.members.get(member_id, set()).discard(topic_id)
+
+    def is_subscribed(self, topic_id: int, member_id: int) -> bool:
+        return member_id in self.topics.get(topic_id, ())
+
+    def get_members(self, topic_id: int) -> set[int]:
+        return self.topics.get(topic_id, set())
+
+    def get_topics(self, member_id: int) -> set[int]:
+        return self.members.get(member_id, set())
+
+
 class TopicChannel:
     def __init__(self, server: 'Server', channel: discord.TextChannel):
         self.server = server
@@ -75,6 +143,10 @@ class TopicChannel:
     def bot(self):
         return self.server.bot
 
+    @property
+    def subscriptions(self) -> TopicSubscriptions:
+        return self.server.channels.subscriptions
+
     @property
     def oldest_allowed(self) -> datetime:
         """
@@ -180,6 +252,7 @@ class TopicChannel:
         except (discord.Forbidden, discord.HTTPException, discord.NotFound):
             pass
         finally:
+            self.subscriptions.remove_topic(self.id)
             await self.db_entry.async_delete()
 
     async def get_last_week_authors_value(self) -> dict[int, int]:
@@ -254,8 +327,13 @@ class TopicChannel:
             description='Rebuilding role for topic...'
         )
         message = await self.channel.send(embed=embed)
+
+        async def progress(done: int, total: int):
+            embed.description = f'Rebuilding role for topic... {done}/{total}'
+            await message.edit(embed=embed)
+
         async with message.channel.typing():
-            await self.create_role()
+            await self.create_role(progress=progress)
             await message.delete()
         if ping_role:
             role = self.get_role()
@@ -292,33 +370,35 @@ class TopicChannel:
         """
         role = self.get_role()
         if role is None:
-            return await TopicSubscriptionModel.get(member.db_entry, self.db_entry) is not None
+            return self.subscriptions.is_subscribed(self.id, member.member.id)
         return role in member.member.roles
 
     async def subscribe(self, member: 'HeliosMember'):
-        existing = await TopicSubscriptionModel.get(member.db_entry, self.db_entry)
-        if not existing:
+        if not self.subscriptions.is_subscribed(self.id, member.member.id):
             await TopicSubscriptionModel.create(member.db_entry, self.db_entry)
+            self.subscriptions.add(self.id, member.member.id)
         role = self.get_role()
         if role:
             await member.member.add_roles(role, reason='Subscribed to topic')
 
     async def unsubscribe(self, member: 'HeliosMember'):
-        existing = await TopicSubscriptionModel.get(member.db_entry, self.db_entry)
-        if existing:
-            await existing.async_delete()
+        if self.subscriptions.is_subscribed(self.id, member.member.id):
+            existing = await TopicSubscriptionModel.get(member.db_entry, self.db_entry)
+            if existing:
+                await existing.async_delete()
+            self.subscriptions.remove(self.id, member.member.id)
         role = self.get_role()
         if role:
             await member.member.remove_roles(role, reason='Unsubscribed from topic')
 
-    async def get_subscribers(self):
-        entries = await TopicSubscriptionModel.get_all_by_topic(self.db_entry)
-        return [await self.server.members.fetch(entry.member.member_id) for entry in entries]
+    def get_subscribers(self) -> list['HeliosMember']:
+        members = (self.server.members.get(member_id) for member_id in self.subscriptions.get_members(self.id))
+        return [member for member in members if member is not None]
 
-    async def create_role(self):
+    async def create_role(self, *, progress: Callable[[int, int], Awaitable] = None):
         role = await self.channel.guild.create_role(name=self.role_name, mentionable=True)
-        for member in await self.get_subscribers():
-            await member.member.add_roles(role, reason='Role created for topic')
+        members = [member.member for member in self.get_subscribers()]
+        await bulk_add_role(role, members, reason='Role created for topic', progress=progress)
         return role
 
     def get_role(self):
@@ -21,6 +21,7 @@
 #  SOFTWARE.
 
 import asyncio
+import time
 from typing import Awaitable, Callable, TypeVar, Any
 
 
@@ -33,3 +34,45 @@ def schedule_task(seconds: int, coro: Callable[[Any], Awaitable[T]], *args, **kw
         return await coro(*args, **kwargs)
 
     return asyncio.get_event_loop().create_task(task())
+
+
+async def run_phases(phases: dict[str, tuple[Callable[[], Awaitable], tuple[str, ...]]]) -> dict[str, float]:
+    """
+    Run named phases concurrently, starting each one as soon as the phases it depends on have finished.
+    :param phases: A mapping of phase name to a tuple of (coroutine function, names of the phases it depends on)
+    :return: How long each phase took to run, in seconds
+    :raises ValueError: When a phase depends on a phase that does not exist or the dependencies form a cycle
+    """
+    for name, (_, deps) in phases.items():
+        missing = [dep for dep in deps if dep not in phases]
+        if missing:
+            raise ValueError(f'Phase {name} depends on unknown phases: {", ".join(missing)}')
+    remaining = {name: set(deps) for name, (_, deps) in phases.items()}
+    while remaining:
+        ready = [name for name, deps in remaining.items() if not deps & remaining.keys()]
+        if not ready:
+            raise ValueError(f'Phases have a dependency cycle: {", ".join(remaining)}')
+        for name in ready:
+            del remaining[name]
+
+    timings: dict[str, float] = {}
+    tasks: dict[str, asyncio.Task] = {}
+
+    async def run(name: str, func: Callable[[], Awaitable], deps: tuple[str, ...]):
+        if deps:
+            await asyncio.gather(*(tasks[dep] for dep in deps))
+        start = time.perf_counter()
+        await func()
+        timings[name] = time.perf_counter() - start
+
+    for name, (func, deps) in phases.items():
+        tasks[name] = asyncio.create_task(run(name, func, deps), name=f'Phase: {name}')
+    try:
+        await asyncio.gather(*tasks.values())
+    except BaseException:
+        # Stop the phases still running rather than leaving them behind the failure.
+        for task in tasks.values():
+            task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+        raise
+    return timings
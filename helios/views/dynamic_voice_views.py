@@ -269,14 +269,8 @@ class SplitPrepView(ui.View):
         self.voice = voice
 
     def get_members_in_game(self, game: str) -> list[discord.Member]:
-        mems = []
-        for member in self.voice.channel.members:
-            h_member = self.voice.server.members.get(member.id)
-            activity = h_member.get_game_activity()
-            activity = activity.name if activity else None
-            if h_member and activity == game:
-                mems.append(member)
-        return mems
+        players = self.voice.server.presences.get_players(game)
+        return [member for member in self.voice.channel.members if member.id in players]
 
     @ui.button(label='Split By:', style=ButtonStyle.gray, disabled=True)
     async def split_by(self, interaction: Interaction, button: ui.Button):
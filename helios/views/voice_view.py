@@ -335,14 +335,8 @@ class AddSelector(discord.ui.View):
         self.user_select.min_values = min_value
 
     def get_members_in_game(self, game: str) -> list[discord.Member]:
-        mems = []
-        for member in self.channel.members:
-            h_member = self.server.members.get(member.id)
-            activity = h_member.get_game_activity()
-            activity = activity.name if activity else None
-            if h_member and activity == game:
-                mems.append(member)
-        return mems
+        players = self.server.presences.get_players(game)
+        return [member for member in self.channel.members if member.id in players]
 
     @discord.ui.select(cls=discord.ui.UserSelect, placeholder='Select a user')
     async def user_select(self, interaction: discord.Interaction, select: discord.ui.UserSelect):
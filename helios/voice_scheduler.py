@@ -20,9 +20,9 @@
 #  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 #  SOFTWARE.
 import asyncio
+import bisect
 from datetime import datetime, timedelta
-from typing import TYPE_CHECKING
-from discord.ext.tasks import loop
+from typing import TYPE_CHECKING, Optional
 
 if TYPE_CHECKING:
     from .server import Server
@@ -33,11 +33,28 @@ class TimeSlot:
         self.type = type
         self.data = data
         self.schedule = schedule
-        self.start = start
-        self.end = end
+        self._start = start
+        self._end = end
 
         self.ran = False
 
+    @property
+    def start(self) -> datetime:
+        return self._start
+
+    @start.setter
+    def start(self, value: datetime):
+        self._start = value
+        self.schedule.slot_changed(self, resort=True)
+
+    @property
+    def end(self) -> datetime:
+        return self._end
+
+    @end.setter
+    def end(self, value: datetime):
+        self._end = value
+        self.schedule.slot_changed(self)
 
     def key(self):
         return str(self.start) + str(self.end)
@@ -46,20 +63,37 @@ class TimeSlot:
         return hash(self.key())
 
 
+def _slot_start(slot: TimeSlot) -> datetime:
+    return slot.start
+
+
 class Schedule:
+    # Upper bound on a single sleep so a wall clock change can not leave the schedule asleep for too long.
+    MAX_SLEEP = 300
+
     def __init__(self):
-        self.now = datetime.now().astimezone()
+        """
+        Slots never overlap and are kept sorted by start, so point and range conflict checks are a bisect and only
+        the first slot can be due. The runner sleeps until that slot's next boundary or until the schedule changes.
+        """
         self.schedule: list['TimeSlot'] = []
 
         self._schedule_handlers = {}
+        self._task: Optional[asyncio.Task] = None
+        self._wake = asyncio.Event()
 
-        self._last_check = self.now
+    @property
+    def now(self) -> datetime:
+        return datetime.now().astimezone()
 
     def start(self):
-        self.check.start()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
 
     def stop(self):
-        self.check.cancel()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
 
     def handle(self, type: str):
         def decorator(func):
@@ -77,39 +111,50 @@ class Schedule:
         if type in self._schedule_handlers:
             self._schedule_handlers[type].remove(func)
 
+    def slot_changed(self, slot: TimeSlot, resort=False):
+        if resort:
+            self.schedule.sort(key=_slot_start)
+        self._wake.set()
+
     def extend_time(self, slot: TimeSlot, seconds: int):
-        new_end = slot.end + timedelta(seconds=seconds)
-        if self.is_conflicting_time(new_end):
-            return False
-        slot.end = new_end
-        return True
+        return self.set_end_time(slot, slot.end + timedelta(seconds=seconds))
 
     def set_end_time(self, slot: TimeSlot, end: datetime):
-        if self.is_conflicting_time(end):
+        if self.get_overlapping_slot(slot.start, end, ignore=slot) is not None:
             return False
         slot.end = end
         return True
 
     def current_slot(self):
-        for slot in self.schedule:
-            if slot.start <= self.now <= slot.end:
-                return slot
-        return None
+        return self.get_conflicting_slot(self.now)
 
     def is_conflicting_time(self, dt: datetime):
         return self.get_conflicting_slot(dt) is not None
 
-    def get_conflicting_slot(self, dt: datetime):
-        for slot in self.schedule:
-            if slot.start <= dt <= slot.end:
-                return slot
+    def get_conflicting_slot(self, dt: datetime) -> Optional[TimeSlot]:
+        return self.get_overlapping_slot(dt, dt)
+
+    def get_overlapping_slot(self, start: datetime, end: datetime, *, ignore: TimeSlot = None) -> Optional[TimeSlot]:
+        """A slot sharing any time with start to end. As slots are sorted and disjoint only the last slot starting
+        at or before end can reach back to start."""
+        i = bisect.bisect_right(self.schedule, end, key=_slot_start) - 1
+        if i >= 0 and self.schedule[i] is ignore:
+            i -= 1
+        if i >= 0 and self.schedule[i].end >= start:
+            return self.schedule[i]
         return None
 
+    def next_slot(self, dt: datetime) -> Optional[TimeSlot]:
+        """The first slot starting after dt."""
+        i = bisect.bisect_right(self.schedule, dt, key=_slot_start)
+        return self.schedule[i] if i < len(self.schedule) else None
+
     def create_slot(self, start: datetime, end: datetime, type: str, data: dict):
-        slot = TimeSlot(start, end, self, type, data)
-        if self.is_conflicting_time(slot.start) or self.is_conflicting_time(slot.end):
+        if self.get_overlapping_slot(start, end) is not None:
             return None
-        self.schedule.append(slot)
+        slot = TimeSlot(start, end, self, type, data)
+        bisect.insort(self.schedule, slot, key=_slot_start)
+        self._wake.set()
         return slot
 
     def create_now_slot(self, seconds: int, type: str, data: dict, allow_dynamic_end=False, minimum_seconds=0):
@@ -117,42 +162,55 @@ class Schedule:
         if self.is_conflicting_time(start):
             return None
 
-        # Decrease time until it is no longer conflicting.
+        # End just before the next slot when it starts too soon.
         if allow_dynamic_end:
-            conflicting_slot = self.get_conflicting_slot(start + timedelta(seconds=seconds))
-            while conflicting_slot and seconds >= minimum_seconds:
-                seconds = int((conflicting_slot.start - start).total_seconds()) - 1
-                conflicting_slot = self.get_conflicting_slot(start + timedelta(seconds=seconds))
+            next_slot = self.next_slot(start)
+            if next_slot and next_slot.start <= start + timedelta(seconds=seconds):
+                seconds = int((next_slot.start - start).total_seconds()) - 1
 
         if seconds < minimum_seconds:
             return None
 
         end = start + timedelta(seconds=seconds)
-        if self.is_conflicting_time(end):
-            return None
         return self.create_slot(start, end, type, data)
 
-    @loop(seconds=1)
-    async def check(self):
-        self.now = datetime.now().astimezone()
-        to_remove = []
-        for slot in self.schedule:
-            if slot.end <= self.now:
-                to_remove.append(slot)
+    def next_boundary(self) -> Optional[datetime]:
+        if not self.schedule:
+            return None
+        slot = self.schedule[0]
+        return slot.end if slot.ran else slot.start
+
+    def _dispatch(self, type: str, slot: TimeSlot):
+        for handler in self._schedule_handlers.get(type, []):
+            try:
+                asyncio.create_task(handler(slot))
+            except (ValueError, AttributeError):
+                pass
+
+    def check(self):
+        """Run the handlers for every slot boundary that has passed."""
+        now = self.now
+        while self.schedule:
+            slot = self.schedule[0]
+            if slot.end <= now:
+                self.schedule.pop(0)
                 if slot.ran:
-                    for handler in self._schedule_handlers.get(slot.type + '_end', []):
-                        try:
-                            asyncio.create_task(handler(slot))
-                        except (ValueError, AttributeError):
-                            pass
-            elif slot.start <= self.now and slot.ran is False:
+                    self._dispatch(slot.type + '_end', slot)
+                continue
+            if slot.start <= now and slot.ran is False:
                 slot.ran = True
-                for handler in self._schedule_handlers.get(slot.type, []):
-                    try:
-                        asyncio.create_task(handler(slot))
-                    except (ValueError, AttributeError):
-                        pass
-
-
-        for slot in to_remove:
-            self.schedule.remove(slot)
\ No newline at end of file
+                self._dispatch(slot.type, slot)
+            break
+
+    async def _run(self):
+        while True:
+            self._wake.clear()
+            self.check()
+            boundary = self.next_boundary()
+            timeout = self.MAX_SLEEP
+            if boundary is not None:
+                timeout = min(timeout, max(0.0, (boundary - self.now).total_seconds()))
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1,72 @@
+#  MIT License
+#
+#  Copyright (c) 2024 Riley Winkler
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+
+import unittest
+
+from helios.gambling.cards import Card, Hand, Suits, Values
+from helios.gambling.rules import hand_payout
+from helios.gambling.simulator import RuleSet, basic_action, simulate
+
+
+def make_hand(*values: Values) -> Hand:
+    hand = Hand()
+    hand.add_cards([Card(Suits.spades, value) for value in values])
+    return hand
+
+
+class RulesTestCase(unittest.TestCase):
+    def test_hand_payout(self):
+        dealer = make_hand(Values.ten, Values.seven)
+        self.assertEqual(hand_payout(make_hand(Values.ace, Values.king), dealer, 100), 250)
+        self.assertEqual(hand_payout(make_hand(Values.ten, Values.eight), dealer, 100), 200)
+        self.assertEqual(hand_payout(make_hand(Values.ten, Values.seven), dealer, 100), 100)
+        self.assertEqual(hand_payout(make_hand(Values.ten, Values.six), dealer, 100), 0)
+        self.assertEqual(hand_payout(make_hand(Values.ace, Values.king), make_hand(Values.ace, Values.queen), 100), 100)
+
+    def test_basic_action(self):
+        self.assertEqual(basic_action(make_hand(Values.eight, Values.eight), 10, True, True), 'split')
+        self.assertEqual(basic_action(make_hand(Values.six, Values.five), 10, True, True), 'double')
+        self.assertEqual(basic_action(make_hand(Values.ten, Values.six), 6, True, True), 'stand')
+        self.assertEqual(basic_action(make_hand(Values.ten, Values.six), 10, True, True), 'hit')
+        self.assertEqual(basic_action(make_hand(Values.ace, Values.seven), 9, True, True), 'hit')
+
+
+class SimulatorTestCase(unittest.TestCase):
+    def test_seeded_and_split_across_workers(self):
+        single = simulate(4_000, seed=7, workers=1)
+        self.assertEqual(single, simulate(4_000, seed=7, workers=1))
+        multi = simulate(4_000, seed=7, workers=2)
+        self.assertEqual(multi['hands'], 4_000)
+        self.assertLess(abs(single['house_edge']), 0.2)
+
+    def test_powerups_favor_player(self):
+        rules = RuleSet(decks=2)
+        base = simulate(20_000, rules=rules, seed=3, workers=1)
+        for powerup in ('surrender', 'perfect_card', 'force_bust'):
+            with self.subTest(powerup=powerup):
+                self.assertGreater(simulate(20_000, rules=rules, powerup=powerup, seed=3, workers=1)['inflation'],
+                                   base['inflation'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+#  MIT License
+#
+#  Copyright (c) 2024 Riley Winkler
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+
+import random
+import unittest
+from collections import Counter
+
+from helios.gambling.cards import Card, Deck, Hand, Shoe, Suits, Values
+
+
+class CardTestCase(unittest.TestCase):
+    def test_round_trip(self):
+        for suit in Suits:
+            for value in Values:
+                card = Card(suit, value)
+                self.assertEqual((card.suit, card.value), (suit, value))
+                self.assertEqual(Card.from_str(card.short()), card)
+                self.assertEqual(Card.from_int(int(card)), card)
+
+    def test_hand_totals(self):
+        random.seed(3)
+        deck = Shoe(2)
+        deck.shuffle()
+        for _ in range(200):
+            hand = Hand()
+            for _ in range(random.randint(2, 6)):
+                deck.draw_to_hand(hand, hidden=random.random() < 0.2)
+                if not deck:
+                    deck.reset()
+                    deck.shuffle()
+            if random.random() < 0.3:
+                hand.pop()
+            for show_hidden in (True, False):
+                cards = [c for c in hand.cards if show_hidden or not c.hidden]
+                value = sum(c.bj_value() for c in cards)
+                if any(c.bj_value() == 1 for c in cards) and value <= 11:
+                    value += 10
+                self.assertEqual(hand.get_hand_bj_values(show_hidden), value)
+            self.assertEqual(Hand.from_ints(hand.to_ints()).to_dict(), hand.to_dict())
+
+
+class ShoeTestCase(unittest.TestCase):
+    def test_draws_keep_buckets(self):
+        random.seed(5)
+        shoe = Shoe(6, penetration=0.75)
+        shoe.shuffle()
+        self.assertEqual(len(shoe), 312)
+        self.assertEqual(shoe.cut, 78)
+        drawn = Counter()
+        while not shoe.needs_shuffle:
+            if random.random() < 0.5:
+                card = shoe.draw_filter(lambda c: c.bj_value() == random.randint(1, 10))
+            else:
+                card = shoe.draw()
+            if card:
+                drawn[card.code] += 1
+            for rank, bucket in enumerate(shoe._buckets):
+                self.assertTrue(all(shoe._cards[pos].code >> 2 == rank for pos in bucket))
+        self.assertEqual(sum(len(b) for b in shoe._buckets), len(shoe))
+        remaining = Counter(shoe.to_ints())
+        self.assertTrue(all(drawn[code] + remaining[code] == 6 for code in range(52)))
+
+    def test_filter_keeps_order(self):
+        random.seed(7)
+        shoe = Shoe(1)
+        self.assertNotEqual(shoe.to_ints(), Deck().to_ints())
+        before = shoe.to_ints()
+        taken = [shoe.draw_filter(lambda c: c.bj_value() == value).code for value in (10, 1, 5)]
+        for code in taken:
+            before.remove(code)
+        self.assertEqual(shoe.to_ints(), before)
+        self.assertEqual((shoe.peek().code, shoe.peek(2).code), (before[-1], before[-3]))
+        self.assertEqual(shoe.draw().code, before[-1])
+        self.assertEqual(len(shoe), len(before) - 1)
+
+    def test_filter_miss(self):
+        deck = Deck.from_ints([0, 1, 2])
+        self.assertIsNone(deck.draw_filter(lambda c: c.bj_value() == 10))
+        self.assertEqual(deck.draw_filter(lambda c: c.bj_value() == 2).bj_value(), 2)
+        self.assertEqual(len(deck), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Riley Winkler
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+import unittest
+from types import SimpleNamespace
+
+from helios.channel_sorter import get_position_changes
+
+
+def make_channels(*positions):
+    return [SimpleNamespace(id=i, position=p) for i, p in enumerate(positions)]
+
+
+class PositionChangesTestCase(unittest.TestCase):
+    def test_already_sorted(self):
+        channels = make_channels(0, 1, 2)
+        self.assertEqual(get_position_changes(channels, channels[:2]), [])
+
+    def test_minimal_moves(self):
+        a, b, c, d = make_channels(4, 5, 6, 7)
+        changes = get_position_changes([a, b, c, d], [a, c, b])
+        self.assertEqual(changes, [{'id': c.id, 'position': 5}, {'id': b.id, 'position': 6}])
+
+    def test_unmanaged_channels_pushed_down(self):
+        a, b, c = make_channels(0, 1, 2)
+        changes = get_position_changes([a, b, c], [c])
+        self.assertEqual(changes, [{'id': c.id, 'position': 0}, {'id': a.id, 'position': 1},
+                                   {'id': b.id, 'position': 2}])
+
+    def test_duplicate_positions(self):
+        a, b = make_channels(3, 3)
+        self.assertEqual(get_position_changes([a, b], [a, b]), [{'id': b.id, 'position': 4}])
+
+    def test_ignores_channels_outside_category(self):
+        a, b, c = make_channels(0, 1, 9)
+        self.assertEqual(get_position_changes([a, b], [c, b, a]), [{'id': b.id, 'position': 0},
+                                                                    {'id': a.id, 'position': 1}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -24,6 +24,7 @@ import unittest
 import os
 from os.path import exists
 from helios.tools import Config
+from helios.tools.config import FRAME_FORMATS
 
 
 class ConfigTestCase(unittest.TestCase):
@@ -61,6 +62,21 @@ class ConfigTestCase(unittest.TestCase):
         finally:
             os.remove(ConfigTestCase.testing_file_path)
 
+    def test_invalid_frame_format(self):
+        try:
+            c = Config.from_file_path(ConfigTestCase.testing_file_path)
+            c.frame_format = 'gif'
+            c.save()
+            with self.assertLogs('HeliosLogger.Config', 'WARNING'):
+                c2 = Config.from_file_path(ConfigTestCase.testing_file_path)
+            self.assertEqual(c2.frame_format, 'png')
+        finally:
+            os.remove(ConfigTestCase.testing_file_path)
+
+    def test_frame_formats_match(self):
+        from helios.gambling.image import FrameFormat
+        self.assertEqual(set(FRAME_FORMATS), {f.value for f in FrameFormat})
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,122 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Riley Winkler
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+import io
+import os
+import random
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image, ImageChops
+
+from helios.gambling.cards import Deck, Hand
+from helios.gambling import image
+from helios.gambling.image import BlackjackHandImage, BlackjackImage, FrameFormat, encode_frame
+
+
+def make_table(players: int) -> Image.Image:
+    random.seed(players)
+    deck = Deck()
+    deck.shuffle()
+    icon = Image.new('RGBA', (64, 64), 'royalblue')
+    hands = []
+    for i in range(players):
+        hand = Hand()
+        for _ in range(random.randint(2, 4)):
+            deck.draw_to_hand(hand)
+        hands.append(BlackjackHandImage(hand, icon, f'Player {i}', 1_000))
+    dealer = Hand()
+    deck.draw_to_hand(dealer)
+    deck.draw_to_hand(dealer, hidden=True)
+    return BlackjackImage(BlackjackHandImage(dealer, icon, 'Dealer', 0), hands, id=1).get_image('Waiting For Player', 12)
+
+
+class FrameEncodingTestCase(unittest.TestCase):
+    table_sizes = (1, 4, 7)
+
+    def test_sprites_loaded_whole(self):
+        image._card_sprites = {}
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            sizes = list(pool.map(lambda _: len(image.load_card_sprites()), range(8)))
+        self.assertEqual(set(sizes), {len(list(image.CARDS_PATH.glob('*.png')))})
+
+    def test_formats_decode(self):
+        img = make_table(2)
+        for frame_format in FrameFormat:
+            with self.subTest(frame_format=frame_format):
+                decoded = Image.open(io.BytesIO(encode_frame(img, frame_format)))
+                self.assertEqual(decoded.size, img.size)
+                self.assertEqual(decoded.format.lower(), frame_format.extension)
+
+    @unittest.skipUnless(os.environ.get('HELIOS_BENCH'), 'set HELIOS_BENCH=1 to run benchmarks')
+    def test_benchmark(self):
+        """Report encode time and bytes per frame for each format, run with -s to see the table."""
+        print(f'\n{"format":<12} {"players":>7} {"ms/frame":>9} {"KiB/frame":>10}')
+        for players in self.table_sizes:
+            img = make_table(players)
+            for frame_format in FrameFormat:
+                start = time.perf_counter()
+                data = encode_frame(img, frame_format)
+                elapsed = (time.perf_counter() - start) * 1000
+                print(f'{frame_format.value:<12} {players:>7} {elapsed:>9.1f} {len(data) / 1024:>10.1f}')
+                self.assertGreater(len(data), 0)
+
+
+class LayeredTableTestCase(unittest.TestCase):
+    def test_incremental_matches_full(self):
+        random.seed(0)
+        deck = Deck()
+        deck.shuffle()
+        icon = Image.new('RGBA', (64, 64), 'royalblue')
+        hands = [Hand() for _ in range(5)]
+        for hand in hands:
+            deck.draw_to_hand(hand)
+            deck.draw_to_hand(hand)
+        dealer = Hand()
+        deck.draw_to_hand(dealer)
+        deck.draw_to_hand(dealer, hidden=True)
+
+        def new_table(current=0, winnings=None):
+            return BlackjackImage(BlackjackHandImage(dealer, icon, 'Dealer', 0),
+                                  [BlackjackHandImage(h, icon, f'Player {i}', 1_000) for i, h in enumerate(hands)],
+                                  current, id=3, winnings=winnings)
+
+        table = new_table()
+        frames = [('Waiting For Player', 30, 0, []), ('Waiting For Player', 29, 0, []),
+                  ('hit', 28, 0, []), ('Waiting For Player', 30, 1, []),
+                  ('reveal', 0, -1, []), ('Game Over', 0, -1, [[0], [1_000], [2_000], [0], [2_000]])]
+        for status, timer, current, winnings in frames:
+            if status == 'hit':
+                deck.draw_to_hand(hands[0])
+            elif status == 'reveal':
+                dealer.cards[1].hidden = False
+                deck.draw_to_hand(dealer)
+            table.current_hand = current
+            table.winnings = winnings
+            with self.subTest(status=status, timer=timer):
+                expected = new_table(current, winnings).get_image(status, timer)
+                self.assertIsNone(ImageChops.difference(table.get_image(status, timer), expected).getbbox())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,200 @@
+#  MIT License
+#
+#  Copyright (c) 2024 Riley Winkler
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import discord
+import peewee
+
+from helios.game import GameCatalog, GameManager, Game, GameModel
+from helios.presence import PresenceIndex
+
+
+class FakeEntry(SimpleNamespace):
+    def __init__(self, name, aliases=(), id=None):
+        super().__init__(id=id, name=name, display_name=name, icon='', play_time=0, last_day_playtime=0,
+                         last_played=None, aliases=[SimpleNamespace(alias=a) for a in aliases])
+
+
+async def ready():
+    ...
+
+
+class GameCatalogTestCase(unittest.TestCase):
+    def setUp(self):
+        self.catalog = GameCatalog(SimpleNamespace(wait_until_ready=ready))
+        self.created = []
+        self.rows = {'Minecraft': FakeEntry('Minecraft', ['Minecraft Launcher'], id=1)}
+
+    async def fake_create(self, name, display_name, icon):
+        self.created.append(name)
+        if len(name) > 52:
+            raise peewee.DataError('Data too long')
+        return FakeEntry(name)
+
+    async def fake_find(self, name):
+        for entry in self.rows.values():
+            if name == entry.name or name in [a.alias for a in entry.aliases]:
+                return entry
+        return None
+
+    def run_catalog(self, coro):
+        async def get_all():
+            return [self.rows['Minecraft']]
+
+        with mock.patch.object(GameModel, 'get_all', get_all), \
+                mock.patch.object(GameModel, 'find_game', self.fake_find), \
+                mock.patch.object(GameModel, 'create_game', self.fake_create):
+            return asyncio.run(coro)
+
+    def test_aliases_from_memory(self):
+        async def run():
+            return await self.catalog.get_game('Minecraft Launcher'), await self.catalog.get_game('Other', create_new=False)
+
+        game, missing = self.run_catalog(run())
+        self.assertEqual(game.name, 'Minecraft')
+        self.assertIsNone(missing)
+        self.assertEqual(self.created, [])
+
+    def test_new_games_written_through(self):
+        async def run():
+            return await asyncio.gather(*(self.catalog.get_game('Terraria') for _ in range(3)))
+
+        games = self.run_catalog(run())
+        self.assertEqual(self.created, ['Terraria'])
+        self.assertIs(self.catalog.get_from_cache('Terraria'), games[0])
+        self.assertEqual(len(set(map(id, games))), 1)
+
+    def test_alias_added_elsewhere(self):
+        async def run():
+            await self.catalog.load()
+            self.rows['Minecraft'].aliases.append(SimpleNamespace(alias='MC'))
+            return await self.catalog.get_game('MC')
+
+        game = self.run_catalog(run())
+        self.assertEqual(self.created, [])
+        self.assertIs(game, self.catalog.games['Minecraft'])
+        self.assertIs(self.catalog.alias_to_game['MC'], game)
+
+    def test_unstorable_names_cached(self):
+        name = 'x' * 60
+
+        async def run():
+            return [await self.catalog.get_game(name) for _ in range(3)]
+
+        self.assertEqual(self.run_catalog(run()), [None] * 3)
+        self.assertEqual(self.created, [name])
+        self.assertIn(name, self.catalog.not_games)
+
+    def test_transient_errors_retried(self):
+        failures = [peewee.OperationalError('Lost connection to MySQL server')]
+
+        async def flaky_find(name):
+            if failures:
+                raise failures.pop()
+            return await self.fake_find(name)
+
+        async def run():
+            with mock.patch.object(GameModel, 'find_game', flaky_find):
+                return await self.catalog.get_game('Terraria'), await self.catalog.get_game('Terraria')
+
+        first, second = self.run_catalog(run())
+        self.assertIsNone(first)
+        self.assertEqual(second.name, 'Terraria')
+        self.assertNotIn('Terraria', self.catalog.not_games)
+
+    def test_day_playtime_kept_in_cache(self):
+        game = Game('Minecraft', play_time=30, last_day_playtime=10)
+        self.catalog.add_game(game)
+
+        async def set_day_playtime():
+            ...
+
+        with mock.patch.object(GameModel, 'set_day_playtime', set_day_playtime):
+            asyncio.run(self.catalog.set_day_playtime.coro(self.catalog))
+        self.assertIs(self.catalog.get_from_cache('Minecraft'), game)
+        self.assertEqual(game.last_day_playtime, 30)
+
+    def test_merge_moves_pending_playtime(self):
+        merges = []
+        minecraft, launcher = Game('Minecraft', play_time=10), Game('Launcher', play_time=4, alias=['MCL'])
+        minecraft.db_entry, launcher.db_entry = SimpleNamespace(id=1), SimpleNamespace(id=2)
+        for game in (minecraft, launcher):
+            self.catalog.add_game(game)
+
+        async def add_playtimes(playtimes):
+            merges.append(playtimes)
+
+        async def merge_game(alias, game):
+            merges.append((alias.id, game.id))
+            self.catalog.add_playtime(launcher, 1, discord.utils.utcnow())
+
+        with mock.patch.object(GameModel, 'add_playtimes', add_playtimes), \
+                mock.patch.object(GameModel, 'merge_game', merge_game):
+            self.catalog.add_playtime(launcher, 2, discord.utils.utcnow())
+            asyncio.run(self.catalog.add_game_alias_from_game(minecraft, launcher))
+        self.assertEqual(merges, [{2: 2}, (2, 1)])
+        self.assertEqual(self.catalog._pending_playtime, {minecraft: 1})
+        self.assertEqual(minecraft.play_time, 17)
+        self.assertEqual(sorted(self.catalog.alias_to_game), ['Launcher', 'MCL'])
+        self.assertNotIn('Launcher', self.catalog.games)
+
+
+class GameManagerTestCase(unittest.TestCase):
+    def test_playtime_flushed_together(self):
+        calls = []
+        catalog = GameCatalog(SimpleNamespace(wait_until_ready=ready))
+        minecraft, terraria = Game('Minecraft'), Game('Terraria')
+        minecraft.db_entry, terraria.db_entry = SimpleNamespace(id=1), SimpleNamespace(id=2)
+        for game in (minecraft, terraria):
+            catalog.add_game(game)
+        catalog.loaded = True
+        members = [SimpleNamespace(id=i, activities=(discord.Game(n),))
+                   for i, n in enumerate(('Minecraft', 'Minecraft', 'Terraria'))]
+        members.append(SimpleNamespace(id=3, activities=()))
+        servers = []
+        for _ in range(2):
+            server = SimpleNamespace(name='Test', bot=SimpleNamespace(games=catalog, wait_until_ready=ready),
+                                     guild=SimpleNamespace(members=members))
+            server.presences = PresenceIndex(server)
+            server.presences.rebuild()
+            servers.append(GameManager(server))
+
+        async def add_playtimes(playtimes):
+            calls.append(playtimes)
+            if len(calls) == 1:
+                raise peewee.OperationalError('Lost connection')
+
+        async def run():
+            for _ in range(2):
+                for manager in servers:
+                    await manager.manage_games.coro(manager)
+                await catalog.flush_loop.coro(catalog)
+
+        with mock.patch.object(GameModel, 'add_playtimes', add_playtimes):
+            asyncio.run(run())
+        self.assertEqual(calls, [{1: 4, 2: 2}, {1: 8, 2: 4}])
+        self.assertEqual((minecraft.play_time, terraria.play_time), (8, 4))
+        self.assertEqual(catalog._pending_playtime, {})
@@ -0,0 +1,55 @@
+#  MIT License
+#
+#  Copyright (c) 2024 Riley Winkler
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import discord
+
+from helios.enums import ServerStates
+from helios.helios_bot import HeliosBot
+
+
+class ServerReadyCheckTestCase(unittest.TestCase):
+    def check(self, server, *, ready_once=False) -> tuple[bool, str]:
+        bot = SimpleNamespace(servers={1: server} if server else {}, ready_once=ready_once)
+        interaction = SimpleNamespace(guild_id=1, type=discord.InteractionType.application_command,
+                                      response=SimpleNamespace(send_message=mock.AsyncMock()))
+        allowed = asyncio.run(HeliosBot.server_ready_check(bot, interaction))
+        message = interaction.response.send_message.call_args.args[0] if not allowed else ''
+        return allowed, message
+
+    def test_messages(self):
+        def server(state):
+            return SimpleNamespace(state=state, ready=state == ServerStates.Ready)
+
+        self.assertEqual(self.check(server(ServerStates.Ready)), (True, ''))
+        self.assertIn('starting up', self.check(server(ServerStates.Loading))[1])
+        self.assertIn('failed to set up', self.check(server(ServerStates.Failed))[1])
+        self.assertIn('not set up', self.check(None)[1])
+        self.assertIn('starting up', self.check(None, ready_once=True)[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+#  MIT License
+#
+#  Copyright (c) 2024 Riley Winkler
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+import asyncio
+import io
+import unittest
+from datetime import timedelta
+
+from PIL import Image
+
+from helios.gambling.image import IconCache
+
+
+class FakeResponse:
+    def __init__(self, data: bytes):
+        self.data = data
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        ...
+
+    def raise_for_status(self):
+        ...
+
+    async def read(self):
+        await asyncio.sleep(0.01)
+        return self.data
+
+
+class FakeSession:
+    def __init__(self):
+        self.requests = []
+        with io.BytesIO() as b:
+            Image.new('RGB', (128, 128), 'red').save(b, format='PNG')
+            self.data = b.getvalue()
+
+    def get(self, url: str):
+        self.requests.append(url)
+        return FakeResponse(self.data)
+
+
+class IconCacheTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_coalesces_and_caches(self):
+        cache = IconCache()
+        session = FakeSession()
+        icons = await asyncio.gather(*(cache.get(session, 'a') for _ in range(5)))
+        await cache.get(session, 'a')
+        self.assertEqual(session.requests, ['a'])
+        self.assertEqual(icons[0].size, (64, 64))
+        self.assertEqual(icons[0].mode, 'RGBA')
+        self.assertEqual(cache.misses, 1)
+
+    async def test_evicts_least_recently_used(self):
+        cache = IconCache(max_bytes=2 * 64 * 64 * 4)
+        session = FakeSession()
+        await cache.get(session, 'a')
+        await cache.get(session, 'b')
+        await cache.get(session, 'a')
+        await cache.get(session, 'c')
+        self.assertIsNotNone(cache.get_cached('a'))
+        self.assertIsNone(cache.get_cached('b'))
+        self.assertEqual(cache.bytes, 2 * 64 * 64 * 4)
+
+    async def test_expires(self):
+        cache = IconCache(ttl=timedelta(0))
+        session = FakeSession()
+        await cache.get(session, 'a')
+        await cache.get(session, 'a')
+        self.assertEqual(len(session.requests), 2)
+        self.assertEqual(len(cache), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
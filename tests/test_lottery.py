@@ -0,0 +1,101 @@
+#  MIT License
+#
+#  Copyright (c) 2024 Riley Winkler
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+import asyncio
+import math
+import os
+import random
+import time
+import unittest
+from datetime import datetime
+
+import numpy as np
+
+from helios.gambling.lottery import Lottery
+
+
+def make_lottery(pool: int = 100_000, numbers: int = 5, range_: int = 50) -> Lottery:
+    return Lottery(None, pool, 1, numbers, range_, datetime.now(), None, False, None)
+
+
+class LotteryTestCase(unittest.TestCase):
+    def test_calculate_winners(self):
+        lottery = make_lottery()
+        random.seed(0)
+        lottery.tickets = [(i, list(lottery.random_ticket())) for i in range(500)]
+        winning = lottery.random_ticket()
+        winners = asyncio.run(lottery.calculate_winners(winning))
+        for count, tickets in winners.items():
+            for _, numbers in tickets:
+                self.assertEqual(len(set(numbers) & set(winning)), count)
+        self.assertEqual(sum(len(v) for v in winners.values()), 500)
+
+    def test_random_draws_are_distinct(self):
+        lottery = make_lottery()
+        draws = lottery.random_draws(1_000, np.random.default_rng(0))
+        self.assertEqual(draws.shape, (1_000, 5))
+        self.assertTrue(all(len(set(row)) == 5 for row in draws.tolist()))
+        self.assertGreaterEqual(draws.min(), 1)
+        self.assertLessEqual(draws.max(), 50)
+
+    def test_simulation_matches_odds(self):
+        lottery = make_lottery()
+        draws = 500_000
+        result = lottery.simulate(draws, seed=1)
+        total = math.comb(50, 5)
+        for k in range(4):
+            expected = math.comb(5, k) * math.comb(45, 5 - k) / total
+            self.assertAlmostEqual(result['matches'][k] / draws, expected, delta=0.005)
+
+    def test_payout_table(self):
+        lottery = make_lottery(pool=1_000_000_007, numbers=6, range_=70)
+        table = lottery.payout_table
+        self.assertEqual(sum(table.chances), 1)
+        self.assertEqual(sum(table.ways), math.comb(70, 6))
+        self.assertEqual(lottery.winnings(6), lottery.pool)
+        self.assertEqual(lottery.winnings(5), lottery.pool // (6 * 64))
+        self.assertIs(lottery.payout_table, table)
+        lottery.pool += 1
+        self.assertIsNot(lottery.payout_table, table)
+
+    def test_house_edge(self):
+        lottery = make_lottery()
+        table = lottery.payout_table
+        expected = 1 - float(sum(chance * payout for chance, payout in zip(table.chances, table.payouts))) / 100
+        result = lottery.simulate(200_000, seed=2)
+        self.assertGreater(result['house_edge'], 0)
+        self.assertAlmostEqual(result['house_edge'], expected, delta=0.001)
+
+    @unittest.skipUnless(os.environ.get('HELIOS_BENCH'), 'set HELIOS_BENCH=1 to run benchmarks')
+    def test_benchmark(self):
+        """Report simulated draws per second, run with -s to see it."""
+        lottery = make_lottery()
+        draws = 2_000_000
+        start = time.perf_counter()
+        result = lottery.simulate(draws, seed=2)
+        elapsed = time.perf_counter() - start
+        print(f'\n{draws:,} draws in {elapsed:.2f}s ({draws / elapsed:,.0f}/s), '
+              f'house edge {result["house_edge"]:.2%}')
+
+
+if __name__ == '__main__':
+    unittest.main()
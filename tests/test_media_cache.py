@@ -0,0 +1,179 @@
+#  MIT License
+#
+#  Copyright (c) 2024 Riley Winkler
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+
+import asyncio
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from discord.utils import utcnow
+
+from helios.music import processor
+from helios.music.processor import MediaCache, ExtractorPool
+
+
+class MediaCacheTestCase(unittest.TestCase):
+    def test_stream_expiry(self):
+        expires = int((utcnow() + timedelta(hours=6)).timestamp())
+        query = f'https://rr1.googlevideo.com/videoplayback?expire={expires}&ei=abc'
+        path = f'https://manifest.googlevideo.com/api/manifest/hls_playlist/expire/{expires}/ei/abc/index.m3u8'
+        for url in (query, path):
+            self.assertEqual(MediaCache.stream_expiry(url), datetime.fromtimestamp(expires, tz=timezone.utc))
+        fallback = MediaCache.stream_expiry('https://example.com/audio.webm') - utcnow()
+        self.assertAlmostEqual(fallback.total_seconds(), MediaCache.STREAM_TTL.total_seconds(), delta=5)
+
+    def test_stream_lookups_shared(self):
+        calls = []
+        expires = int((utcnow() + timedelta(hours=6)).timestamp())
+
+        async def fake_get_info(url, **kwargs):
+            calls.append(url)
+            await asyncio.sleep(0.01)
+            return {'url': f'https://rr1.googlevideo.com/videoplayback?expire={expires}'}
+
+        async def run():
+            cache = MediaCache()
+            first = await asyncio.gather(*(cache.get_stream('song') for _ in range(5)))
+            second = await cache.get_stream('song')
+            return cache, first, second
+
+        with mock.patch.object(processor, 'get_info', fake_get_info):
+            cache, first, second = asyncio.run(run())
+        self.assertEqual(calls, ['song'])
+        self.assertEqual(len(set(first + [second])), 1)
+        self.assertEqual((cache.misses, cache.hits), (1, 1))
+
+    def test_expiring_stream_dropped(self):
+        cache = MediaCache()
+        soon = int((utcnow() + MediaCache.STREAM_MARGIN / 2).timestamp())
+        cache.add_stream('song', f'https://rr1.googlevideo.com/videoplayback?expire={soon}')
+        self.assertIsNone(cache.get_stream_cached('song'))
+
+    def test_trim(self):
+        info = {'title': 'Song', 'uploader': 'Someone', 'webpage_url': 'https://youtu.be/x', 'duration': 60,
+                'thumbnails': [{'url': 'small'}, {'url': 'large'}], 'formats': [{}] * 50}
+        self.assertEqual(MediaCache.trim(info), {'title': 'Song', 'uploader': 'Someone',
+                                                 'webpage_url': 'https://youtu.be/x', 'duration': 60,
+                                                 'thumbnails': [{'url': 'large'}]})
+
+
+class FakeYoutubeDL:
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.thread = threading.get_ident()
+        self.calls = []
+
+    def extract_info(self, url, download=False, process=True):
+        assert threading.get_ident() == self.thread
+        self.calls.append(url)
+        time.sleep(self.delay)
+        return {'url': url}
+
+
+class FakePool(ExtractorPool):
+    def __init__(self, delay: float, **kwargs):
+        super().__init__(**kwargs)
+        self.delay = delay
+        self.instances = []
+
+    def get_ytdl(self):
+        ytdl = getattr(self._local, 'ytdl', None)
+        if ytdl is None:
+            ytdl = self._local.ytdl = FakeYoutubeDL(self.delay)
+            self.instances.append(ytdl)
+        return ytdl
+
+
+class ExtractorPoolTestCase(unittest.TestCase):
+    def test_timeout_skips_queued(self):
+        pool = FakePool(0.2, workers=1)
+
+        async def run():
+            slow = asyncio.ensure_future(pool.extract('first'))
+            await asyncio.sleep(0.01)
+            queued = asyncio.ensure_future(pool.extract('second', timeout=0.05))
+            await asyncio.sleep(0.01)
+            depth = pool.queue_depth
+            with self.assertRaises(asyncio.TimeoutError):
+                await queued
+            self.assertEqual(await slow, {'url': 'first'})
+            await asyncio.sleep(0.05)
+            return depth
+
+        try:
+            depth = asyncio.run(run())
+        finally:
+            pool.shutdown()
+        self.assertEqual(depth, 1)
+        self.assertEqual(pool.instances[0].calls, ['first'])
+        self.assertEqual((pool.queued, pool.running, pool.timeouts), (0, 0, 1))
+
+    def test_instance_per_worker(self):
+        pool = FakePool(0.05, workers=3)
+
+        async def run():
+            return await asyncio.gather(*(pool.extract(str(i)) for i in range(6)))
+
+        try:
+            results = asyncio.run(run())
+        finally:
+            pool.shutdown()
+        self.assertEqual([r['url'] for r in results], [str(i) for i in range(6)])
+        self.assertEqual(len(pool.instances), 3)
+
+    def test_pinned_worker(self):
+        pool = FakePool(0.02, workers=3)
+
+        async def run():
+            worker = pool.pick_worker()
+            first = await pool.run(threading.get_ident, worker=worker)
+            others = await asyncio.gather(*(pool.extract(str(i)) for i in range(6)),
+                                          *(pool.run(threading.get_ident, worker=worker) for _ in range(3)))
+            return first, others[6:]
+
+        try:
+            first, pinned = asyncio.run(run())
+        finally:
+            pool.shutdown()
+        self.assertEqual(set(pinned), {first})
+        self.assertEqual(pool._load, [0, 0, 0])
+
+    def test_shutdown_clears_queue(self):
+        pool = FakePool(0.1, workers=1)
+
+        async def run():
+            tasks = [asyncio.ensure_future(pool.extract(str(i))) for i in range(3)]
+            await asyncio.sleep(0.02)
+            pool.shutdown()
+            return await asyncio.gather(*tasks, return_exceptions=True)
+
+        results = asyncio.run(run())
+        self.assertEqual(results[0], {'url': '0'})
+        self.assertTrue(all(isinstance(r, asyncio.CancelledError) for r in results[1:]))
+        self.assertEqual((pool.queued, pool.running), (0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
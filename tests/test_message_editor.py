@@ -0,0 +1,86 @@
+#  MIT License
+#
+#  Copyright (c) 2024 Riley Winkler
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+import asyncio
+import unittest
+from datetime import timedelta
+
+from helios.gambling.editor import MessageEditor
+
+
+class FakeMessage:
+    def __init__(self):
+        self.edits = []
+
+    async def edit(self, **kwargs):
+        self.edits.append(kwargs)
+
+
+class FakeChannel:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, **kwargs):
+        self.sent.append(kwargs)
+        return FakeMessage()
+
+
+class MessageEditorTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_coalesces_to_newest(self):
+        channel = FakeChannel()
+        editor = MessageEditor(channel, min_interval=timedelta(seconds=0.05))
+
+        def state(n):
+            async def build():
+                return {'content': str(n)}
+            return build
+
+        editor.update(state(0))
+        await asyncio.sleep(0.01)
+        for i in range(1, 10):
+            editor.update(state(i))
+        await editor.flush()
+        self.assertEqual(channel.sent, [{'content': '0'}])
+        self.assertEqual(editor.message.edits, [{'content': '9'}])
+        self.assertEqual(editor.skipped, 8)
+        self.assertEqual(editor.sent, 2)
+
+    async def test_min_interval(self):
+        channel = FakeChannel()
+        editor = MessageEditor(channel, min_interval=timedelta(seconds=0.05))
+        loop = asyncio.get_running_loop()
+        times = []
+
+        async def build():
+            times.append(loop.time())
+            return {'content': 'x'}
+
+        for _ in range(3):
+            editor.update(build)
+            await editor.flush()
+        self.assertEqual(len(times), 3)
+        for before, after in zip(times, times[1:]):
+            self.assertGreaterEqual(after - before, 0.045)
+
+
+if __name__ == '__main__':
+    unittest.main()
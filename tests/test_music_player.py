@@ -0,0 +1,74 @@
+#  MIT License
+#
+#  Copyright (c) 2024 Riley Winkler
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+import asyncio
+import unittest
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest import mock
+
+from helios.music.music_player import MusicPlayer
+from helios.music.processor import media_cache
+from helios.music.song import Song
+
+
+class FakeVoiceController:
+    def __init__(self, played_for: list[float]):
+        self.server = SimpleNamespace(name='Server', guild=SimpleNamespace(voice_client=None))
+        self.played_for = played_for
+        self.sources = []
+        self.last_start = None
+
+    def play(self, source):
+        self.sources.append(source)
+        self.last_start = datetime.now().astimezone() - timedelta(seconds=self.played_for.pop(0))
+        return asyncio.sleep(0)
+
+
+class MusicPlayerTestCase(unittest.TestCase):
+    def test_resume_resolves_new_stream(self):
+        fetched = []
+
+        async def fake_fetch_stream(url):
+            fetched.append(url)
+            stream_url = f'{url}?attempt={len(fetched)}'
+            media_cache.add_stream(url, stream_url)
+            return stream_url
+
+        async def run():
+            vc = FakeVoiceController([0, 100])
+            player = MusicPlayer(vc, None, None)
+            player.update_message = mock.AsyncMock()
+            player.playlist.add_song(Song('Song', 'Someone', 'https://youtu.be/resume', 100, 'thumb'))
+            await player.play_music()
+            return vc.sources
+
+        with mock.patch.object(media_cache, '_fetch_stream', fake_fetch_stream), \
+                mock.patch('discord.FFmpegPCMAudio', lambda source, **kwargs: source):
+            sources = asyncio.run(run())
+        media_cache.remove_stream('https://youtu.be/resume')
+        self.assertEqual(sources, ['https://youtu.be/resume?attempt=1', 'https://youtu.be/resume?attempt=2'])
+        self.assertEqual(len(fetched), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
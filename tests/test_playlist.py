@@ -0,0 +1,130 @@
+#  MIT License
+#
+#  Copyright (c) 2024 Riley Winkler
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+
+import asyncio
+import time
+import unittest
+from unittest import mock
+
+from helios.music.playlist import Playlist, SongQueue, YoutubePlaylist
+from helios.music.processor import extractor_pool
+from helios.music.song import Song
+
+
+def make_song(i: int) -> Song:
+    return Song(f'Song {i}', 'Someone', f'https://youtu.be/{i}', 60, 'thumb')
+
+
+def make_entry(i: int) -> dict:
+    return {'title': f'Song {i}', 'uploader': 'Someone', 'url': f'https://youtu.be/{i}', 'duration': 60,
+            'thumbnail': 'thumb'}
+
+
+class SongQueueTestCase(unittest.TestCase):
+    def test_positions(self):
+        songs = [make_song(i) for i in range(100)]
+        queue = SongQueue(songs[10:])
+        for song in reversed(songs[:10]):
+            queue.appendleft(song)
+        for _ in range(40):
+            queue.popleft()
+        queue.remove_many(songs[50:60])
+        expected = songs[40:50] + songs[60:]
+        self.assertEqual(list(queue), expected)
+        self.assertEqual(queue[5:8], expected[5:8])
+        self.assertEqual(queue[-1], expected[-1])
+        self.assertEqual([queue.position(song) for song in expected], list(range(len(expected))))
+        self.assertEqual(queue.total_duration, 60 * len(expected))
+        with self.assertRaises(ValueError):
+            queue.position(songs[0])
+
+    def test_song_queued_twice(self):
+        songs = [make_song(i) for i in range(3)]
+        queue = SongQueue(songs)
+        queue.append(songs[0])
+        queue.appendleft(songs[1])
+        self.assertEqual(queue.position(songs[1]), 0)
+        queue.popleft()
+        self.assertEqual(queue.position(songs[1]), 1)
+        queue.popleft()
+        self.assertEqual(queue.position(songs[0]), 2)
+        queue.remove(songs[0])
+        self.assertEqual(list(queue), songs[1:])
+        self.assertEqual(queue.total_duration, 120)
+
+    def test_embed_page(self):
+        playlist = Playlist()
+        for i in range(10_000):
+            playlist.add_song(make_song(i))
+        start = time.perf_counter()
+        for page in range(0, 10_000, 5):
+            playlist.get_embed_songs(playlist.songs[page:page + 5])
+        self.assertLess(time.perf_counter() - start, 2)
+        self.assertIn('**9996. Song 9995**', playlist.get_embed_songs(playlist.songs[9995:10_000])[0].description)
+
+
+class YoutubePlaylistTestCase(unittest.TestCase):
+    def test_pages_loaded_lazily(self):
+        pulled = []
+
+        def entries():
+            for i in range(120):
+                pulled.append(i)
+                yield make_entry(i)
+
+        async def run():
+            playlist = YoutubePlaylist({'_type': 'playlist', 'title': 'List', 'entries': entries(),
+                                        'playlist_count': 120}, None)
+            first = await playlist.load_more()
+            loaded = len(pulled)
+            await playlist.load_all()
+            return playlist, first, loaded
+
+        playlist, first, loaded = asyncio.run(run())
+        self.assertEqual((len(first), loaded), (YoutubePlaylist.PAGE_SIZE, YoutubePlaylist.PAGE_SIZE))
+        self.assertTrue(playlist.exhausted)
+        self.assertEqual(len(playlist.unplayed), 120)
+        self.assertEqual(playlist.total_duration, 120 * 60)
+
+    def test_page_timeout_stops_loading(self):
+        def entries():
+            yield make_entry(0)
+            time.sleep(0.2)
+            yield make_entry(1)
+
+        async def run():
+            playlist = YoutubePlaylist({'_type': 'playlist', 'title': 'List', 'entries': entries()}, None)
+            with mock.patch.object(extractor_pool, 'PLAYLIST_TIMEOUT', 0.05):
+                with self.assertLogs('HeliosLogger.Music', 'WARNING'):
+                    songs = await playlist.load_more()
+                self.assertEqual(await playlist.load_more(), [])
+            await asyncio.sleep(0.2)
+            return playlist, songs
+
+        playlist, songs = asyncio.run(run())
+        self.assertEqual(songs, [])
+        self.assertTrue(playlist.exhausted)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+#  MIT License
+#
+#  Copyright (c) 2024 Riley Winkler
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+import os
+import random
+import time
+import unittest
+
+import numpy as np
+from pokerkit import StandardHighHand
+
+from helios.gambling.poker import RANKS, SUITS, evaluate, evaluate_many, category, equity
+
+
+class PokerEvaluatorTestCase(unittest.TestCase):
+    deck = [r + s for r in RANKS for s in SUITS]
+
+    def test_categories(self):
+        cases = {
+            'AsKsQsJsTs2c3d': 'Straight Flush',
+            '5h4h3h2hAh9c9d': 'Straight Flush',
+            '9c9d9h9sKd2c3d': 'Four of a Kind',
+            '9c9d9hKsKd2c2d': 'Full House',
+            'Ah9h7h5h2hKdKc': 'Flush',
+            'As2c3d4h5s9c9d': 'Straight',
+            '7c7d7hAs2c4d9h': 'Three of a Kind',
+            '7c7d5h5sAc4d4h': 'Two Pair',
+            '7c7dAhKs2c4d9h': 'One Pair',
+            'AcQd9h7s5c3d2h': 'High Card',
+        }
+        for cards, expected in cases.items():
+            with self.subTest(cards=cards):
+                self.assertEqual(category(evaluate([cards[i:i + 2] for i in range(0, len(cards), 2)])), expected)
+
+    def test_matches_pokerkit(self):
+        rng = random.Random(0)
+        for _ in range(2_000):
+            cards = rng.sample(self.deck, 9)
+            first, second = cards[:2] + cards[4:], cards[2:4] + cards[4:]
+            ours = evaluate(first), evaluate(second)
+            theirs = [StandardHighHand.from_game(''.join(hand[:2]), ''.join(hand[2:])) for hand in (first, second)]
+            self.assertEqual(ours[0] > ours[1], theirs[0] > theirs[1], (first, second))
+            self.assertEqual(ours[0] == ours[1], theirs[0] == theirs[1], (first, second))
+
+    def test_batch_matches_single(self):
+        rng = np.random.default_rng(0)
+        for size in (5, 6, 7):
+            hands = np.array([rng.choice(52, size, replace=False) for _ in range(1_000)])
+            values = evaluate_many(hands)
+            self.assertEqual(values.tolist(), [evaluate(hand) for hand in hands.tolist()])
+
+    def test_equity(self):
+        shares = equity([['As', 'Ah'], ['Kd', 'Kc']], ['2c', '7d', '9h'])
+        self.assertAlmostEqual(sum(shares), 1)
+        self.assertAlmostEqual(shares[0], 0.916, delta=0.01)
+        self.assertEqual(equity([['As', 'Ks'], ['Ad', 'Kd']], ['2c', '7d', '9h', 'Jc', '3s']), [0.5, 0.5])
+
+    @unittest.skipUnless(os.environ.get('HELIOS_BENCH'), 'set HELIOS_BENCH=1 to run benchmarks')
+    def test_benchmark(self):
+        """Report evaluations per second, run with -s to see it."""
+        rng = np.random.default_rng(1)
+        hands = np.argsort(rng.random((1_000_000, 52)), axis=1)[:, :7]
+        evaluate_many(hands[:10])
+        start = time.perf_counter()
+        evaluate_many(hands)
+        elapsed = time.perf_counter() - start
+        print(f'\n{len(hands):,} seven card hands in {elapsed:.2f}s ({len(hands) / elapsed:,.0f}/s)')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+#  MIT License
+#
+#  Copyright (c) 2024 Riley Winkler
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+
+import asyncio
+import unittest
+from unittest import mock
+
+from helios.music.prefetch import SongPrefetcher
+from helios.music.processor import media_cache
+
+
+class FakeSource:
+    def __init__(self):
+        self.cleaned = False
+
+    def cleanup(self):
+        self.cleaned = True
+
+
+class FakeSong:
+    def __init__(self, url: str):
+        self.url = url
+        self.sources = []
+
+    async def audio_source(self, start=0):
+        self.sources.append(FakeSource())
+        return self.sources[-1]
+
+
+class SongPrefetcherTestCase(unittest.TestCase):
+    def run_with_streams(self, coro_func):
+        resolved = []
+
+        async def fake_get_stream(url):
+            resolved.append(url)
+            return url
+
+        with mock.patch.object(media_cache, 'get_stream', fake_get_stream):
+            asyncio.run(coro_func())
+        return resolved
+
+    def test_resolves_lookahead(self):
+        songs = [FakeSong(str(i)) for i in range(5)]
+
+        async def run():
+            prefetcher = SongPrefetcher(lookahead=2)
+            prefetcher.refresh(songs)
+            await asyncio.sleep(0)
+            prefetcher.refresh(songs[1:])
+            await asyncio.sleep(0)
+
+        self.assertEqual(self.run_with_streams(run), ['0', '1', '2'])
+
+    def test_warm_source_invalidated_on_reorder(self):
+        a, b = FakeSong('a'), FakeSong('b')
+        results = {}
+
+        async def run():
+            prefetcher = SongPrefetcher()
+            prefetcher.refresh([a, b])
+            prefetcher.warm_later(0)
+            await asyncio.sleep(0.01)
+            results['warm'] = a.sources[0]
+            prefetcher.refresh([b, a])
+            results['taken'] = prefetcher.take(a)
+            prefetcher.warm_later(0)
+            await asyncio.sleep(0.01)
+            results['next'] = prefetcher.take(b)
+
+        self.run_with_streams(run)
+        self.assertTrue(results['warm'].cleaned)
+        self.assertIsNone(results['taken'])
+        self.assertIs(results['next'], b.sources[0])
+        self.assertFalse(results['next'].cleaned)
+
+    def test_warm_failure_logged(self):
+        class BrokenSong(FakeSong):
+            async def audio_source(self, start=0):
+                raise RuntimeError('ffmpeg missing')
+
+        async def run():
+            prefetcher = SongPrefetcher()
+            prefetcher.refresh([BrokenSong('a')])
+            with self.assertLogs('HeliosLogger.Music', 'WARNING') as logs:
+                prefetcher.warm_later(0)
+                await asyncio.sleep(0.01)
+            self.assertIn('ffmpeg missing', logs.output[0])
+
+        self.run_with_streams(run)
+
+
+if __name__ == '__main__':
+    unittest.main()
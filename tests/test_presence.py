@@ -0,0 +1,57 @@
+#  MIT License
+#
+#  Copyright (c) 2024 Riley Winkler
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+import unittest
+from types import SimpleNamespace
+
+import discord
+
+from helios.presence import PresenceIndex
+
+
+def fake_member(member_id, *activities):
+    return SimpleNamespace(id=member_id, activities=activities)
+
+
+class PresenceIndexTestCase(unittest.TestCase):
+    def setUp(self):
+        self.members = [
+            fake_member(1, discord.CustomActivity(name='Busy'), discord.Game('Minecraft')),
+            fake_member(2, discord.Game('Minecraft')),
+            fake_member(3, discord.Activity(type=discord.ActivityType.listening, name='Spotify')),
+        ]
+        self.index = PresenceIndex(SimpleNamespace(name='Test', guild=SimpleNamespace(members=self.members)))
+        self.index.rebuild()
+
+    def test_rebuild(self):
+        self.assertEqual(self.index.players, {'Minecraft': {1, 2}})
+        self.assertEqual(self.index.get_game(1), 'Minecraft')
+        self.assertIsNone(self.index.get_activity(3))
+
+    def test_update(self):
+        self.assertTrue(self.index.update(fake_member(2, discord.Game('Terraria'))))
+        self.assertFalse(self.index.update(fake_member(1, discord.Game('Minecraft'))))
+        self.assertEqual(self.index.players, {'Minecraft': {1}, 'Terraria': {2}})
+        self.assertTrue(self.index.update(fake_member(1)))
+        self.index.remove(2)
+        self.assertEqual((self.index.players, self.index.activities), ({}, {}))
+        self.assertEqual(self.index.get_players('Minecraft'), set())
@@ -0,0 +1,82 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Riley Winkler
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+import asyncio
+import unittest
+
+from helios.utils import run_phases
+
+
+class RunPhasesTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_dependencies_run_first(self):
+        order = []
+
+        def phase(name, delay=0.0):
+            async def run():
+                await asyncio.sleep(delay)
+                order.append(name)
+            return run
+
+        timings = await run_phases({
+            'members': (phase('members', 0.02), ()),
+            'channels': (phase('channels'), ('members',)),
+            'theme': (phase('theme'), ()),
+        })
+        self.assertEqual(order, ['theme', 'members', 'channels'])
+        self.assertEqual(set(timings), {'members', 'channels', 'theme'})
+
+    async def test_unknown_dependency(self):
+        async def noop():
+            ...
+
+        with self.assertRaises(ValueError):
+            await run_phases({'channels': (noop, ('members',))})
+
+    async def test_cycle(self):
+        async def noop():
+            ...
+
+        with self.assertRaises(ValueError):
+            await run_phases({'a': (noop, ('b',)), 'b': (noop, ('a',)), 'c': (noop, ())})
+        with self.assertRaises(ValueError):
+            await run_phases({'a': (noop, ('a',))})
+
+    async def test_failure_cancels_siblings(self):
+        cancelled = []
+
+        async def fail():
+            raise RuntimeError('boom')
+
+        async def slow():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append('slow')
+                raise
+
+        with self.assertRaises(RuntimeError):
+            await asyncio.wait_for(run_phases({'fail': (fail, ()), 'slow': (slow, ()), 'after': (slow, ('fail',))}), 1)
+        self.assertEqual(cancelled, ['slow'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+#  MIT License
+#
+#  Copyright (c) 2024 Riley Winkler
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+
+import asyncio
+import unittest
+from datetime import timedelta
+
+from helios.voice_scheduler import Schedule
+
+
+class ScheduleTestCase(unittest.TestCase):
+    def test_conflicts(self):
+        schedule = Schedule()
+        base = schedule.now + timedelta(hours=1)
+        slots = [schedule.create_slot(base + timedelta(minutes=10 * i), base + timedelta(minutes=10 * i + 5),
+                                      'music', {}) for i in range(100)]
+        self.assertNotIn(None, slots)
+        self.assertIs(schedule.get_conflicting_slot(base + timedelta(minutes=52)), slots[5])
+        self.assertIsNone(schedule.get_conflicting_slot(base + timedelta(minutes=57)))
+        self.assertIsNone(schedule.create_slot(base + timedelta(minutes=6), base + timedelta(minutes=21), 'music', {}))
+        self.assertFalse(schedule.set_end_time(slots[0], base + timedelta(minutes=30)))
+        self.assertTrue(schedule.extend_time(slots[0], 60))
+        self.assertTrue(schedule.set_end_time(slots[0], base + timedelta(minutes=1)))
+
+    def test_dynamic_end(self):
+        schedule = Schedule()
+        start = schedule.now
+        schedule.create_slot(start + timedelta(seconds=100), start + timedelta(seconds=200), 'music', {})
+        self.assertIsNone(schedule.create_now_slot(300, 'music', {}))
+        slot = schedule.create_now_slot(300, 'music', {}, allow_dynamic_end=True, minimum_seconds=60)
+        self.assertLess(slot.end, start + timedelta(seconds=100))
+        self.assertIsNone(schedule.create_now_slot(300, 'music', {}, allow_dynamic_end=True))
+
+    def test_handlers_fire_on_boundaries(self):
+        events = []
+
+        async def run():
+            schedule = Schedule()
+            schedule.add_handler('music', lambda slot: asyncio.sleep(0, events.append('start')))
+            schedule.add_handler('music_end', lambda slot: asyncio.sleep(0, events.append('end')))
+            schedule.start()
+            slot = schedule.create_now_slot(60, 'music', {})
+            await asyncio.sleep(0.05)
+            slot.end = schedule.now
+            await asyncio.sleep(0.05)
+            schedule.stop()
+            return schedule
+
+        schedule = asyncio.run(run())
+        self.assertEqual(events, ['start', 'end'])
+        self.assertEqual(schedule.schedule, [])
+
+
+if __name__ == '__main__':
+    unittest.main()